@@ -0,0 +1,252 @@
+"""
+Reproducible benchmark suite for the hot paths of myth-hash: cold import and first
+load of the word data, ``hash_name`` latency percentiles, ``generate_indices`` on
+its own, batch throughput, also from asyncio, CLI wall time and the memory of the
+loaded data.
+
+Results are written as JSON. With ``--baseline``, every metric is compared with
+a stored result file and the run fails if a metric regressed by more than
+``--threshold``.
+
+Run with ``python benchmarks/benchmark_suite.py`` or ``nox -s benchmark``. Record a
+new baseline with ``python benchmarks/benchmark_suite.py --output
+benchmarks/baseline.json``.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess  # nosec B404 - only runs this interpreter on fixed arguments
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from myth_hash import hash_name, hash_names
+from myth_hash.core import CharacterDataLoader, generate_indices
+from myth_hash.core.async_hash import ahash_name_chunks
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = Path(__file__).parent / "results.json"
+DEFAULT_THRESHOLD = 0.2
+
+# Each snippet runs in a fresh interpreter and prints one number.
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import myth_hash
+print(time.perf_counter() - start)
+"""
+FIRST_LOAD_SNIPPET = """
+import time
+from myth_hash.core import CharacterDataLoader
+start = time.perf_counter()
+CharacterDataLoader().render_table("en")
+print(time.perf_counter() - start)
+"""
+ALL_LANGUAGES_SNIPPET = """
+import time
+from myth_hash.core import CharacterDataLoader
+start = time.perf_counter()
+data_loader = CharacterDataLoader()
+for language in data_loader.languages:
+    data_loader.render_table(language)
+print(time.perf_counter() - start)
+"""
+MEMORY_SNIPPET = """
+import tracemalloc
+import myth_hash
+tracemalloc.start()
+from myth_hash.core import CharacterDataLoader
+data_loader = CharacterDataLoader()
+for language in data_loader.languages:
+    data_loader.render_table(language)
+print(tracemalloc.get_traced_memory()[0])
+"""
+
+
+def run_snippet(snippet):
+    # The snippets are constants of this module, run without a shell.
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-c", snippet],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return float(result.stdout)
+
+
+def median_of_runs(snippet, runs):
+    return statistics.median(run_snippet(snippet) for _ in range(runs))
+
+
+def cli_wall_time(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(  # nosec B603
+            [sys.executable, "-m", "myth_hash.cli", "teststring"],
+            capture_output=True,
+            check=True,
+            cwd=ROOT,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def latency_percentiles(function, calls):
+    timer = time.perf_counter_ns
+    samples = []
+    for i in range(calls):
+        input_string = f"teststring{i}"
+        start = timer()
+        function(input_string)
+        samples.append(timer() - start)
+    samples.sort()
+    return {
+        f"p{percentile}": samples[max(0, -(-percentile * calls // 100) - 1)]
+        for percentile in (50, 90, 99)
+    }
+
+
+def best_per_call(function, inputs, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(inputs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs)
+
+
+def hash_names_async(inputs):
+    async def collect():
+        return [names async for _, names in ahash_name_chunks(inputs)]
+
+    return asyncio.run(collect())
+
+
+def metric(value, unit, higher_is_better=False):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def run_benchmarks(quick=False):
+    runs = 3 if quick else 10
+    calls = 20_000 if quick else 200_000
+    inputs = [f"teststring{i}" for i in range(calls)]
+
+    results = {
+        "import_ms": metric(1000 * median_of_runs(IMPORT_SNIPPET, runs), "ms"),
+        "first_load_ms": metric(1000 * median_of_runs(FIRST_LOAD_SNIPPET, runs), "ms"),
+        "all_languages_load_ms": metric(
+            1000 * median_of_runs(ALL_LANGUAGES_SNIPPET, runs), "ms"
+        ),
+        "loaded_data_kib": metric(median_of_runs(MEMORY_SNIPPET, 1) / 1024, "KiB"),
+        "cli_wall_ms": metric(1000 * cli_wall_time(runs), "ms"),
+    }
+
+    hash_name("teststring", "en")
+    for name, value in latency_percentiles(hash_name, calls).items():
+        results[f"hash_name_{name}_ns"] = metric(value, "ns")
+
+    list_sizes = list(CharacterDataLoader().list_sizes)
+    results["generate_indices_ns"] = metric(
+        1e9
+        * best_per_call(
+            lambda batch: [generate_indices(i, list_sizes) for i in batch], inputs
+        ),
+        "ns",
+    )
+    results["hash_names_per_second"] = metric(
+        1 / best_per_call(hash_names, inputs), "names/s", higher_is_better=True
+    )
+    results["ahash_name_chunks_per_second"] = metric(
+        1 / best_per_call(hash_names_async, inputs), "names/s", higher_is_better=True
+    )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Returns the report lines and the names of the metrics that regressed by more
+    than ``threshold`` (a fraction) against the baseline.
+    """
+    lines = []
+    regressions = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        value = current["results"][name]["value"]
+        change = value / base["value"] - 1 if base["value"] else 0.0
+        worse = -change if base["higher_is_better"] else change
+        status = "ok"
+        if worse > threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        lines.append(
+            f"{name:28} {base['value']:14.1f} {value:14.1f} {change:+8.1%}  {status}"
+        )
+    return lines, regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT,
+        help=f"File the JSON results are written to. Default is {DEFAULT_OUTPUT}.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Result file to compare with. The run fails on regressions.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed relative regression per metric. Default is {DEFAULT_THRESHOLD}.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Fewer runs and calls, e.g. for CI smoke runs.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    current = run_benchmarks(args.quick)
+
+    args.output.write_text(json.dumps(current, indent=2) + "\n", encoding="utf8")
+    for name, result in current["results"].items():
+        print(f"{name:28} {result['value']:14.1f} {result['unit']}")
+    print(f"Results written to {args.output}")
+
+    if args.baseline is None:
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf8"))
+    lines, regressions = compare(current, baseline, args.threshold)
+    print(f"\nComparison with {args.baseline} (threshold {args.threshold:.0%})")
+    print(f"{'metric':28} {'baseline':>14} {'current':>14} {'change':>8}")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} metrics regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Compares the compact word model in ``myth_hash.core.words`` with the previous
+dict-of-dicts model: memory of the loaded word lists, per-lookup latency of
+``word()``/``get_attribute()`` and per-call latency of a ``hash_name`` that
+resolves the words through each model. ``hash_name`` itself renders from
+precomputed tables and does not touch the word objects per call, so it is not a
+measure of the word model.
+
+Run with ``python benchmarks/word_model_benchmark.py``.
+"""
+
+import copy
+import gc
+import json
+import timeit
+import tracemalloc
+from functools import partial
+
+from myth_hash.core import CharacterNoun, NominativAdjective, generate_indices
+from myth_hash.core.character_data_loader import (
+    CHARACTER_NOUNS_FILE,
+    PERSONALITY_ATTRIBUTES_FILE,
+    PHYSICAL_ATTRIBUTES_FILE,
+)
+
+LOOKUPS = 200_000
+HASH_CALLS = 50_000
+
+
+class DictAdjective:
+    """The adjective model before the compact representation."""
+
+    def __init__(self, word_id, words):
+        self.word_id = word_id
+        self.words = words
+
+    def word(self, language, gender="neutral"):
+        try:
+            return str(self.words[language][gender])
+        except KeyError as exc:
+            raise ValueError(language, gender) from exc
+
+
+class DictNoun:
+    """The noun model before the compact representation."""
+
+    def __init__(self, character_id, data):
+        self.character_id = character_id
+        self.data = data
+
+    def get_attribute(self, language, attribute):
+        try:
+            return str(self.data[language][attribute])
+        except KeyError as exc:
+            raise ValueError(language, attribute) from exc
+
+
+def load_sources():
+    sources = []
+    for path, key in (
+        (CHARACTER_NOUNS_FILE, "data"),
+        (PHYSICAL_ATTRIBUTES_FILE, "words"),
+        (PERSONALITY_ATTRIBUTES_FILE, "words"),
+    ):
+        with open(path, encoding="utf8") as f:
+            sources.append(
+                [(word_id, data[key]) for word_id, data in json.load(f).items()]
+            )
+    return sources
+
+
+def build(noun_cls, adjective_cls, sources):
+    nouns, physical, personality = copy.deepcopy(sources)
+    return (
+        [noun_cls(word_id, data) for word_id, data in nouns],
+        [adjective_cls(word_id, words) for word_id, words in physical],
+        [adjective_cls(word_id, words) for word_id, words in personality],
+    )
+
+
+def measure_memory(noun_cls, adjective_cls, sources):
+    gc.collect()
+    tracemalloc.start()
+    data = build(noun_cls, adjective_cls, sources)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return size
+
+
+def lookup(nouns, adjectives):
+    noun, adjective = nouns[2], adjectives[0]
+    return adjective.word("de", noun.get_attribute("de", "gender"))
+
+
+def model_hash_name(data, input_string, language):
+    nouns, physical, personality = data
+    indices = generate_indices(
+        input_string, [len(physical), len(personality), len(nouns)]
+    )
+    noun = nouns[indices[2]]
+    gender = noun.get_attribute(language, "gender")
+    return (
+        physical[indices[0]].word(language, gender),
+        personality[indices[1]].word(language, gender),
+        noun.get_attribute(language, "word"),
+    )
+
+
+def per_call_ns(statement, number):
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    sources = load_sources()
+
+    legacy_memory = measure_memory(DictNoun, DictAdjective, sources)
+    compact_memory = measure_memory(CharacterNoun, NominativAdjective, sources)
+    print("Memory of loaded word lists (all languages)")
+    print(f"  dict-of-dicts model: {legacy_memory / 1024:8.1f} KiB")
+    print(f"  compact model:       {compact_memory / 1024:8.1f} KiB")
+    print(f"  reduction:           {1 - compact_memory / legacy_memory:8.1%}")
+
+    legacy = build(DictNoun, DictAdjective, sources)
+    compact = build(CharacterNoun, NominativAdjective, sources)
+    print("Per-lookup latency (German feminine adjective + noun gender)")
+    for name, (nouns, physical, _) in (("dict-of-dicts", legacy), ("compact", compact)):
+        lookup_ns = per_call_ns(partial(lookup, nouns, physical), LOOKUPS)
+        print(f"  {name + ' model:':21}{lookup_ns:8.1f} ns")
+
+    print("hash_name per-call latency, words resolved through the model")
+    legacy_ns = per_call_ns(
+        partial(model_hash_name, legacy, "teststring", "de"), HASH_CALLS
+    )
+    compact_ns = per_call_ns(
+        partial(model_hash_name, compact, "teststring", "de"), HASH_CALLS
+    )
+    print(f"  dict-of-dicts model: {legacy_ns:8.1f} ns")
+    print(f"  compact model:       {compact_ns:8.1f} ns")
+    print(f"  speedup:             {legacy_ns / compact_ns:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
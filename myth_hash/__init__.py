@@ -1,5 +1,58 @@
-from .core import hash_name
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .core import (
+        HashScheme,
+        MythName,
+        NameCache,
+        hash_bytes,
+        hash_code,
+        hash_codes,
+        hash_file,
+        hash_files,
+        hash_indices,
+        hash_name,
+        hash_name_multi,
+        hash_names,
+        hash_names_multi,
+        hash_names_threaded,
+        parse_code,
+        parse_name,
+        register_dataset,
+        render_code,
+        render_codes,
+        render_indices,
+    )
 
 __all__ = [
     "hash_name",
+    "hash_names",
+    "hash_names_threaded",
+    "hash_bytes",
+    "hash_file",
+    "hash_files",
+    "hash_name_multi",
+    "hash_names_multi",
+    "hash_indices",
+    "render_indices",
+    "hash_code",
+    "hash_codes",
+    "render_code",
+    "render_codes",
+    "parse_name",
+    "parse_code",
+    "MythName",
+    "NameCache",
+    "HashScheme",
+    "register_dataset",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The hashing modules are only imported on first use, so that importing the
+    # command line does not load them for 'myth-hash --socket PATH'.
+    if name in __all__:
+        from . import core  # pylint: disable=import-outside-toplevel
+
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,381 @@
+import hashlib
+import math
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from myth_hash.core import (
+    CharacterDataLoader,
+    canonical_tables,
+    check_language,
+    chunked,
+    code_space,
+)
+from myth_hash.core.hash_util import index_reader
+from myth_hash.core.vectorized import digest_array, generate_indices_array, np
+
+# Inputs per NumPy batch, large enough to amortize the per-batch overhead.
+ARRAY_CHUNK_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class SlotStats:
+    """
+    Distribution of the indices of one word slot (physical attribute, personality
+    attribute or noun) over a corpus.
+    """
+
+    name: str
+    size: int
+    counts: Sequence[int]
+    modulo_bias: float
+
+    @property
+    def chi_square(self) -> float:
+        """
+        Pearson's chi-square statistic against a uniform distribution. For uniform
+        indices, it is close to the degrees of freedom ``size - 1``.
+        """
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+        expected = total / self.size
+        return sum((count - expected) ** 2 for count in self.counts) / expected
+
+    @property
+    def skew(self) -> float:
+        """
+        Ratio of the most to the least frequent index, 1.0 for a perfectly even
+        distribution and infinite if an index was never drawn.
+        """
+        smallest = min(self.counts)
+        if not smallest:
+            return math.inf if max(self.counts) else 1.0
+        return max(self.counts) / smallest
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "min_count": min(self.counts),
+            "max_count": max(self.counts),
+            "skew": self.skew if math.isfinite(self.skew) else None,
+            "chi_square": self.chi_square,
+            "degrees_of_freedom": self.size - 1,
+            "modulo_bias": self.modulo_bias,
+        }
+
+
+@dataclass(frozen=True)
+class CollisionReport:
+    """
+    Result of a collision analysis. Codes are the language independent index
+    triples, names are the rendered strings of one language. Names collide more
+    often than codes, because some words occur at several positions of a list.
+    """
+
+    language: str
+    total: int
+    distinct_codes: int
+    distinct_names: int
+    code_space: int
+    name_space: int
+    expected_distinct_codes: float
+    expected_distinct_names: float
+    slots: tuple[SlotStats, ...]
+
+    @property
+    def duplicates(self) -> int:
+        return self.total - self.distinct_names
+
+    @property
+    def uniqueness(self) -> float:
+        return self.distinct_names / self.total if self.total else 1.0
+
+    @property
+    def expected_duplicates(self) -> float:
+        return self.total - self.expected_distinct_names
+
+    @property
+    def expected_uniqueness(self) -> float:
+        return self.expected_distinct_names / self.total if self.total else 1.0
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "language": self.language,
+            "total": self.total,
+            "distinct_names": self.distinct_names,
+            "duplicates": self.duplicates,
+            "uniqueness": self.uniqueness,
+            "expected_duplicates": self.expected_duplicates,
+            "expected_uniqueness": self.expected_uniqueness,
+            "name_space": self.name_space,
+            "distinct_codes": self.distinct_codes,
+            "code_duplicates": self.total - self.distinct_codes,
+            "expected_code_duplicates": self.total - self.expected_distinct_codes,
+            "code_space": self.code_space,
+            "slots": {slot.name: slot.as_json() for slot in self.slots},
+        }
+
+
+def expected_distinct(total: int, space: int) -> float:
+    """
+    Birthday bound: the expected number of distinct values among ``total``
+    uniform draws from ``space`` values.
+    """
+    return space * -math.expm1(total * math.log1p(-1 / space))
+
+
+def modulo_bias(segment_bits: int, size: int) -> float:
+    """
+    Relative excess probability of the indices that the modulo step in
+    ``generate_indices`` favours. A ``segment_bits`` wide segment reduced modulo
+    ``size`` hits the first ``2**segment_bits % size`` indices once more often
+    than the others.
+    """
+    quotient, remainder = divmod(2**segment_bits, size)
+    return 1 / quotient if remainder else 0.0
+
+
+class CollisionCounter:
+    """
+    Streams inputs through the hasher and counts distinct codes and names in two
+    bitsets over the code space (about 1.2 MB each), so memory use does not
+    depend on the size of the corpus. Batches are hashed with NumPy when it is
+    installed.
+    """
+
+    SLOT_NAMES = ("physical_attribute", "personality_attribute", "character")
+
+    def __init__(self, language: str = "en") -> None:
+        """
+        Constructor for the CollisionCounter class.
+
+        :param language: The language whose rendered names are compared
+        :raises ValueError: If the language is not supported
+        """
+        check_language(language)
+        self.language = language
+        self.total = 0
+        self.distinct_codes = 0
+        self.distinct_names = 0
+
+        table = CharacterDataLoader().render_table(language)
+        self._table = table
+        self._space = code_space()
+        self._seen_codes = bytearray((self._space + 7) // 8)
+        self._seen_names = bytearray((self._space + 7) // 8)
+        self._slot_counts = [[0] * size for size in table.list_sizes]
+
+        # Names are compared by their canonical code, see ``canonical_codes``.
+        (
+            self._canonical_physical,
+            self._canonical_personality,
+            self._canonical_nouns,
+        ) = canonical_tables(table)
+        if np is not None:
+            self._canonical_arrays = (
+                np.asarray(self._canonical_physical),
+                np.asarray(self._canonical_personality),
+                np.asarray(self._canonical_nouns),
+            )
+
+    def update(self, input_strings: Iterable[str]) -> None:
+        """
+        Adds input strings to the analysis.
+
+        :param input_strings: The input strings to hash
+        """
+        if np is None:
+            self._update_serial(input_strings)
+            return
+        for chunk in chunked(input_strings, ARRAY_CHUNK_SIZE):
+            self._update_array(chunk)
+
+    def _update_array(self, input_strings: list[str]) -> None:
+        table = self._table
+        _, personality_sizes, nouns_size = table.list_sizes
+        indices = generate_indices_array(digest_array(input_strings), table.list_sizes)
+        physical, personality, noun = indices.T
+
+        for counts, column in zip(self._slot_counts, indices.T):
+            # bincount returns an ndarray; pylint infers a tuple from its stubs.
+            bincount = np.bincount(column, minlength=len(counts))
+            for position, count in enumerate(
+                bincount.tolist()  # pylint: disable=no-member
+            ):
+                counts[position] += count
+
+        canonical_physical, canonical_personality, canonical_nouns = (
+            self._canonical_arrays
+        )
+
+        codes = (physical * personality_sizes + personality) * nouns_size + noun
+        names = (
+            canonical_physical[noun, physical] * personality_sizes
+            + canonical_personality[noun, personality]
+        ) * nouns_size + canonical_nouns[noun]
+
+        self.total += len(input_strings)
+        self.distinct_codes += _mark_array(self._seen_codes, codes)
+        self.distinct_names += _mark_array(self._seen_names, names)
+
+    def _update_serial(self, input_strings: Iterable[str]) -> None:
+        table = self._table
+        _, personality_sizes, nouns_size = table.list_sizes
+        sha256 = hashlib.sha256
+        read_indices = index_reader(
+            table.list_sizes, sha256().digest_size // len(table.list_sizes)
+        )
+
+        canonical_physical = self._canonical_physical
+        canonical_personality = self._canonical_personality
+        canonical_nouns = self._canonical_nouns
+        seen_codes = self._seen_codes
+        seen_names = self._seen_names
+        physical_counts, personality_counts, noun_counts = self._slot_counts
+
+        total = distinct_codes = distinct_names = 0
+
+        for input_string in input_strings:
+            physical, personality, noun = read_indices(
+                sha256(input_string.encode()).digest()
+            )
+            total += 1
+            physical_counts[physical] += 1
+            personality_counts[personality] += 1
+            noun_counts[noun] += 1
+
+            code = (physical * personality_sizes + personality) * nouns_size + noun
+            byte, bit = code >> 3, 1 << (code & 7)
+            if not seen_codes[byte] & bit:
+                seen_codes[byte] |= bit
+                distinct_codes += 1
+
+            code = (
+                canonical_physical[noun][physical] * personality_sizes
+                + canonical_personality[noun][personality]
+            ) * nouns_size + canonical_nouns[noun]
+            byte, bit = code >> 3, 1 << (code & 7)
+            if not seen_names[byte] & bit:
+                seen_names[byte] |= bit
+                distinct_names += 1
+
+        self.total += total
+        self.distinct_codes += distinct_codes
+        self.distinct_names += distinct_names
+
+    def report(self) -> CollisionReport:
+        """
+        Returns the statistics of all inputs added so far.
+        """
+        table = self._table
+        segment_bits = 8 * (hashlib.sha256().digest_size // len(table.list_sizes))
+        name_space, expected_names = self._name_distribution()
+        return CollisionReport(
+            language=self.language,
+            total=self.total,
+            distinct_codes=self.distinct_codes,
+            distinct_names=self.distinct_names,
+            code_space=self._space,
+            name_space=name_space,
+            expected_distinct_codes=expected_distinct(self.total, self._space),
+            expected_distinct_names=expected_names,
+            slots=tuple(
+                SlotStats(
+                    name=name,
+                    size=size,
+                    counts=tuple(counts),
+                    modulo_bias=modulo_bias(segment_bits, size),
+                )
+                for name, size, counts in zip(
+                    self.SLOT_NAMES, table.list_sizes, self._slot_counts
+                )
+            ),
+        )
+
+    def _name_distribution(self) -> tuple[int, float]:
+        # A name is drawn with probability (number of codes rendering to it) / code
+        # space. The multiplicities factor into the multiplicities of the three
+        # words, so the expectation is summed over groups of equal multiplicity
+        # instead of over all names.
+        table = self._table
+        nouns_by_gender: dict[int, Counter[int]] = {}
+        noun_multiplicities = Counter(
+            zip(table.character_nouns, table.character_genders)
+        )
+        for (_, gender), multiplicity in noun_multiplicities.items():
+            nouns_by_gender.setdefault(gender, Counter())[multiplicity] += 1
+
+        space = self._space
+        total = self.total
+        name_space = 0
+        expected = 0.0
+        for gender, nouns in nouns_by_gender.items():
+            physical = Counter(Counter(table.physical_attributes[gender]).values())
+            personality = Counter(
+                Counter(table.personality_attributes[gender]).values()
+            )
+            for noun_multiplicity, noun_count in nouns.items():
+                for physical_multiplicity, physical_count in physical.items():
+                    for (
+                        personality_multiplicity,
+                        personality_count,
+                    ) in personality.items():
+                        names = noun_count * physical_count * personality_count
+                        probability = (
+                            noun_multiplicity
+                            * physical_multiplicity
+                            * personality_multiplicity
+                            / space
+                        )
+                        name_space += names
+                        expected += names * -math.expm1(
+                            total * math.log1p(-probability)
+                        )
+        return name_space, expected
+
+
+def _mark_array(bitset: bytearray, codes: Any) -> int:
+    # Sets the bits of the codes and returns how many of them were not set yet.
+    codes = np.unique(codes)
+    view = np.frombuffer(bitset, dtype=np.uint8)
+    byte = codes >> 3
+    bit = (1 << (codes & 7)).astype(np.uint8)
+    new = (view[byte] & bit) == 0
+    np.bitwise_or.at(view, byte[new], bit[new])
+    return int(new.sum())
+
+
+def format_report(report: CollisionReport) -> str:
+    """
+    Formats a collision report as a human readable summary and slot table.
+    """
+    lines = [
+        f"Total inputs:        {report.total:,}",
+        f"Distinct names:      {report.distinct_names:,} of {report.name_space:,} possible ({report.language})",
+        f"Duplicates:          {report.duplicates:,} (expected {report.expected_duplicates:,.0f})",
+        f"Uniqueness rate:     {report.uniqueness:.2%} (expected {report.expected_uniqueness:.2%})",
+        f"Distinct codes:      {report.distinct_codes:,} of {report.code_space:,} possible",
+        "",
+        "Slot          Size   Min count   Max count   Skew    Chi-square (df)   Modulo bias",
+    ]
+    for slot in report.slots:
+        lines.append(
+            f"{slot.name.split('_')[0]:<12} {slot.size:>5} {min(slot.counts):>11,} {max(slot.counts):>11,}"
+            f"   {slot.skew:<6.3f}  {slot.chi_square:>10.1f} ({slot.size - 1})   {slot.modulo_bias:.1e}"
+        )
+    return "\n".join(lines)
+
+
+def analyze(input_strings: Iterable[str], language: str = "en") -> CollisionReport:
+    """
+    Runs a collision analysis over a corpus of input strings.
+
+    :param input_strings: The input strings to hash
+    :param language: The language whose rendered names are compared
+    :return: The collision report
+    """
+    counter = CollisionCounter(language)
+    counter.update(input_strings)
+    return counter.report()
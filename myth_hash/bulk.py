@@ -0,0 +1,351 @@
+import csv
+import io
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from time import perf_counter_ns
+from typing import TextIO
+
+from myth_hash.core import (
+    NameCache,
+    chunked,
+    hash_name,
+    hash_name_chunks,
+    hash_name_multi,
+    hash_names_multi,
+    instrumentation,
+)
+from myth_hash.options import INPUT_FORMATS, OUTPUT_FORMATS
+
+CHUNK_SIZE = 4096
+OUTPUT_FIELDS = (
+    "input",
+    "physical_attribute",
+    "personality_attribute",
+    "character",
+)
+NAME_FIELDS = OUTPUT_FIELDS[1:]
+
+Name = tuple[str, str, str]
+
+
+def format_text_name(name: Name) -> str:
+    physical_attr, personality_attr, character = name
+    return f"{physical_attr}-{personality_attr}-{character.replace(' ', '')}"
+
+
+class KeyReader:
+    """
+    Iterates over the keys of a line based or delimited input stream. Blank keys
+    are skipped and counted in ``skipped``, unless they are kept to align the
+    output with the input.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        input_format: str = "lines",
+        key_column: str | None = None,
+        keep_blank: bool = False,
+    ) -> None:
+        """
+        Constructor for the KeyReader class.
+
+        :param stream: The text stream to read from
+        :param input_format: One of "lines", "csv" and "tsv"
+        :param key_column: For delimited input, the 0-based index or the header name
+                           of the column to hash. A name means that the first row
+                           is a header row. Defaults to the first column.
+        :param keep_blank: Yield blank keys, and rows without the key column as
+                           empty keys, instead of skipping them. Text output has
+                           no key column, so this keeps its lines aligned with
+                           the input lines.
+        """
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unsupported input format '{input_format}'.")
+        if input_format == "lines" and key_column is not None:
+            raise ValueError("A key column requires csv or tsv input.")
+
+        self.stream = stream
+        self.input_format = input_format
+        self.key_column = key_column
+        self.keep_blank = keep_blank
+        self.skipped = 0
+
+    def __iter__(self) -> Iterator[str]:
+        if self.input_format == "lines":
+            keys: Iterable[str] = (line.rstrip("\r\n") for line in self.stream)
+        else:
+            keys = self._read_column()
+
+        for key in keys:
+            if self.keep_blank or key.strip():
+                yield key
+            else:
+                self.skipped += 1
+
+    def _read_column(self) -> Iterator[str]:
+        delimiter = "\t" if self.input_format == "tsv" else ","
+        rows = csv.reader(self.stream, delimiter=delimiter)
+
+        if self.key_column is None:
+            column = 0
+        elif self.key_column.isdigit():
+            column = int(self.key_column)
+        else:
+            header = next(rows, [])
+            try:
+                column = header.index(self.key_column)
+            except ValueError as exc:
+                raise ValueError(
+                    f"Key column '{self.key_column}' not found in the header."
+                ) from exc
+
+        for row in rows:
+            if len(row) > column:
+                yield row[column]
+            elif self.keep_blank:
+                yield ""
+            else:
+                self.skipped += 1
+
+
+class RecordWriter:
+    """
+    Writes hashed names to a text stream in one of the ``OUTPUT_FORMATS``. Records
+    are written a chunk at a time instead of one ``print`` call per name. Text
+    output has an empty line for every blank key.
+    """
+
+    def __init__(self, stream: TextIO, output_format: str = "text") -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{output_format}'.")
+
+        self.stream = stream
+        self.output_format = output_format
+        self._csv_writer = None
+        if output_format in ("csv", "tsv"):
+            self._csv_writer = csv.writer(
+                stream,
+                delimiter="\t" if output_format == "tsv" else ",",
+                lineterminator="\n",
+            )
+            self._csv_writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, keys: list[str], names: Iterable[Name]) -> None:
+        if instrumentation.enabled:
+            started = perf_counter_ns()
+            self._write(keys, names)
+            instrumentation.record("output.format", started, len(keys))
+        else:
+            self._write(keys, names)
+
+    def _write(self, keys: list[str], names: Iterable[Name]) -> None:
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(
+                (key, *name) for key, name in zip(keys, names, strict=True)
+            )
+        elif self.output_format == "json":
+            self.stream.write(
+                "".join(
+                    json.dumps(
+                        dict(zip(OUTPUT_FIELDS, (key, *name))), ensure_ascii=False
+                    )
+                    + "\n"
+                    for key, name in zip(keys, names, strict=True)
+                )
+            )
+        else:
+            self.stream.write(
+                "".join(
+                    (
+                        f"{physical_attr}-{personality_attr}-"
+                        f"{character.replace(' ', '')}\n"
+                        if key.strip()
+                        else "\n"
+                    )
+                    for key, (physical_attr, personality_attr, character) in zip(
+                        keys, names, strict=True
+                    )
+                )
+            )
+
+
+class MultiRecordWriter:
+    """
+    Writes names in several languages per key to a text stream. Text output has
+    the names of one key on one tab-separated line, or an empty line for a blank
+    key, JSON output one object per key
+    with a nested object per language and CSV/TSV output one column per language
+    and name part.
+    """
+
+    def __init__(
+        self, stream: TextIO, output_format: str, languages: Iterable[str]
+    ) -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{output_format}'.")
+
+        self.stream = stream
+        self.output_format = output_format
+        self.languages = tuple(languages)
+        self._csv_writer = None
+        if output_format in ("csv", "tsv"):
+            self._csv_writer = csv.writer(
+                stream,
+                delimiter="\t" if output_format == "tsv" else ",",
+                lineterminator="\n",
+            )
+            self._csv_writer.writerow(
+                (
+                    "input",
+                    *(
+                        f"{field}_{language}"
+                        for language in self.languages
+                        for field in NAME_FIELDS
+                    ),
+                )
+            )
+
+    def write(self, keys: list[str], records: Iterable[dict[str, Name]]) -> None:
+        if instrumentation.enabled:
+            started = perf_counter_ns()
+            self._write(keys, records)
+            instrumentation.record("output.format", started, len(keys))
+        else:
+            self._write(keys, records)
+
+    def _write(self, keys: list[str], records: Iterable[dict[str, Name]]) -> None:
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(
+                (
+                    key,
+                    *chain.from_iterable(
+                        record[language] for language in self.languages
+                    ),
+                )
+                for key, record in zip(keys, records, strict=True)
+            )
+        elif self.output_format == "json":
+            self.stream.write(
+                "".join(
+                    json.dumps(
+                        {"input": key, **self.json_record(record)}, ensure_ascii=False
+                    )
+                    + "\n"
+                    for key, record in zip(keys, records, strict=True)
+                )
+            )
+        else:
+            self.stream.write(
+                "".join(
+                    (
+                        "\t".join(
+                            format_text_name(record[language])
+                            for language in self.languages
+                        )
+                        if key.strip()
+                        else ""
+                    )
+                    + "\n"
+                    for key, record in zip(keys, records, strict=True)
+                )
+            )
+
+    def json_record(self, record: dict[str, Name]) -> dict[str, dict[str, str]]:
+        return {
+            language: dict(zip(NAME_FIELDS, record[language]))
+            for language in self.languages
+        }
+
+
+def format_output(
+    input_string: str, languages: tuple[str, ...], output_format: str = "text"
+) -> str:
+    """
+    Formats the name of a single input string like the ``myth-hash`` command. JSON
+    output is a single object without the input string.
+
+    :param input_string: The input string to hash
+    :param languages: The output languages, several render one record per input
+    :param output_format: One of the ``OUTPUT_FORMATS``
+    :return: The output including the trailing newline
+    """
+    buffer = io.StringIO()
+    if len(languages) > 1:
+        names = hash_name_multi(input_string, languages)
+        writer = MultiRecordWriter(buffer, output_format, languages)
+        if output_format == "json":
+            buffer.write(json.dumps(writer.json_record(names), ensure_ascii=False))
+            buffer.write("\n")
+        else:
+            writer.write([input_string], [names])
+        return buffer.getvalue()
+
+    name = hash_name(input_string, languages[0])
+    if output_format == "json":
+        buffer.write(json.dumps(dict(zip(NAME_FIELDS, name)), ensure_ascii=False))
+        buffer.write("\n")
+    else:
+        RecordWriter(buffer, output_format).write([input_string], [name])
+    return buffer.getvalue()
+
+
+def hash_stream(
+    keys: Iterable[str],
+    writer: RecordWriter,
+    language: str = "en",
+    chunk_size: int = CHUNK_SIZE,
+    workers: int | None = None,
+    *,
+    cache: NameCache | None = None,
+) -> int:
+    """
+    Hashes a stream of keys chunk by chunk, so memory use does not depend on the
+    size of the input.
+
+    :param keys: The keys to hash
+    :param writer: The writer that receives the generated names
+    :param language: The output language
+    :param chunk_size: The number of keys hashed and written at once
+    :param workers: Number of worker processes, see ``hash_names``
+    :param cache: Serves repeated keys from this cache instead of hashing them
+                  again. Keys are then hashed in the calling process.
+    :return: The number of hashed keys
+    """
+    count = 0
+    if cache is not None:
+        for chunk in chunked(keys, chunk_size):
+            writer.write(chunk, cache.hash_names(chunk, language))
+            count += len(chunk)
+        logging.debug(f"Name cache: {cache.cache_info()}")
+        return count
+
+    for chunk, names in hash_name_chunks(chunked(keys, chunk_size), language, workers):
+        writer.write(chunk, names)
+        count += len(chunk)
+    logging.debug(f"Hashed {count} keys")
+    return count
+
+
+def hash_stream_multi(
+    keys: Iterable[str],
+    writer: MultiRecordWriter,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Like ``hash_stream``, but renders every key in all languages of the writer
+    while hashing it only once.
+
+    :param keys: The keys to hash
+    :param writer: The writer that receives the generated names
+    :param chunk_size: The number of keys hashed and written at once
+    :return: The number of hashed keys
+    """
+    count = 0
+    for chunk in chunked(keys, chunk_size):
+        writer.write(chunk, hash_names_multi(chunk, writer.languages))
+        count += len(chunk)
+    logging.debug(f"Hashed {count} keys")
+    return count
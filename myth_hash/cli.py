@@ -1,9 +1,17 @@
 import argparse
 import json
 import logging
+import os
 import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TextIO
 
-from myth_hash import hash_name
+from myth_hash.options import INPUT_FORMATS, OUTPUT_FORMATS, SUPPORTED_LANGUAGES
+
+# The hashing modules are imported by the functions that use them, so that
+# 'myth-hash --socket PATH' only loads the argument parser and the socket client
+# before it asks the daemon.
 
 
 def setup_logging(log_level: str) -> None:
@@ -15,21 +23,208 @@ def setup_logging(log_level: str) -> None:
 
 
 def hash_name_cli(input_string: str, language: str, output_format: str) -> None:
+    from myth_hash.bulk import format_output  # pylint: disable=import-outside-toplevel
+
     try:
-        physical_attr, personality_attr, character = hash_name(input_string, language)
+        output = format_output(input_string, (language,), output_format)
     except Exception as e:
         logging.error(f"Failed to generate fantasy name: {e}")
         raise
+    sys.stdout.write(output)
+
+
+def hash_name_multi_cli(
+    input_string: str, languages: tuple[str, ...], output_format: str
+) -> None:
+    from myth_hash.bulk import format_output  # pylint: disable=import-outside-toplevel
+
+    try:
+        output = format_output(input_string, languages, output_format)
+    except Exception as e:
+        logging.error(f"Failed to generate fantasy names: {e}")
+        raise
+    sys.stdout.write(output)
+
+
+def hash_files_cli(args: argparse.Namespace) -> None:
+    # pylint: disable=import-outside-toplevel
+    from myth_hash.bulk import MultiRecordWriter, RecordWriter
+    from myth_hash.core import CharacterDataLoader, digest_files, indices_from_digest
+
+    workers = (os.cpu_count() or 1) if args.jobs == 0 else args.jobs
+    data_loader = CharacterDataLoader()
+    tables = [data_loader.render_table(language) for language in args.language]
+    list_sizes = list(data_loader.list_sizes)
+    digests = zip(args.file, digest_files(args.file, workers))
+
+    if len(tables) > 1:
+        multi_writer = MultiRecordWriter(sys.stdout, args.format, args.language)
+        for path, digest in digests:
+            indices = indices_from_digest(digest, list_sizes)
+            multi_writer.write(
+                [path], [{table.language: table.render(indices) for table in tables}]
+            )
+    else:
+        writer = RecordWriter(sys.stdout, args.format)
+        for path, digest in digests:
+            writer.write(
+                [path], [tables[0].render(indices_from_digest(digest, list_sizes))]
+            )
+    sys.stdout.flush()
+
+
+@contextmanager
+def open_input(path: str | None) -> Iterator[TextIO]:
+    """
+    Opens the input file of a command, or standard input if there is none. Only
+    the file is closed afterwards.
+    """
+    if path is None:
+        yield sys.stdin
+        return
+    with open(path, encoding="utf8", newline="") as stream:
+        yield stream
+
+
+def hash_bulk_cli(args: argparse.Namespace) -> None:
+    # pylint: disable=import-outside-toplevel
+    from myth_hash.bulk import (
+        KeyReader,
+        MultiRecordWriter,
+        RecordWriter,
+        hash_stream,
+        hash_stream_multi,
+    )
+    from myth_hash.core import NameCache
+
+    with open_input(args.input) as stream:
+        # Text output has no key column, so blank keys keep an empty line there.
+        reader = KeyReader(
+            stream,
+            args.input_format,
+            args.key_column,
+            keep_blank=args.format == "text",
+        )
+        if len(args.language) > 1:
+            count = hash_stream_multi(
+                reader, MultiRecordWriter(sys.stdout, args.format, args.language)
+            )
+        else:
+            writer = RecordWriter(sys.stdout, args.format)
+            cache = NameCache(args.cache_size) if args.cache_size else None
+            count = hash_stream(
+                reader, writer, args.language[0], workers=args.jobs, cache=cache
+            )
+    sys.stdout.flush()
+
+    if reader.skipped:
+        logging.warning(f"Skipped {reader.skipped} empty keys")
+    logging.debug(f"Generated {count} fantasy names")
+
+
+def stats_cli(args: argparse.Namespace) -> None:
+    # Imported here because the analysis loads NumPy, which would slow down the
+    # start of every other command.
+    from myth_hash.analysis import (  # pylint: disable=import-outside-toplevel
+        CollisionCounter,
+        format_report,
+    )
+    from myth_hash.bulk import KeyReader  # pylint: disable=import-outside-toplevel
+
+    counter = CollisionCounter(args.language)
+    if args.sample is not None:
+        counter.update(f"teststring{i}" for i in range(args.sample))
+        skipped = 0
+    else:
+        with open_input(args.input) as stream:
+            reader = KeyReader(stream, args.input_format, args.key_column)
+            counter.update(reader)
+        skipped = reader.skipped
+
+    report = counter.report()
+    if args.format == "json":
+        print(json.dumps(report.as_json()))
+    else:
+        print(format_report(report))
+
+    if skipped:
+        logging.warning(f"Skipped {skipped} empty keys")
+
+
+def parse_stats_arguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="myth-hash stats",
+        description="Hashes a corpus of input strings and reports collisions, the expected collisions of a uniform hash (birthday bound) and the distribution of every word slot.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        metavar="FILE",
+        help="Read one input string per line from FILE. Default is standard input.",
+    )
+    parser.add_argument(
+        "--input-format",
+        type=str,
+        default="lines",
+        choices=INPUT_FORMATS,
+        help="Format of the input: plain lines (lines), CSV (csv) or TSV (tsv). Default is lines.",
+    )
+    parser.add_argument(
+        "--key-column",
+        type=str,
+        help="Column to hash for CSV or TSV input, either as 0-based index or as header name. Default is the first column.",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        metavar="N",
+        help="Analyze the N synthetic inputs teststring0 to teststring<N-1> instead of reading input.",
+    )
+    parser.add_argument(
+        "-l",
+        "--language",
+        type=str,
+        default="en",
+        choices=sorted(SUPPORTED_LANGUAGES),
+        help="Language of the compared names. Default is English.",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        default="text",
+        choices=["text", "json"],
+        help="Specify the output format. Choose between plain text (text) and JSON (json). Default is text.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Set the logging level. Default is INFO.",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.sample is not None and args.input is not None:
+        parser.error("--sample cannot be combined with --input")
+    if args.sample is not None and args.sample < 0:
+        parser.error("--sample must not be negative")
+    if args.key_column is not None and args.input_format == "lines":
+        parser.error("--key-column requires --input-format csv or tsv")
+
+    return args
 
-    if output_format == "text":
-        print(f"{physical_attr}-{personality_attr}-{character.replace(' ', '')}")
-    elif output_format == "json":
-        output = {
-            "physical_attribute": physical_attr,
-            "personality_attribute": personality_attr,
-            "character": character,
-        }
-        print(json.dumps(output, ensure_ascii=False))
+
+def parse_languages(value: str) -> tuple[str, ...]:
+    languages = tuple(dict.fromkeys(language.strip() for language in value.split(",")))
+    for language in languages:
+        if language not in SUPPORTED_LANGUAGES:
+            raise argparse.ArgumentTypeError(
+                f"invalid choice: '{language}' (choose from {', '.join(sorted(SUPPORTED_LANGUAGES))})"
+            )
+    return languages
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -39,23 +234,80 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "input_string",
         type=str,
+        nargs="?",
         help="Input string to hash and generate a fantasy name.",
     )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read one input string per line from standard input instead of a single input string.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        metavar="FILE",
+        help="Read one input string per line from FILE instead of a single input string.",
+    )
+    parser.add_argument(
+        "--file",
+        type=str,
+        nargs="+",
+        metavar="PATH",
+        help="Hash the contents of one or more files instead of an input string. Files are memory-mapped and hashed in parallel threads.",
+    )
+    parser.add_argument(
+        "--input-format",
+        type=str,
+        default="lines",
+        choices=INPUT_FORMATS,
+        help="Format of the bulk input: plain lines (lines), CSV (csv) or TSV (tsv). Default is lines.",
+    )
+    parser.add_argument(
+        "--key-column",
+        type=str,
+        help="Column to hash for CSV or TSV input, either as 0-based index or as header name. A header name means that the first row is a header row. Default is the first column.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes for bulk input, or of threads for --file. 0 uses one per CPU. Small bulk inputs are always hashed in a single process. Default is 1 for bulk input and the thread pool default for --file.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Cache the names of up to N distinct bulk input strings, so repeated lines are not hashed again. Cannot be combined with --jobs. Default is 0 (no cache).",
+    )
     parser.add_argument(
         "-l",
         "--language",
-        type=str,
+        type=parse_languages,
         default="en",
-        choices=["en", "de"],
-        help="Specify the output language. Supported languages: English (en) and German (de). Default is English.",
+        help="Specify the output language. Supported languages: English (en) and German (de). Several comma-separated languages, e.g. en,de, render each input in all of them while hashing it only once. Default is English.",
     )
     parser.add_argument(
         "-f",
         "--format",
         type=str,
         default="text",
-        choices=["text", "json"],
-        help="Specify the output format. Choose between plain text (text) and JSON (json). Default is text.",
+        choices=OUTPUT_FORMATS,
+        help="Specify the output format. Choose between plain text (text), JSON (json), CSV (csv) and TSV (tsv). In bulk mode, JSON is written as one object per line. Default is text.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the number of calls and the time spent loading data, hashing, resolving words and formatting output to standard error when done. Names hashed by worker processes (--jobs) are not included.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        metavar="PATH",
+        help="Forward the input string to a daemon started with 'myth-hash serve --socket PATH'. Falls back to hashing in this process if no daemon is running.",
     )
     parser.add_argument(
         "--log-level",
@@ -65,7 +317,42 @@ def parse_arguments() -> argparse.Namespace:
         help="Set the logging level. Default is INFO.",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    sources = sum(
+        [
+            args.input_string is not None,
+            args.stdin,
+            args.input is not None,
+            args.file is not None,
+        ]
+    )
+    if sources != 1:
+        parser.error(
+            "exactly one of input_string, --stdin, --input and --file is required"
+        )
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs must not be negative")
+    if args.cache_size < 0:
+        parser.error("--cache-size must not be negative")
+    if args.cache_size and args.jobs not in (None, 1):
+        parser.error("--cache-size cannot be combined with --jobs")
+    if args.cache_size and args.file is not None:
+        parser.error("--cache-size cannot be combined with --file")
+    if (
+        len(args.language) > 1
+        and args.file is None
+        and (args.cache_size or args.jobs not in (None, 1))
+    ):
+        parser.error("--cache-size and --jobs require a single language")
+    if args.key_column is not None and args.input_format == "lines":
+        parser.error("--key-column requires --input-format csv or tsv")
+    if args.socket is not None and args.input_string is None:
+        parser.error("--socket requires an input_string")
+    if args.socket is not None and args.stats:
+        parser.error("--stats cannot be combined with --socket")
+
+    return args
 
 
 def validate_input_string(input_string: str) -> None:
@@ -73,17 +360,144 @@ def validate_input_string(input_string: str) -> None:
         raise ValueError("Input string cannot be empty.")
 
 
+def serve_cli(args: argparse.Namespace) -> None:
+    if args.reload_interval is not None:
+        from myth_hash.core import watch_data  # pylint: disable=import-outside-toplevel
+
+        watch_data(args.reload_interval)
+    # Imported here, so that only the servers load the socket and asyncio modules.
+    if args.socket is not None:
+        from myth_hash.daemon import serve  # pylint: disable=import-outside-toplevel
+
+        serve(args.socket)
+    else:
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        from myth_hash.server import (  # pylint: disable=import-outside-toplevel
+            serve_http,
+        )
+
+        try:
+            asyncio.run(serve_http(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+def parse_serve_arguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="myth-hash serve",
+        description="Runs a server that keeps the word data loaded. With --socket, it answers 'myth-hash --socket PATH' requests over a Unix domain socket. With --port, it serves names over HTTP.",
+    )
+    endpoint = parser.add_mutually_exclusive_group(required=True)
+    endpoint.add_argument(
+        "--socket",
+        type=str,
+        metavar="PATH",
+        help="Path of the Unix domain socket to listen on.",
+    )
+    endpoint.add_argument(
+        "--port",
+        type=int,
+        metavar="PORT",
+        help="TCP port of the HTTP service. Endpoints: GET /name?input=...&language=en, POST /names and GET /stats.",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address the HTTP service listens on. Default is 127.0.0.1.",
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        metavar="SECONDS",
+        help="Check the word lists every SECONDS seconds and reload them without a restart when they change.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Set the logging level. Default is INFO.",
+    )
+    args = parser.parse_args(argv)
+    if args.reload_interval is not None and args.reload_interval <= 0:
+        parser.error("--reload-interval must be positive")
+    return args
+
+
+def hash_name_socket_cli(args: argparse.Namespace) -> bool:
+    # Imported here, so that plain invocations do not load the socket modules.
+    from myth_hash.client import (  # pylint: disable=import-outside-toplevel
+        request_output,
+    )
+
+    try:
+        output = request_output(
+            args.socket, args.input_string, args.language, args.format
+        )
+    except OSError as e:
+        logging.debug(f"Daemon not available, hashing in-process: {e}")
+        return False
+    sys.stdout.write(output)
+    return True
+
+
+def command_main(
+    argv: list[str],
+    parse: Callable[[list[str]], argparse.Namespace],
+    run: Callable[[argparse.Namespace], None],
+) -> None:
+    args = parse(argv)
+
+    setup_logging(args.log_level)
+
+    try:
+        run(args)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred: {e}")
+        sys.exit(1)
+
+
 def main():
+    if sys.argv[1:2] == ["stats"]:
+        command_main(sys.argv[2:], parse_stats_arguments, stats_cli)
+        return
+    if sys.argv[1:2] == ["serve"]:
+        command_main(sys.argv[2:], parse_serve_arguments, serve_cli)
+        return
+
     args = parse_arguments()
 
     setup_logging(args.log_level)
+    if args.stats:
+        from myth_hash.core import (  # pylint: disable=import-outside-toplevel
+            instrumentation,
+        )
+
+        instrumentation.enable()
 
     try:
-        validate_input_string(args.input_string)
-        hash_name_cli(args.input_string, args.language, args.format)
+        if args.file is not None:
+            hash_files_cli(args)
+        elif args.input_string is None:
+            hash_bulk_cli(args)
+        else:
+            validate_input_string(args.input_string)
+            if args.socket is not None and hash_name_socket_cli(args):
+                return
+            if len(args.language) > 1:
+                hash_name_multi_cli(args.input_string, args.language, args.format)
+            else:
+                hash_name_cli(args.input_string, args.language[0], args.format)
+        if args.stats:
+            sys.stderr.write(instrumentation.format_stats() + "\n")
     except ValueError as ve:
         logging.error(f"Input validation error: {ve}")
         sys.exit(1)
+    except OSError as e:
+        logging.error(f"Failed to read input: {e}")
+        sys.exit(1)
     except Exception as e:
         logging.error(f"An unexpected error occurred: {e}")
         sys.exit(1)
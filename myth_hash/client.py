@@ -0,0 +1,41 @@
+import json
+import socket
+
+# Seconds the client waits for the daemon before it falls back to hashing
+# in-process.
+CLIENT_TIMEOUT = 5.0
+
+
+def request_output(
+    socket_path: str,
+    input_string: str,
+    languages: tuple[str, ...],
+    output_format: str = "text",
+    timeout: float = CLIENT_TIMEOUT,
+) -> str:
+    """
+    Asks the daemon for the formatted name of an input string.
+
+    :param socket_path: The path of the daemon's Unix domain socket
+    :param input_string: The input string to hash
+    :param languages: The output languages
+    :param output_format: One of the ``OUTPUT_FORMATS``
+    :param timeout: Seconds to wait for the daemon
+    :return: The output, identical to ``format_output``
+    :raises OSError: If the daemon is not running or does not answer
+    :raises ValueError: If the daemon rejects the request
+    """
+    request = {"input": input_string, "languages": languages, "format": output_format}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as stream:
+            line = stream.readline()
+
+    if not line:
+        raise ConnectionError("The daemon closed the connection without answering.")
+    response = json.loads(line)
+    if "error" in response:
+        raise ValueError(response["error"])
+    return str(response["output"])
@@ -1,13 +1,98 @@
+from . import instrumentation
 from .character_data_loader import CharacterData, CharacterDataLoader
-from .hash_util import check_language, generate_indices, hash_name
+from .datasets import DEFAULT_DATASETS, DatasetRegistry, register_dataset
+from .hash_util import (
+    check_language,
+    chunked,
+    digest_file,
+    digest_files,
+    generate_indices,
+    hash_bytes,
+    hash_file,
+    hash_files,
+    hash_indices,
+    hash_name,
+    hash_name_chunks,
+    hash_name_multi,
+    hash_names,
+    hash_names_multi,
+    hash_names_threaded,
+    indices_from_digest,
+    render_indices,
+)
+from .hot_reload import DataWatcher, watch_data
+from .name_cache import NameCache
+from .name_code import (
+    MythName,
+    code_space,
+    hash_code,
+    hash_codes,
+    pack_indices,
+    render_code,
+    render_codes,
+    unpack_code,
+)
+from .name_parser import (
+    canonical_codes,
+    canonical_tables,
+    parse_code,
+    parse_name,
+    parse_name_candidates,
+    parse_names,
+)
+from .render_table import NameIndex, RenderTable
+from .scheme import DEFAULT_SCHEME, HashScheme
+from .shared_store import SharedWordStore, attach_shared_store, export_shared_store
 from .words import CharacterNoun, NominativAdjective
 
 __all__ = [
     "CharacterDataLoader",
     "CharacterData",
+    "DatasetRegistry",
+    "DEFAULT_DATASETS",
+    "register_dataset",
     "hash_name",
+    "hash_names",
+    "hash_names_threaded",
+    "hash_name_chunks",
+    "hash_name_multi",
+    "hash_names_multi",
+    "hash_indices",
+    "render_indices",
     "generate_indices",
+    "indices_from_digest",
+    "hash_bytes",
+    "hash_file",
+    "hash_files",
+    "digest_file",
+    "digest_files",
     "check_language",
+    "chunked",
     "CharacterNoun",
     "NominativAdjective",
+    "NameCache",
+    "DataWatcher",
+    "watch_data",
+    "MythName",
+    "code_space",
+    "hash_code",
+    "hash_codes",
+    "pack_indices",
+    "render_code",
+    "render_codes",
+    "unpack_code",
+    "parse_name",
+    "parse_name_candidates",
+    "parse_code",
+    "parse_names",
+    "canonical_codes",
+    "canonical_tables",
+    "NameIndex",
+    "RenderTable",
+    "HashScheme",
+    "DEFAULT_SCHEME",
+    "SharedWordStore",
+    "attach_shared_store",
+    "export_shared_store",
+    "instrumentation",
 ]
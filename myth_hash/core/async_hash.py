@@ -0,0 +1,302 @@
+import asyncio
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import Executor
+from contextlib import aclosing
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, TypeVar
+
+from . import instrumentation
+from .datasets import DEFAULT_DATASETS
+from .hash_util import (
+    Name,
+    _hash_names_serial,
+    _render_table,
+    check_language,
+    hash_name,
+)
+
+# Longest time in seconds a chunk hashed on the event loop may block it. A name
+# takes about 1-2 µs, so the default allows chunks of a few thousand names.
+DEFAULT_STALL_BUDGET = 0.005
+# Size of the first chunk hashed on the event loop, before the time per name is
+# known. Small enough to stay within the budget on slow machines.
+INITIAL_CHUNK_SIZE = 256
+MIN_CHUNK_SIZE = 16
+MAX_CHUNK_SIZE = 65536
+# Chunks are sized to this fraction of the budget, so that jitter between chunks
+# rarely exceeds it.
+BUDGET_HEADROOM = 0.8
+# Chunks handed to an executor only need to amortize the handoff.
+EXECUTOR_CHUNK_SIZE = 4096
+DEFAULT_MAX_IN_FLIGHT = 4
+
+InputStrings = Iterable[str] | AsyncIterable[str]
+T = TypeVar("T")
+
+
+async def hash_name_async(
+    input_string: str,
+    language: str = "en",
+    executor: Executor | None = None,
+    dataset: str | None = None,
+) -> Name:
+    """
+    Generates the name of an input string from a coroutine. Without an executor,
+    the name is generated on the event loop, which blocks it for about as long as
+    a context switch to another thread would take. Use ``ahash_names`` to hash
+    many inputs.
+
+    :param input_string: The input string to hash
+    :param language: The output language
+    :param executor: An executor to generate the name in, e.g. to not block the
+                     event loop while the word data is loaded
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: The physical attribute, personality attribute and character noun
+    """
+    if executor is None:
+        return hash_name(input_string, language, dataset)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(
+            _call_with_dataset,
+            dataset,
+            _dataset_path(dataset),
+            hash_name,
+            input_string,
+            language,
+            dataset,
+        ),
+    )
+
+
+async def ahash_name_chunks(
+    input_strings: InputStrings,
+    language: str = "en",
+    *,
+    chunk_size: int | None = None,
+    stall_budget: float = DEFAULT_STALL_BUDGET,
+    executor: Executor | None = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    dataset: str | None = None,
+) -> AsyncGenerator[tuple[list[str], list[Name]], None]:
+    """
+    Hashes a stream of input strings in chunks and yields each chunk together
+    with its names, in input order, like ``hash_name_chunks``. Other tasks run
+    between two chunks.
+
+    Without an executor, chunks are hashed on the event loop. Their size adapts
+    to the measured time per name, so that hashing a chunk blocks the loop for
+    about ``stall_budget`` seconds at most; garbage collection and a busy machine
+    can still exceed it. Word data that is not loaded yet is loaded in a thread,
+    and time spent waiting for an asynchronous source does not count. The
+    throughput is close to ``hash_names``.
+
+    The options after the language are keyword-only.
+
+    With an executor, e.g. a ``ProcessPoolExecutor`` shared by the application,
+    chunks are hashed there and the loop only collects the inputs. At most
+    ``max_in_flight`` chunks are submitted but not yet consumed, so a slow
+    consumer stops reading from the source instead of buffering its names.
+
+    :param input_strings: An iterable or asynchronous iterable of input strings
+    :param language: The output language
+    :param chunk_size: Inputs per chunk. None sizes chunks by the stall budget,
+                       or uses ``EXECUTOR_CHUNK_SIZE`` with an executor.
+    :param stall_budget: Seconds a chunk may block the event loop
+    :param executor: An executor to hash the chunks in
+    :param max_in_flight: Chunks submitted to the executor at a time
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :raises ValueError: If the language is not supported or a size is not
+                        positive
+    """
+    check_language(language)
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}.")
+    if stall_budget <= 0:
+        raise ValueError(f"Stall budget must be positive, got {stall_budget}.")
+    if max_in_flight < 1:
+        raise ValueError(
+            f"Number of chunks in flight must be positive, got {max_in_flight}."
+        )
+
+    if executor is None:
+        chunks = _hash_on_loop(
+            input_strings, language, chunk_size, stall_budget, dataset
+        )
+    else:
+        chunks = _hash_in_executor(
+            input_strings,
+            language,
+            chunk_size or EXECUTOR_CHUNK_SIZE,
+            executor,
+            max_in_flight=max_in_flight,
+            dataset=dataset,
+        )
+    async with aclosing(chunks):
+        async for chunk, names in chunks:
+            yield chunk, names
+
+
+async def ahash_names(
+    input_strings: InputStrings,
+    language: str = "en",
+    *,
+    chunk_size: int | None = None,
+    stall_budget: float = DEFAULT_STALL_BUDGET,
+    executor: Executor | None = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    dataset: str | None = None,
+) -> AsyncGenerator[Name, None]:
+    """
+    Like ``ahash_name_chunks``, but yields the names one by one. Iterating over
+    single names costs about a fifth of the throughput; consume the chunks of
+    ``ahash_name_chunks`` where that matters.
+
+    :return: One name triple per input string, in input order
+    """
+    chunks = ahash_name_chunks(
+        input_strings,
+        language,
+        chunk_size=chunk_size,
+        stall_budget=stall_budget,
+        executor=executor,
+        max_in_flight=max_in_flight,
+        dataset=dataset,
+    )
+    async with aclosing(chunks):
+        async for _, names in chunks:
+            for name in names:
+                yield name
+
+
+async def _hash_on_loop(
+    input_strings: InputStrings,
+    language: str,
+    chunk_size: int | None,
+    stall_budget: float,
+    dataset: str | None,
+) -> AsyncGenerator[tuple[list[str], list[Name]], None]:
+    budget_ns = stall_budget * 1e9
+    size = chunk_size or INITIAL_CHUNK_SIZE
+    from_async = isinstance(input_strings, AsyncIterable)
+    source = _source(input_strings)
+    # Loading the word data takes longer than any budget, so it happens in a
+    # thread. Afterwards, this only looks up the loaded table.
+    await asyncio.to_thread(_render_table, language, dataset)
+
+    while True:
+        started = perf_counter_ns()
+        chunk = await _next_chunk(source, size)
+        if not chunk:
+            return
+        if from_async:
+            # Waiting for the source let other tasks run.
+            started = perf_counter_ns()
+        names = _hash_names_serial(chunk, language, dataset)
+        elapsed_ns = perf_counter_ns() - started
+        if instrumentation.enabled:
+            instrumentation.record("async.chunk", started, len(chunk))
+
+        if chunk_size is None:
+            # Grows at most twofold per chunk, so a single fast chunk cannot
+            # overshoot the budget.
+            size = int(BUDGET_HEADROOM * budget_ns * len(chunk) / max(elapsed_ns, 1))
+            size = max(MIN_CHUNK_SIZE, min(size, 2 * len(chunk), MAX_CHUNK_SIZE))
+        yield chunk, names
+        await asyncio.sleep(0)
+
+
+async def _hash_in_executor(
+    input_strings: InputStrings,
+    language: str,
+    chunk_size: int,
+    executor: Executor,
+    *,
+    max_in_flight: int,
+    dataset: str | None,
+) -> AsyncGenerator[tuple[list[str], list[Name]], None]:
+    loop = asyncio.get_running_loop()
+    dataset_path = _dataset_path(dataset)
+    source = _source(input_strings)
+    pending: deque[tuple[list[str], asyncio.Future[list[Name]]]] = deque()
+    exhausted = False
+    try:
+        while not exhausted or pending:
+            if not exhausted:
+                chunk = await _next_chunk(source, chunk_size)
+                if chunk:
+                    pending.append(
+                        (
+                            chunk,
+                            loop.run_in_executor(
+                                executor,
+                                partial(
+                                    _call_with_dataset,
+                                    dataset,
+                                    dataset_path,
+                                    _hash_names_serial,
+                                    chunk,
+                                    language,
+                                    dataset,
+                                ),
+                            ),
+                        )
+                    )
+                else:
+                    exhausted = True
+            if pending and (exhausted or len(pending) >= max_in_flight):
+                chunk, future = pending.popleft()
+                yield chunk, await future
+    finally:
+        # Chunks of a consumer that stopped early are not hashed anymore.
+        for _, future in pending:
+            future.cancel()
+
+
+def _dataset_path(dataset: str | None) -> Path | None:
+    return None if dataset is None else DEFAULT_DATASETS.path(dataset)
+
+
+def _call_with_dataset(
+    dataset: str | None,
+    dataset_path: Path | None,
+    function: Callable[..., T],
+    *args: Any,
+) -> T:
+    # The executor may be a process pool whose workers do not know the data sets
+    # registered in this process. Registering the same directory again is a no-op.
+    if dataset is not None and dataset_path is not None:
+        DEFAULT_DATASETS.register(dataset, dataset_path)
+    return function(*args)
+
+
+def _source(
+    input_strings: InputStrings,
+) -> Iterator[str] | AsyncIterator[str]:
+    if isinstance(input_strings, AsyncIterable):
+        return aiter(input_strings)
+    return iter(input_strings)
+
+
+async def _next_chunk(
+    source: Iterator[str] | AsyncIterator[str], size: int
+) -> list[str]:
+    if isinstance(source, Iterator):
+        return list(islice(source, size))
+    chunk: list[str] = []
+    async for input_string in source:
+        chunk.append(input_string)
+        if len(chunk) >= size:
+            break
+    return chunk
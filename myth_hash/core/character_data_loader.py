@@ -1,17 +1,48 @@
 import json
+import logging
+import marshal
+import os
+import sys
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Optional
 
+from . import instrumentation
+from .compiled_data import (
+    RawWordList,
+    SourceStats,
+    compile_data,
+    compile_sources,
+    load_compiled_data,
+    source_digests,
+    source_stats,
+    split_languages,
+    write_compiled_data,
+)
+from .render_table import NameIndex, RenderTable, build_name_index, build_render_table
 from .words import CharacterNoun, NominativAdjective
 
+if TYPE_CHECKING:
+    from .shared_store import SharedWordStore
+
 BASE_PATH = Path(__file__).parent.parent / "data"
 CHARACTER_NOUNS_FILE = BASE_PATH / "character_nouns.json"
 PHYSICAL_ATTRIBUTES_FILE = BASE_PATH / "physical_attributes.json"
 PERSONALITY_ATTRIBUTES_FILE = BASE_PATH / "personality_attributes.json"
+COMPILED_DATA_FILE = BASE_PATH / "character_data.marshal"
+# The word objects and tables of a built language take about this multiple of
+# the size of the strings of its render table (measured with tracemalloc).
+TABLE_MEMORY_FACTOR = 2.7
+SOURCE_FILES = {
+    "character_nouns": CHARACTER_NOUNS_FILE,
+    "physical_attributes": PHYSICAL_ATTRIBUTES_FILE,
+    "personality_attributes": PERSONALITY_ATTRIBUTES_FILE,
+}
 
 
-@dataclass
+@dataclass(frozen=True)
 class CharacterData:
     character_nouns: list[CharacterNoun]
     physical_attributes: list[NominativAdjective]
@@ -19,20 +50,223 @@ class CharacterData:
 
 
 class CharacterDataLoader:
+    """
+    Process-wide singleton that loads the word data and builds the render tables
+    of each language on first use. Loading and building happen under a lock, so
+    concurrent first calls load everything exactly once. Built data is never
+    changed afterwards: every update publishes a new dict, so readers do not need
+    the lock and never see a partial update.
+
+    ``from_directory`` creates further, independent loaders for data sets in
+    other directories. ``reload`` replaces the shared instance with a freshly
+    loaded one when the word lists change.
+    """
+
     _instance: Optional["CharacterDataLoader"] = None
+    _lock = threading.RLock()
+    # Per language either a marshal blob of the compiled data or the raw word
+    # lists read from JSON. Word objects are only built for requested languages.
+    _language_sources: dict[str, bytes | dict[str, RawWordList]] = {}
+    _language_data: dict[str, CharacterData] = {}
     _character_data: CharacterData | None = None
+    _render_tables: dict[str, RenderTable] = {}
+    _name_indexes: dict[str, NameIndex] = {}
+    _shared_store: Optional["SharedWordStore"] = None
+    _source_files: dict[str, Path] = {}
+    _source_stats: SourceStats = {}
+    _source_digests: dict[str, str] = {}
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._load_data()
-        return cls._instance
-
-    def _load_data(self) -> None:
-        self._character_data = CharacterData(
-            character_nouns=self._load_character_nouns(),
-            physical_attributes=self._load_attributes(PHYSICAL_ATTRIBUTES_FILE),
-            personality_attributes=self._load_attributes(PERSONALITY_ATTRIBUTES_FILE),
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None:
+                    started = perf_counter_ns()
+                    instance = super().__new__(cls)
+                    instance._load_data()
+                    # Published only when loaded, so other threads never get a
+                    # half-initialized instance.
+                    cls._instance = instance
+                    if instrumentation.enabled:
+                        instrumentation.record("loader.load", started)
+        return instance
+
+    @classmethod
+    def from_directory(cls, data_dir: str | os.PathLike[str]) -> "CharacterDataLoader":
+        """
+        Creates a loader for the data set in a directory, independent of the shared
+        instance. The directory holds the three JSON word lists and optionally
+        their compiled artifact, with the same file names as the package data. A
+        missing or stale artifact is compiled, which validates all words, and
+        written to the directory if it is writable.
+
+        :param data_dir: The directory of the data set
+        :return: A new loader
+        :raises ValueError: If the word lists are invalid
+        :raises OSError: If a word list cannot be read
+        """
+        loader = super().__new__(cls)
+        loader._load_data(Path(data_dir), compile_stale=True)
+        return loader
+
+    @classmethod
+    def reload(cls, force: bool = False) -> bool:
+        """
+        Reloads the shared instance if its word lists changed on disk. The new data
+        is loaded, validated and the render tables and name indexes of all warm
+        languages are built before the new instance replaces the old one in a
+        single assignment. Calls that already got the old instance or its tables
+        finish with them, later calls get the new ones, and no read takes a lock.
+        Invalid word lists raise and leave the old data in place.
+
+        Changing the length of a word list changes the names of most inputs. An
+        attached shared store is exported again from the new word lists; if that
+        fails, the new tables are kept in memory.
+
+        :param force: Reload even if the word lists did not change
+        :return: True if the data was reloaded, False if nothing changed or nothing
+                 was loaded yet
+        :raises ValueError: If the word lists are invalid
+        :raises OSError: If a word list cannot be read
+        """
+        with cls._lock:
+            current = cls._instance
+            if current is None or not (force or current.sources_changed()):
+                return False
+
+            started = perf_counter_ns()
+            loader = current.reloaded()
+            cls._instance = loader
+
+        if instrumentation.enabled:
+            instrumentation.record("loader.reload", started)
+        logging.info(
+            f"Reloaded character data from {loader.data_dir} in "
+            f"{(perf_counter_ns() - started) / 1e6:.1f} ms"
+        )
+        return True
+
+    def reloaded(self) -> "CharacterDataLoader":
+        """
+        Loads the word lists of this loader again into a new loader with the same
+        languages built, see ``reload``. This loader is not changed.
+
+        :return: The new loader
+        :raises ValueError: If the word lists are invalid
+        :raises OSError: If a word list cannot be read
+        """
+        loader = type(self).from_directory(self.data_dir)
+        if self._shared_store is not None:
+            # Imported here, because the store module imports this one.
+            from .shared_store import (  # pylint: disable=import-outside-toplevel
+                SharedWordStore,
+                export_shared_store,
+            )
+
+            path = self._shared_store.path
+            try:
+                export_shared_store(path, loader)
+                loader.attach_shared_store(SharedWordStore(path))
+            except OSError as e:
+                logging.warning(f"Word store {path} not exported, detaching it: {e}")
+        for language in self._render_tables:
+            loader.render_table(language)
+        for language in self._name_indexes:
+            loader.name_index(language)
+        return loader
+
+    def sources_changed(self) -> bool:
+        """
+        Checks whether the word lists of this loader changed since they were
+        loaded. Files are only hashed if their size, modification time or inode
+        changed, so checks of unchanged files cost one ``stat`` per file. Files
+        that are missing, e.g. in the middle of a deployment, count as unchanged.
+        """
+        try:
+            stats = source_stats(self._source_files)
+            if stats == self._source_stats:
+                return False
+            digests = source_digests(self._source_files)
+        except OSError:
+            return False
+        if digests != self._source_digests:
+            return True
+        # Touched, but not changed. Remember the new stats to skip hashing next time.
+        self._source_stats = stats
+        return False
+
+    def _load_data(
+        self, data_dir: Path = BASE_PATH, compile_stale: bool = False
+    ) -> None:
+        self.data_dir = data_dir
+        # Guards building the data of this loader. The class-level ``_lock`` only
+        # guards creating and replacing the shared instance.
+        self._build_lock = threading.RLock()
+        self._language_data = {}
+        self._character_data = None
+        self._render_tables = {}
+        self._name_indexes = {}
+
+        compiled_file = data_dir / COMPILED_DATA_FILE.name
+        source_files = {
+            name: data_dir / path.name for name, path in SOURCE_FILES.items()
+        }
+        self._source_files = source_files
+        # Taken before the sources are read, so that changes during loading are
+        # detected by the next check.
+        try:
+            self._source_stats = source_stats(source_files)
+        except OSError:
+            self._source_stats = {}
+        compiled = load_compiled_data(compiled_file, source_files)
+        if compiled is not None:
+            self._source_digests = compiled["sources"]
+            if (
+                compile_stale
+                and self._source_stats
+                and compiled["source_stats"] != self._source_stats
+            ):
+                # The sources were hashed to validate the artifact, e.g. after
+                # they were copied. Recording their new stats skips that on the
+                # next load. The package data is never written to.
+                compiled["source_stats"] = self._source_stats
+                _write_compiled_data(compiled_file, compiled)
+        elif compile_stale:
+            logging.debug(f"Compiling character data in {data_dir}")
+            compiled = compile_sources(source_files)
+            self._source_digests = compiled["sources"]
+            _write_compiled_data(compiled_file, compiled)
+        if compiled is not None:
+            # The compiled data was validated when it was built.
+            self._language_sources = dict(compiled["languages"])
+            return
+
+        logging.debug("Loading character data from JSON sources")
+        self._source_digests = source_digests(source_files)
+        self._language_sources = dict(
+            split_languages(
+                {
+                    "character_nouns": [
+                        (noun.character_id, noun.data)
+                        for noun in self._load_character_nouns(
+                            source_files["character_nouns"]
+                        )
+                    ],
+                    "physical_attributes": [
+                        (adjective.word_id, adjective.words)
+                        for adjective in self._load_attributes(
+                            source_files["physical_attributes"]
+                        )
+                    ],
+                    "personality_attributes": [
+                        (adjective.word_id, adjective.words)
+                        for adjective in self._load_attributes(
+                            source_files["personality_attributes"]
+                        )
+                    ],
+                }
+            )
         )
 
     @staticmethod
@@ -49,23 +283,241 @@ class CharacterDataLoader:
         ]
 
     @staticmethod
-    def _load_character_nouns() -> list[CharacterNoun]:
+    def _load_character_nouns(
+        file_path: Path = CHARACTER_NOUNS_FILE,
+    ) -> list[CharacterNoun]:
         try:
-            with open(CHARACTER_NOUNS_FILE, encoding="utf8") as f:
+            with open(file_path, encoding="utf8") as f:
                 json_dict = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise RuntimeError(
-                f"Error loading character nouns from {CHARACTER_NOUNS_FILE}: {e}"
+                f"Error loading character nouns from {file_path}: {e}"
             ) from e
 
         return [
             CharacterNoun(char_id, data["data"]) for char_id, data in json_dict.items()
         ]
 
+    @property
+    def languages(self) -> list[str]:
+        return sorted(self._language_sources)
+
+    @property
+    def loaded_languages(self) -> list[str]:
+        return sorted(self._language_data)
+
+    @property
+    def list_sizes(self) -> tuple[int, int, int]:
+        """
+        The number of physical attributes, personality attributes and nouns. The
+        sizes are the same for every language.
+        """
+        table = next(iter(self._render_tables.values()), None)
+        if table is None:
+            table = self.render_table(self.languages[0])
+        return table.list_sizes
+
+    @property
+    def source_digests(self) -> dict[str, str]:
+        """
+        The SHA-256 digests of the word lists the data was loaded from, see
+        ``source_digests`` of the compiled data.
+        """
+        return dict(self._source_digests)
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        An estimate of the memory of the loaded data in bytes: the sources of all
+        languages and the words and tables of the built languages.
+        """
+        # Sources read from JSON are only shared by the package data and not
+        # counted.
+        size = sum(
+            len(source)
+            for source in self._language_sources.values()
+            if isinstance(source, bytes)
+        )
+        tables_size = 0
+        for table in self._render_tables.values():
+            for tables in (table.physical_attributes, table.personality_attributes):
+                tables_size += sys.getsizeof(tables) + sum(
+                    sys.getsizeof(words) + sum(map(sys.getsizeof, words))
+                    for words in tables
+                )
+            tables_size += sys.getsizeof(table.character_nouns) + sum(
+                map(sys.getsizeof, table.character_nouns)
+            )
+        return size + int(TABLE_MEMORY_FACTOR * tables_size)
+
+    def language_data(self, language: str) -> CharacterData:
+        """
+        Returns the character data of a single language. The words of a language
+        are built the first time the language is requested and only contain the
+        entries of that language.
+
+        :param language: The language to load
+        :return: The character data of the language
+        :raises ValueError: If there is no data for the language
+        """
+        data = self._language_data.get(language)
+        if data is None:
+            with self._build_lock:
+                data = self._language_data.get(language)
+                if data is None:
+                    data = self._build_language_data(language)
+                    # Publish a new dict, so readers never see a partial update.
+                    self._language_data = {**self._language_data, language: data}
+        return data
+
+    def _build_language_data(self, language: str) -> CharacterData:
+        try:
+            source = self._language_sources[language]
+        except KeyError as exc:
+            raise ValueError(
+                f"No character data available for language '{language}'."
+            ) from exc
+
+        if isinstance(source, bytes):
+            # Loaded from the artifact this package compiled, see
+            # ``load_compiled_data``.
+            source = marshal.loads(source)  # nosec B302
+        logging.debug(f"Building character data for language '{language}'")
+
+        return CharacterData(
+            character_nouns=[
+                CharacterNoun(char_id, data)
+                for char_id, data in source["character_nouns"]
+            ],
+            physical_attributes=[
+                NominativAdjective(word_id, words, validate=False)
+                for word_id, words in source["physical_attributes"]
+            ],
+            personality_attributes=[
+                NominativAdjective(word_id, words, validate=False)
+                for word_id, words in source["personality_attributes"]
+            ],
+        )
+
     @property
     def character_data(self) -> CharacterData:
+        """
+        The character data of all languages. Accessing it loads every language, so
+        prefer ``language_data`` when only one language is needed.
+        """
         if self._character_data is None:
-            self._load_data()
-        if self._character_data is None:
-            raise RuntimeError("Character data not loaded")
+            with self._build_lock:
+                if self._character_data is None:
+                    self._character_data = _merge_languages(
+                        [self.language_data(language) for language in self.languages]
+                    )
         return self._character_data
+
+    def render_table(self, language: str) -> RenderTable:
+        table = self._render_tables.get(language)
+        if table is None:
+            with self._build_lock:
+                table = self._render_tables.get(language)
+                if table is None:
+                    started = perf_counter_ns()
+                    table = self._build_render_table(language)
+                    if instrumentation.enabled:
+                        instrumentation.record("loader.build_table", started)
+                    self._render_tables = {**self._render_tables, language: table}
+        return table
+
+    def name_index(self, language: str) -> NameIndex:
+        index = self._name_indexes.get(language)
+        if index is None:
+            with self._build_lock:
+                index = self._name_indexes.get(language)
+                if index is None:
+                    index = build_name_index(self.render_table(language))
+                    self._name_indexes = {**self._name_indexes, language: index}
+        return index
+
+    def _build_render_table(self, language: str) -> RenderTable:
+        if self._shared_store is not None:
+            return self._shared_store.render_table(language)
+        return self.build_render_table(language)
+
+    def build_render_table(self, language: str) -> RenderTable:
+        """
+        Builds a new render table from the words of this loader, even if a shared
+        store is attached. Use ``render_table`` for the cached table.
+
+        :param language: The language of the table
+        :raises ValueError: If there is no data for the language
+        """
+        data = self.language_data(language)
+        return build_render_table(
+            data.character_nouns,
+            data.physical_attributes,
+            data.personality_attributes,
+            language,
+        )
+
+    def attach_shared_store(self, store: Optional["SharedWordStore"]) -> None:
+        """
+        Serves all render tables from a shared word store instead of building them
+        from the word objects of this process.
+
+        :param store: The store to attach, or None to detach the current store
+        """
+        with self._build_lock:
+            self._shared_store = store
+            self._render_tables = {}
+            self._name_indexes = {}
+
+
+def _write_compiled_data(compiled_file: Path, compiled: dict[str, Any]) -> None:
+    try:
+        write_compiled_data(compiled_file, compiled)
+    except OSError as e:
+        logging.debug(f"Compiled data not written to {compiled_file}: {e}")
+
+
+def _merge_languages(language_data: list[CharacterData]) -> CharacterData:
+    return CharacterData(
+        character_nouns=[
+            CharacterNoun(
+                nouns[0].character_id,
+                {key: value for noun in nouns for key, value in noun.data.items()},
+            )
+            for nouns in zip(*(data.character_nouns for data in language_data))
+        ],
+        physical_attributes=[
+            NominativAdjective(
+                adjectives[0].word_id,
+                {
+                    key: value
+                    for adjective in adjectives
+                    for key, value in adjective.words.items()
+                },
+                validate=False,
+            )
+            for adjectives in zip(*(data.physical_attributes for data in language_data))
+        ],
+        personality_attributes=[
+            NominativAdjective(
+                adjectives[0].word_id,
+                {
+                    key: value
+                    for adjective in adjectives
+                    for key, value in adjective.words.items()
+                },
+                validate=False,
+            )
+            for adjectives in zip(
+                *(data.personality_attributes for data in language_data)
+            )
+        ],
+    )
+
+
+def compile_default_data() -> None:
+    """
+    Compiles the bundled JSON word lists into the artifact loaded by default.
+    """
+    compile_data(SOURCE_FILES, COMPILED_DATA_FILE)
+    print(f"Compiled character data to {COMPILED_DATA_FILE}")
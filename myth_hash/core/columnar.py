@@ -0,0 +1,293 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from .character_data_loader import CharacterDataLoader
+from .hash_util import check_language
+from .render_table import RenderTable
+from .vectorized import DIGEST_SIZE, _require_numpy, generate_indices_array
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on the installed extras
+    pa = None
+
+COLUMNS = ("physical_attribute", "personality_attribute", "character")
+# Rows hashed at once. Bounds the temporary digests and indices, which take 56
+# bytes per row, while the encoded columns take 6.
+ARRAY_CHUNK_SIZE = 65536
+
+_vocabularies: dict[str, tuple[RenderTable, "WordVocabulary"]] = {}
+_vocabularies_lock = threading.Lock()
+
+
+def _require_pyarrow() -> Any:
+    if pa is None:
+        raise ImportError(
+            "The columnar backend requires PyArrow. Install it with 'pip install myth-hash[arrow]'."
+        )
+    return pa
+
+
+@dataclass(frozen=True)
+class WordVocabulary:
+    """
+    The distinct words of every name part of a language, with tables that map
+    index triples to positions in these vocabularies. Words that occur at several
+    indices of a word list have a single position, so the vocabularies can serve
+    as the categories of dictionary-encoded columns.
+    """
+
+    language: str
+    physical_attributes: list[str]
+    personality_attributes: list[str]
+    character_nouns: list[str]
+    # int16 arrays. The adjective tables are indexed by noun index and adjective
+    # index, because the adjective forms depend on the gender of the noun.
+    physical_codes: Any
+    personality_codes: Any
+    noun_codes: Any
+
+    @property
+    def list_sizes(self) -> tuple[int, int, int]:
+        """
+        The sizes of the word lists the code tables were built from.
+        """
+        nouns, physical_size = self.physical_codes.shape
+        return physical_size, self.personality_codes.shape[1], nouns
+
+    def encode(self, indices: Any) -> tuple[Any, Any, Any]:
+        """
+        Maps index triples to vocabulary positions.
+
+        :param indices: An array of shape (N, 3) from ``generate_indices_array``
+        :return: The ``int16`` positions of the physical attributes, personality
+                 attributes and nouns
+        """
+        nouns = indices[:, 2]
+        return (
+            self.physical_codes[nouns, indices[:, 0]],
+            self.personality_codes[nouns, indices[:, 1]],
+            self.noun_codes[nouns],
+        )
+
+
+def word_vocabulary(language: str = "en") -> WordVocabulary:
+    """
+    Returns the vocabularies of a language. They are built once per render table.
+
+    :param language: The language of the words
+    :raises ValueError: If the language is not supported
+    """
+    check_language(language)
+    table = CharacterDataLoader().render_table(language)
+    cached = _vocabularies.get(language)
+    if cached is not None and cached[0] is table:
+        return cached[1]
+
+    with _vocabularies_lock:
+        cached = _vocabularies.get(language)
+        if cached is None or cached[0] is not table:
+            cached = table, _build_vocabulary(table)
+            _vocabularies[language] = cached
+    return cached[1]
+
+
+def _build_vocabulary(table: RenderTable) -> WordVocabulary:
+    numpy = _require_numpy()
+
+    def encode(words_by_noun: list[Any]) -> tuple[list[str], Any]:
+        positions: dict[str, int] = {}
+        codes = numpy.array(
+            [
+                [positions.setdefault(word, len(positions)) for word in words]
+                for words in words_by_noun
+            ],
+            dtype=numpy.int16,
+        )
+        return list(positions), codes
+
+    physical_words, physical_codes = encode(
+        [table.physical_attributes[gender] for gender in table.character_genders]
+    )
+    personality_words, personality_codes = encode(
+        [table.personality_attributes[gender] for gender in table.character_genders]
+    )
+    noun_words, noun_codes = encode([table.character_nouns])
+    return WordVocabulary(
+        language=table.language,
+        physical_attributes=physical_words,
+        personality_attributes=personality_words,
+        character_nouns=noun_words,
+        physical_codes=physical_codes,
+        personality_codes=personality_codes,
+        noun_codes=noun_codes[0],
+    )
+
+
+def hash_arrow(values: Any, language: str = "en") -> Any:
+    """
+    Hashes a PyArrow string or binary array into dictionary-encoded name columns.
+    Values are hashed straight from the Arrow buffers, without creating Python
+    strings, and every row of the result takes 6 bytes plus the shared
+    vocabularies. Strings get the same names as with ``hash_name``, binary values
+    the same as with ``hash_bytes``. Null values give null names.
+
+    :param values: A ``pyarrow.Array`` or ``pyarrow.ChunkedArray`` of strings or
+                   binary values, optionally dictionary-encoded
+    :param language: The output language
+    :return: A ``pyarrow.Table`` with the columns "physical_attribute",
+             "personality_attribute" and "character", chunked like the input
+    :raises ValueError: If the values are neither strings nor binary values
+    """
+    arrow = _require_pyarrow()
+    vocabulary = word_vocabulary(language)
+    dictionaries = [
+        arrow.array(words, type=arrow.string())
+        for words in (
+            vocabulary.physical_attributes,
+            vocabulary.personality_attributes,
+            vocabulary.character_nouns,
+        )
+    ]
+
+    chunks = values.chunks if isinstance(values, arrow.ChunkedArray) else [values]
+    columns: list[list[Any]] = [[], [], []]
+    for chunk in chunks:
+        codes, nulls = _encode_array(chunk, vocabulary)
+        for column, column_codes, dictionary in zip(columns, codes, dictionaries):
+            column.append(
+                arrow.DictionaryArray.from_arrays(
+                    arrow.array(column_codes, mask=nulls), dictionary
+                )
+            )
+
+    if isinstance(values, arrow.ChunkedArray):
+        arrays = [
+            arrow.chunked_array(
+                column, type=arrow.dictionary(arrow.int16(), arrow.string())
+            )
+            for column in columns
+        ]
+    else:
+        arrays = [column[0] for column in columns]
+    return arrow.Table.from_arrays(arrays, names=list(COLUMNS))
+
+
+def hash_series(series: Any, language: str = "en") -> Any:
+    """
+    Like ``hash_arrow``, but for a pandas Series. The Series is converted to Arrow
+    once, which does not copy Arrow-backed Series, and hashed from the Arrow
+    buffers.
+
+    :param series: A Series of strings or bytes. Missing values give missing names.
+    :param language: The output language
+    :return: A ``pandas.DataFrame`` with the index of the Series and a categorical
+             column per name part, see ``COLUMNS``
+    :raises ValueError: If the values are neither strings nor binary values
+    """
+    # Imported here, because loading pandas takes longer than hashing most batches
+    # and Arrow users do not need it.
+    import pandas  # pylint: disable=import-outside-toplevel
+
+    arrow = _require_pyarrow()
+    numpy = _require_numpy()
+    vocabulary = word_vocabulary(language)
+
+    values = arrow.array(series, from_pandas=True)
+    chunks = values.chunks if isinstance(values, arrow.ChunkedArray) else [values]
+    columns: list[list[Any]] = [[], [], []]
+    for chunk in chunks:
+        codes, nulls = _encode_array(chunk, vocabulary)
+        for column, column_codes in zip(columns, codes):
+            if nulls is not None:
+                column_codes[nulls] = -1
+            column.append(column_codes)
+
+    categories = (
+        vocabulary.physical_attributes,
+        vocabulary.personality_attributes,
+        vocabulary.character_nouns,
+    )
+    return pandas.DataFrame(
+        {
+            name: pandas.Categorical.from_codes(
+                (
+                    numpy.concatenate(column)
+                    if column
+                    else numpy.empty(0, dtype=numpy.int16)
+                ),
+                categories=words,
+            )
+            for name, column, words in zip(COLUMNS, columns, categories)
+        },
+        index=series.index,
+    )
+
+
+def _encode_array(array: Any, vocabulary: WordVocabulary) -> tuple[list[Any], Any]:
+    # Returns the vocabulary positions of the three name parts and a mask of the
+    # null rows, or None if there are none.
+    arrow = _require_pyarrow()
+    numpy = _require_numpy()
+
+    if arrow.types.is_null(array.type):
+        # Arrow infers this type for empty and all-missing input.
+        return [numpy.zeros(len(array), dtype=numpy.int16) for _ in COLUMNS], (
+            numpy.ones(len(array), dtype=bool)
+        )
+
+    nulls = array.is_null().to_numpy(zero_copy_only=False) if array.null_count else None
+    if arrow.types.is_dictionary(array.type):
+        # Every distinct value is hashed once, the rows only pick the results.
+        dictionary_codes, dictionary_nulls = _encode_array(array.dictionary, vocabulary)
+        rows = array.indices.fill_null(0).to_numpy(zero_copy_only=False)
+        if dictionary_nulls is not None:
+            nulls = (
+                dictionary_nulls[rows]
+                if nulls is None
+                else nulls | dictionary_nulls[rows]
+            )
+        return [codes[rows] for codes in dictionary_codes], nulls
+
+    if arrow.types.is_string_view(array.type) or arrow.types.is_binary_view(array.type):
+        array = array.cast(
+            arrow.large_string()
+            if arrow.types.is_string_view(array.type)
+            else arrow.large_binary()
+        )
+    if arrow.types.is_string(array.type) or arrow.types.is_binary(array.type):
+        offset_type = numpy.int32
+    elif arrow.types.is_large_string(array.type) or arrow.types.is_large_binary(
+        array.type
+    ):
+        offset_type = numpy.int64
+    else:
+        raise ValueError(f"Expected string or binary values, got {array.type}.")
+
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = numpy.frombuffer(offsets_buffer, dtype=offset_type)[
+        array.offset : array.offset + len(array) + 1
+    ]
+    data = memoryview(data_buffer if data_buffer is not None else b"")
+    # Taken from the vocabulary, so the indices match its tables even if the data
+    # is reloaded in the meantime.
+    list_sizes = vocabulary.list_sizes
+
+    codes = [numpy.empty(len(array), dtype=numpy.int16) for _ in COLUMNS]
+    sha256 = hashlib.sha256
+    for start in range(0, len(array), ARRAY_CHUNK_SIZE):
+        bounds = offsets[start : start + ARRAY_CHUNK_SIZE + 1].tolist()
+        digests = b"".join(
+            sha256(data[begin:end]).digest()
+            for begin, end in zip(bounds, islice(bounds, 1, None))
+        )
+        indices = generate_indices_array(
+            numpy.frombuffer(digests, dtype=numpy.uint8).reshape(-1, DIGEST_SIZE),
+            list_sizes,
+        )
+        for column_codes, chunk_codes in zip(codes, vocabulary.encode(indices)):
+            column_codes[start : start + len(indices)] = chunk_codes
+    return codes, nulls
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import marshal
+import os
+from pathlib import Path
+from typing import Any
+
+from .render_table import build_render_table
+from .words import CharacterNoun, NominativAdjective
+
+# Bump whenever the layout of the compiled data changes.
+FORMAT_VERSION = 3
+WORD_LISTS = ("character_nouns", "physical_attributes", "personality_attributes")
+
+RawWordList = list[tuple[Any, dict]]
+# Per source file its inode, size and modification time. A file replaced by a
+# rename gets a new inode even if the other two stay the same.
+SourceStats = dict[str, tuple[int, int, int]]
+
+
+def source_digests(source_files: dict[str, Path]) -> dict[str, str]:
+    """
+    Returns the SHA-256 digest of each JSON source file. The digests are stored in
+    the compiled data to detect stale artifacts.
+
+    :param source_files: Mapping of data set names to JSON source files
+    :return: Mapping of data set names to hex digests
+    """
+    return {
+        name: hashlib.sha256(path.read_bytes()).hexdigest()
+        for name, path in source_files.items()
+    }
+
+
+def source_stats(source_files: dict[str, Path]) -> SourceStats:
+    """
+    Returns the inode, size and modification time of each JSON source file. They
+    are stored in the compiled data next to the digests, so that sources whose
+    stats did not change are not hashed again.
+
+    :param source_files: Mapping of data set names to JSON source files
+    :return: Mapping of data set names to (inode, size, modification time)
+    :raises OSError: If a source file is missing
+    """
+    stats = {}
+    for name, path in source_files.items():
+        st = path.stat()
+        stats[name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def split_languages(
+    word_lists: dict[str, RawWordList],
+) -> dict[str, dict[str, RawWordList]]:
+    """
+    Splits raw word lists into one set of word lists per language. Every word keeps
+    its position, but only carries the entries of its language.
+
+    :param word_lists: Mapping of the ``WORD_LISTS`` names to (id, data) pairs
+    :return: Mapping of languages to word lists of that language only
+    """
+    languages = sorted(
+        {language for _, data in word_lists["character_nouns"] for language in data}
+    )
+    return {
+        language: {
+            name: [
+                (word_id, {language: data[language]} if language in data else {})
+                for word_id, data in words
+            ]
+            for name, words in word_lists.items()
+        }
+        for language in languages
+    }
+
+
+def compile_data(source_files: dict[str, Path], output_file: Path) -> None:
+    """
+    Compiles the JSON source files into a marshal artifact with one separately
+    loadable blob per language. All words are validated and every language is
+    rendered once, so invalid data fails here instead of when the artifact is
+    loaded.
+
+    :param source_files: Mapping of the ``WORD_LISTS`` names to their JSON source
+                         files
+    :param output_file: Path of the compiled artifact
+    :raises ValueError: If the source data is invalid
+    """
+    write_compiled_data(output_file, compile_sources(source_files))
+
+
+def write_compiled_data(output_file: Path, compiled: dict[str, Any]) -> None:
+    """
+    Writes compiled data to ``output_file``. The file is replaced atomically, so
+    concurrent loaders read either the old or the new artifact, never a partial
+    one.
+
+    :param output_file: Path of the compiled artifact
+    :param compiled: The data returned by ``compile_sources``
+    """
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        tmp_file.write_bytes(marshal.dumps(compiled))
+        os.replace(tmp_file, output_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+def compile_sources(source_files: dict[str, Path]) -> dict[str, Any]:
+    """
+    Like ``compile_data``, but returns the compiled data instead of writing it.
+
+    :param source_files: Mapping of the ``WORD_LISTS`` names to their JSON source
+                         files
+    :return: The compiled data, as ``load_compiled_data`` returns it
+    :raises ValueError: If the source data is invalid
+    """
+    # Taken before the sources are read, so that changes while compiling make the
+    # artifact stale.
+    stats = source_stats(source_files)
+    sources = {}
+    for name, path in source_files.items():
+        with open(path, encoding="utf8") as f:
+            sources[name] = json.load(f)
+
+    word_lists: dict[str, RawWordList] = {
+        "character_nouns": _word_list(
+            "character_nouns", sources["character_nouns"], "data"
+        ),
+        "physical_attributes": _word_list(
+            "physical_attributes", sources["physical_attributes"], "words"
+        ),
+        "personality_attributes": _word_list(
+            "personality_attributes", sources["personality_attributes"], "words"
+        ),
+    }
+
+    languages = split_languages(word_lists)
+    nouns = [
+        CharacterNoun(char_id, data) for char_id, data in word_lists["character_nouns"]
+    ]
+    physical_attributes = [
+        NominativAdjective(word_id, words)
+        for word_id, words in word_lists["physical_attributes"]
+    ]
+    personality_attributes = [
+        NominativAdjective(word_id, words)
+        for word_id, words in word_lists["personality_attributes"]
+    ]
+    for language in languages:
+        build_render_table(nouns, physical_attributes, personality_attributes, language)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "sources": source_digests(source_files),
+        "source_stats": stats,
+        "languages": {
+            language: marshal.dumps(language_word_lists)
+            for language, language_word_lists in languages.items()
+        },
+    }
+
+
+def _word_list(name: str, source: Any, field: str) -> RawWordList:
+    # Checks the layout of a parsed source, so that malformed files fail with a
+    # ValueError like invalid words.
+    if not isinstance(source, dict):
+        raise ValueError(f"The {name} source must be a JSON object.")
+    word_list = []
+    for word_id, entry in source.items():
+        if not isinstance(entry, dict) or not isinstance(entry.get(field), dict):
+            raise ValueError(
+                f"Entry '{word_id}' of the {name} source must be an object with an "
+                f"object '{field}'."
+            )
+        word_list.append((word_id, entry[field]))
+    return word_list
+
+
+def load_compiled_data(
+    compiled_file: Path, source_files: dict[str, Path]
+) -> dict[str, Any] | None:
+    """
+    Loads a compiled artifact. Returns None if the artifact is missing, unreadable,
+    of a different format version or was compiled from different JSON sources.
+    The sources are only hashed if their stats differ from the recorded ones.
+
+    :param compiled_file: Path of the compiled artifact
+    :param source_files: Mapping of data set names to JSON source files
+    :return: The compiled data or None
+    """
+    try:
+        # The artifact is written by this package next to its own sources, so it
+        # is as trusted as the package code; marshal cannot execute code anyway.
+        compiled = marshal.loads(compiled_file.read_bytes())  # nosec B302
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logging.debug(f"Compiled data {compiled_file} not usable: {e}")
+        return None
+
+    if not isinstance(compiled, dict):
+        logging.debug(f"Compiled data {compiled_file} has an invalid layout")
+        return None
+    if compiled.get("format_version") != FORMAT_VERSION:
+        logging.debug(f"Compiled data {compiled_file} has an outdated format")
+        return None
+    try:
+        if compiled.get("source_stats") == source_stats(source_files):
+            return compiled
+        digests = source_digests(source_files)
+    except OSError:
+        # Without the sources there is nothing to fall back to, so trust the artifact.
+        digests = compiled.get("sources", {})
+    if compiled.get("sources") != digests:
+        logging.debug(f"Compiled data {compiled_file} is stale")
+        return None
+
+    return compiled
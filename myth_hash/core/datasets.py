@@ -0,0 +1,208 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+
+from . import instrumentation
+from .character_data_loader import CharacterDataLoader
+from .render_table import RenderTable
+
+# A data set with both languages takes about 0.5 MB, so the default budget keeps
+# well over a hundred of them loaded.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+@dataclass
+class _LoadedDataset:
+    path: Path
+    loader: CharacterDataLoader
+    tables: dict[str, RenderTable] = field(default_factory=dict)
+    size: int = 0
+
+
+class DatasetRegistry:
+    """
+    Named data sets with their own word lists, e.g. one per tenant. Data sets are
+    loaded on first use with ``CharacterDataLoader.from_directory`` and kept until
+    the estimated memory of all loaded data sets exceeds the budget. Then the
+    least recently used data sets are evicted; they are loaded again on their next
+    use. The registry is thread-safe.
+    """
+
+    def __init__(self, memory_budget: int | None = DEFAULT_MEMORY_BUDGET) -> None:
+        """
+        Constructor for the DatasetRegistry class.
+
+        :param memory_budget: Estimated bytes that loaded data sets may take in
+                              total, see ``CharacterDataLoader.memory_usage``. The
+                              most recently used data set is kept even if it alone
+                              exceeds the budget. None means unbounded.
+        :raises ValueError: If the budget is negative
+        """
+        if memory_budget is not None and memory_budget < 0:
+            raise ValueError(
+                f"Memory budget must not be negative, got {memory_budget}."
+            )
+        self.memory_budget = memory_budget
+        self._paths: dict[str, Path] = {}
+        # Loaded data sets, the least recently used first.
+        self._loaded: OrderedDict[str, _LoadedDataset] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str | os.PathLike[str]) -> None:
+        """
+        Registers a data set. Nothing is loaded until the data set is used.
+        Registering a name again with another directory replaces the data set.
+
+        :param name: The name of the data set
+        :param path: The directory with the word lists of the data set
+        :raises ValueError: If the name is empty or the directory does not exist
+        """
+        if not name:
+            raise ValueError("Data set names cannot be empty.")
+        data_dir = Path(path)
+        if not data_dir.is_dir():
+            raise ValueError(f"Data set directory '{data_dir}' does not exist.")
+        with self._lock:
+            if self._paths.get(name) != data_dir:
+                self._paths[name] = data_dir
+                self._loaded.pop(name, None)
+
+    def unregister(self, name: str) -> None:
+        """
+        Removes a data set and frees its data.
+
+        :raises ValueError: If the data set is not registered
+        """
+        with self._lock:
+            if self._paths.pop(name, None) is None:
+                raise ValueError(f"Unknown data set '{name}'.")
+            self._loaded.pop(name, None)
+
+    def path(self, name: str) -> Path:
+        """
+        Returns the directory of a data set.
+
+        :raises ValueError: If the data set is not registered
+        """
+        try:
+            return self._paths[name]
+        except KeyError as e:
+            raise ValueError(f"Unknown data set '{name}'.") from e
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(self._paths)
+
+    @property
+    def loaded(self) -> list[str]:
+        """
+        The loaded data sets, the least recently used first.
+        """
+        with self._lock:
+            return list(self._loaded)
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        The estimated bytes of all loaded data sets.
+        """
+        with self._lock:
+            return sum(dataset.size for dataset in self._loaded.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths
+
+    def loader(self, name: str) -> CharacterDataLoader:
+        """
+        Returns the loader of a data set, loading the data set if necessary.
+
+        :param name: The name of the data set
+        :raises ValueError: If the data set is not registered or invalid
+        """
+        return self._acquire(name).loader
+
+    def render_table(self, name: str, language: str) -> RenderTable:
+        """
+        Returns the render table of a language of a data set.
+
+        :param name: The name of the data set
+        :param language: The language
+        :raises ValueError: If the data set is not registered or invalid, or has
+                            no words for the language
+        """
+        dataset = self._acquire(name)
+        table = dataset.tables.get(language)
+        if table is not None:
+            return table
+
+        table = dataset.loader.render_table(language)
+        with self._lock:
+            dataset.tables[language] = table
+            dataset.size = dataset.loader.memory_usage
+            evicted = self._evict()
+        _count_evictions(evicted)
+        return table
+
+    def _acquire(self, name: str) -> _LoadedDataset:
+        with self._lock:
+            dataset = self._loaded.get(name)
+            if dataset is not None:
+                self._loaded.move_to_end(name)
+                return dataset
+            data_dir = self.path(name)
+
+        # Loaded without holding the lock, so other data sets stay available in the
+        # meantime. If two threads load the same data set, the first one wins.
+        started = perf_counter_ns()
+        loader = CharacterDataLoader.from_directory(data_dir)
+        if instrumentation.enabled:
+            instrumentation.record("datasets.load", started)
+
+        evicted = 0
+        with self._lock:
+            dataset = self._loaded.get(name)
+            if dataset is None:
+                dataset = _LoadedDataset(data_dir, loader, size=loader.memory_usage)
+                if self._paths.get(name) == data_dir:
+                    self._loaded[name] = dataset
+                    evicted = self._evict()
+            else:
+                self._loaded.move_to_end(name)
+        _count_evictions(evicted)
+        return dataset
+
+    def _evict(self) -> int:
+        # Called with the lock held. The most recently used data set is never
+        # evicted. Returns the number of evicted data sets.
+        if self.memory_budget is None:
+            return 0
+        evicted = 0
+        total = sum(dataset.size for dataset in self._loaded.values())
+        while total > self.memory_budget and len(self._loaded) > 1:
+            _, dataset = self._loaded.popitem(last=False)
+            total -= dataset.size
+            evicted += 1
+        return evicted
+
+
+def _count_evictions(evicted: int) -> None:
+    if evicted and instrumentation.enabled:
+        instrumentation.increment("datasets.evictions", evicted)
+
+
+DEFAULT_DATASETS = DatasetRegistry()
+
+
+def register_dataset(name: str, path: str | os.PathLike[str]) -> None:
+    """
+    Registers a data set in the registry that the ``dataset`` argument of
+    ``hash_name`` and ``hash_names`` selects from, see ``DatasetRegistry``.
+
+    :param name: The name of the data set
+    :param path: The directory with the word lists of the data set
+    :raises ValueError: If the name is empty or the directory does not exist
+    """
+    DEFAULT_DATASETS.register(name, path)
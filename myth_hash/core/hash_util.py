@@ -1,8 +1,36 @@
 import hashlib
+import mmap
+import os
+import stat
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future
+from itertools import chain, islice, repeat
+from pathlib import Path
+from time import perf_counter_ns
+from typing import TypeVar
 
-from .character_data_loader import CharacterData, CharacterDataLoader
+from ..options import SUPPORTED_LANGUAGES
+from . import instrumentation
+from .character_data_loader import CharacterDataLoader
+from .datasets import DEFAULT_DATASETS
+from .render_table import RenderTable
 
-SUPPORTED_LANGUAGES = {"en", "de"}
+# Batches smaller than this are hashed in the calling process, because starting
+# worker processes costs more than hashing them serially.
+PARALLEL_THRESHOLD = 50_000
+PARALLEL_CHUNK_SIZE = 8192
+# Threads share the render tables, so their chunks only need to be large enough to
+# amortize scheduling a task.
+THREAD_CHUNK_SIZE = 2048
+# Large files are fed to the hash in slices of this size, so that only a small
+# part of a memory-mapped file has to be resident at a time.
+FILE_SLICE_SIZE = 1 << 20
+
+Name = tuple[str, str, str]
+Indices = tuple[int, int, int]
+Buffer = bytes | bytearray | memoryview
+T = TypeVar("T")
 
 
 def check_language(language: str) -> None:
@@ -12,52 +40,519 @@ def check_language(language: str) -> None:
         )
 
 
+def _render_table(language: str, dataset: str | None) -> RenderTable:
+    if dataset is None:
+        return CharacterDataLoader().render_table(language)
+    return DEFAULT_DATASETS.render_table(dataset, language)
+
+
+def _render_tables(languages: Iterable[str], dataset: str | None) -> list[RenderTable]:
+    if dataset is None:
+        # All tables come from one loader, so a reload cannot mix their list sizes.
+        data_loader = CharacterDataLoader()
+        return [data_loader.render_table(language) for language in languages]
+    return [DEFAULT_DATASETS.render_table(dataset, language) for language in languages]
+
+
 def generate_indices(input_string: str, list_sizes: list[int]) -> list[int]:
-    sha256 = hashlib.sha256(input_string.encode())
-    d = sha256.digest()
-    hash_length = len(d)
-    indices = []
+    if instrumentation.enabled:
+        started = perf_counter_ns()
+        indices = indices_from_digest(
+            hashlib.sha256(input_string.encode()).digest(), list_sizes
+        )
+        instrumentation.record("hash.generate_indices", started)
+        return indices
+    return indices_from_digest(
+        hashlib.sha256(input_string.encode()).digest(), list_sizes
+    )
+
+
+def indices_from_digest(d: bytes, list_sizes: list[int]) -> list[int]:
+    segment_length = len(d) // len(list_sizes)
 
-    for i, size in enumerate(list_sizes):
-        start = (hash_length // len(list_sizes)) * i
-        end = start + (hash_length // len(list_sizes))
+    return [
+        int.from_bytes(d[start : start + segment_length], "big") % size
+        for start, size in zip(range(0, len(d), segment_length), list_sizes)
+    ]
 
-        segment = int.from_bytes(d[start:end], "big")
 
-        index = segment % size
-        indices.append(index)
+def index_reader(
+    list_sizes: Sequence[int], segment_length: int
+) -> Callable[[bytes], Indices]:
+    """
+    Returns a function that derives the index triple from a digest, like
+    ``indices_from_digest`` with a fixed segment layout. The batch functions use
+    it, so the segment offsets are only computed once per batch.
+
+    :param list_sizes: The sizes of the physical attribute, personality attribute
+        and noun lists
+    :param segment_length: The number of digest bytes per segment
+    :return: A function from a digest to its index triple
+    """
+    physical_sizes, personality_sizes, nouns_size = list_sizes
+    personality_start = segment_length
+    nouns_start = 2 * segment_length
+    nouns_end = 3 * segment_length
+    from_bytes = int.from_bytes
+
+    def read_indices(d: bytes) -> Indices:
+        return (
+            from_bytes(d[:personality_start], "big") % physical_sizes,
+            from_bytes(d[personality_start:nouns_start], "big") % personality_sizes,
+            from_bytes(d[nouns_start:nouns_end], "big") % nouns_size,
+        )
 
-    return indices
+    return read_indices
 
 
-def hash_name(input_string: str, language: str = "en") -> tuple[str, str, str]:
+def name_reader(table: RenderTable, segment_length: int) -> Callable[[bytes], Name]:
+    """
+    Returns a function that derives the name from a digest, see ``index_reader``.
+
+    :param table: The render table of the output language
+    :param segment_length: The number of digest bytes per segment
+    :return: A function from a digest to its name
+    """
+    read_indices = index_reader(table.list_sizes, segment_length)
+    # Resolve the gender-specific adjective tables per noun up front so the
+    # returned function only does tuple indexing.
+    physical_by_noun = [table.physical_attributes[g] for g in table.character_genders]
+    personality_by_noun = [
+        table.personality_attributes[g] for g in table.character_genders
+    ]
+    nouns = table.character_nouns
+
+    def read_name(d: bytes) -> Name:
+        physical, personality, noun = read_indices(d)
+        return (
+            physical_by_noun[noun][physical],
+            personality_by_noun[noun][personality],
+            nouns[noun],
+        )
+
+    return read_name
+
+
+def hash_name(
+    input_string: str, language: str = "en", dataset: str | None = None
+) -> tuple[str, str, str]:
     check_language(language)
 
-    data_loader = CharacterDataLoader()
-    character_data: CharacterData = data_loader.character_data
+    table = _render_table(language, dataset)
+    indices = generate_indices(input_string, list(table.list_sizes))
+    return table.render(indices)
 
-    indices = generate_indices(
-        input_string,
-        [
-            len(character_data.physical_attributes),
-            len(character_data.personality_attributes),
-            len(character_data.character_nouns),
-        ],
+
+def hash_indices(input_string: str) -> Indices:
+    """
+    Computes the language independent index triple of an input string. The triple
+    can be stored and rendered later in any language with ``render_indices``.
+
+    :param input_string: The input string to hash
+    :return: The physical attribute, personality attribute and noun index
+    """
+    physical_attr_index, personality_attr_index, character_nouns_index = (
+        generate_indices(input_string, list(CharacterDataLoader().list_sizes))
     )
+    return physical_attr_index, personality_attr_index, character_nouns_index
+
 
-    physical_attr_index = indices[0]
-    personality_attr_index = indices[1]
-    character_nouns_index = indices[2]
+def render_indices(
+    indices: Indices, language: str = "en", dataset: str | None = None
+) -> Name:
+    """
+    Renders an index triple from ``hash_indices`` in the given language.
+
+    :param indices: The physical attribute, personality attribute and noun index
+    :param language: The output language
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: The physical attribute, personality attribute and character noun
+    """
+    check_language(language)
+    return _render_table(language, dataset).render(list(indices))
 
-    character_noun = character_data.character_nouns[character_nouns_index]
-    physical_attr = character_data.physical_attributes[physical_attr_index].word(
-        language, character_noun.get_attribute(language, "gender")
+
+def hash_bytes(
+    buffer: Buffer, language: str = "en", dataset: str | None = None
+) -> Name:
+    """
+    Generates the name of binary data. ``hash_bytes(s.encode())`` equals
+    ``hash_name(s)``. Buffers such as memoryviews are hashed without copying them.
+
+    :param buffer: The data to hash
+    :param language: The output language
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: The physical attribute, personality attribute and character noun
+    """
+    check_language(language)
+    table = _render_table(language, dataset)
+    return table.render(
+        indices_from_digest(hashlib.sha256(buffer).digest(), list(table.list_sizes))
     )
-    personality_attr = character_data.personality_attributes[
-        personality_attr_index
-    ].word(language, character_noun.get_attribute(language, "gender"))
-    return (
-        physical_attr,
-        personality_attr,
-        character_noun.get_attribute(language, "word"),
+
+
+def hash_file(
+    path: str | os.PathLike[str], language: str = "en", dataset: str | None = None
+) -> Name:
+    """
+    Generates the name of the contents of a file, see ``digest_file``.
+
+    :param path: The file to hash
+    :param language: The output language
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: The physical attribute, personality attribute and character noun
+    :raises OSError: If the file cannot be read
+    """
+    check_language(language)
+    table = _render_table(language, dataset)
+    return table.render(indices_from_digest(digest_file(path), list(table.list_sizes)))
+
+
+def hash_files(
+    paths: Iterable[str | os.PathLike[str]],
+    language: str = "en",
+    workers: int | None = None,
+    dataset: str | None = None,
+) -> list[Name]:
+    """
+    Generates the names of many files, see ``digest_files``.
+
+    :param paths: The files to hash
+    :param language: The output language
+    :param workers: Number of threads, see ``digest_files``
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: One name triple per file, in input order
+    :raises OSError: If a file cannot be read
+    """
+    check_language(language)
+    table = _render_table(language, dataset)
+    list_sizes = list(table.list_sizes)
+    return [
+        table.render(indices_from_digest(digest, list_sizes))
+        for digest in digest_files(paths, workers)
+    ]
+
+
+def digest_file(path: str | os.PathLike[str]) -> bytes:
+    """
+    Computes the SHA-256 digest of a file without reading it into memory. Regular
+    files are memory-mapped and fed to the hash in slices, other files such as
+    pipes are read in chunks.
+
+    :param path: The file to hash
+    :return: The digest
+    :raises OSError: If the file cannot be read
+    """
+    if instrumentation.enabled:
+        started = perf_counter_ns()
+        digest = _digest_file(path)
+        instrumentation.record("hash.digest_file", started)
+        return digest
+    return _digest_file(path)
+
+
+def _digest_file(path: str | os.PathLike[str]) -> bytes:
+    with open(path, "rb") as file:
+        file_stat = os.fstat(file.fileno())
+        size = file_stat.st_size
+        if instrumentation.enabled:
+            instrumentation.increment("hash.file_bytes", size)
+        # Empty files cannot be memory-mapped.
+        if not size or not stat.S_ISREG(file_stat.st_mode):
+            return hashlib.file_digest(file, "sha256").digest()
+
+        digest = hashlib.sha256()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for start in range(0, size, FILE_SLICE_SIZE):
+                    digest.update(view[start : start + FILE_SLICE_SIZE])
+        return digest.digest()
+
+
+def digest_files(
+    paths: Iterable[str | os.PathLike[str]], workers: int | None = None
+) -> Iterator[bytes]:
+    """
+    Computes the digests of many files in a thread pool. hashlib releases the GIL
+    while it hashes large buffers, so the threads hash files in parallel.
+
+    :param paths: The files to hash
+    :param workers: Number of threads. None uses the default of
+                    ``ThreadPoolExecutor``, 1 hashes in the calling thread.
+    :return: The digests, in input order
+    :raises OSError: If a file cannot be read
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers must be positive, got {workers}.")
+    if workers == 1:
+        yield from map(digest_file, paths)
+        return
+
+    # Imported here like the process pool, see ``hash_name_chunks``.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ThreadPoolExecutor,
     )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(digest_file, paths)
+
+
+def hash_name_multi(
+    input_string: str,
+    languages: Iterable[str] = ("en", "de"),
+    dataset: str | None = None,
+) -> dict[str, Name]:
+    """
+    Generates the name of an input string in several languages. The input is
+    hashed only once.
+
+    :param input_string: The input string to hash
+    :param languages: The output languages
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: A mapping of each language to its name triple
+    """
+    tables = _render_tables(_check_languages(languages), dataset)
+    indices = generate_indices(input_string, list(tables[0].list_sizes))
+    return {table.language: table.render(indices) for table in tables}
+
+
+def hash_names_multi(
+    input_strings: Iterable[str],
+    languages: Iterable[str] = ("en", "de"),
+    dataset: str | None = None,
+) -> list[dict[str, Name]]:
+    """
+    Batch variant of ``hash_name_multi``. Every input is hashed once and rendered
+    from the precomputed render tables of all requested languages.
+
+    :param input_strings: The input strings to hash
+    :param languages: The output languages
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: One mapping of languages to name triples per input string, in input
+             order
+    """
+    tables = _render_tables(_check_languages(languages), dataset)
+    list_sizes = list(tables[0].list_sizes)
+
+    results: list[dict[str, Name]] = []
+    for input_string in input_strings:
+        indices = generate_indices(input_string, list_sizes)
+        results.append({table.language: table.render(indices) for table in tables})
+    return results
+
+
+def _check_languages(languages: Iterable[str]) -> tuple[str, ...]:
+    languages = tuple(dict.fromkeys(languages))
+    if not languages:
+        raise ValueError("At least one language is required.")
+    for language in languages:
+        check_language(language)
+    return languages
+
+
+def hash_names(
+    input_strings: Iterable[str],
+    language: str = "en",
+    workers: int | None = None,
+    dataset: str | None = None,
+) -> list[Name]:
+    """
+    Generates names for many input strings at once. The result is identical to
+    calling ``hash_name`` for every input, but the language is validated only once
+    and words are read from the precomputed render table of the language.
+
+    :param input_strings: The input strings to hash
+    :param language: The output language
+    :param workers: Number of worker processes. None or 1 hashes in the calling
+                    process, 0 uses one process per CPU. Batches smaller than
+                    ``PARALLEL_THRESHOLD`` are always hashed serially.
+    :param dataset: The name of a data set registered with ``register_dataset``,
+                    whose words the names are made of. None uses the package
+                    data.
+    :return: A list with one (physical attribute, personality attribute, noun)
+             triple per input string, in input order
+    """
+    check_language(language)
+    workers = _resolve_workers(workers)
+
+    if workers > 1:
+        results: list[Name] = []
+        for chunk_results in hash_name_chunks(
+            chunked(input_strings, PARALLEL_CHUNK_SIZE), language, workers, dataset
+        ):
+            results.extend(chunk_results[1])
+        return results
+
+    return _hash_names_serial(input_strings, language, dataset)
+
+
+def hash_names_threaded(
+    input_strings: Iterable[str],
+    language: str = "en",
+    workers: int | None = None,
+    dataset: str | None = None,
+) -> list[Name]:
+    """
+    Like ``hash_names``, but hashes chunks of the inputs in a thread pool instead
+    of worker processes. Threads share the loaded render tables and exchange no
+    pickled data, but they only run in parallel where the GIL does not serialize
+    them: on free-threaded Python builds, and while hashlib hashes long inputs
+    (about 2 KiB and more), for which it releases the GIL. For short inputs on
+    other builds, worker processes are faster.
+
+    :param input_strings: The input strings to hash
+    :param language: The output language
+    :param workers: Number of threads. None uses the default of
+                    ``ThreadPoolExecutor``, 1 hashes in the calling thread.
+    :param dataset: The name of a registered data set, see ``hash_names``
+    :return: One name triple per input string, in input order
+    """
+    check_language(language)
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers must be positive, got {workers}.")
+    chunks = list(chunked(input_strings, THREAD_CHUNK_SIZE))
+    if workers == 1 or len(chunks) <= 1:
+        return _hash_names_serial(chain.from_iterable(chunks), language, dataset)
+
+    # Imported here like the process pool, see ``hash_name_chunks``.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ThreadPoolExecutor,
+    )
+
+    # All threads render from the same table, which is built before they start,
+    # so they do not queue up on the loader lock and a reload in the meantime does
+    # not mix old and new words.
+    table = _render_table(language, dataset)
+    results: list[Name] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(_render_names, chunks, repeat(table)):
+            results.extend(chunk_results)
+    return results
+
+
+def hash_name_chunks(
+    chunks: Iterable[list[str]],
+    language: str = "en",
+    workers: int | None = None,
+    dataset: str | None = None,
+) -> Iterator[tuple[list[str], list[Name]]]:
+    """
+    Hashes a stream of input chunks and yields each chunk together with its names,
+    in input order. With more than one worker, chunks are distributed over a
+    process pool with a bounded number of chunks in flight, so memory use does not
+    depend on the length of the stream. Streams that end before
+    ``PARALLEL_THRESHOLD`` inputs are hashed serially.
+
+    :param chunks: Lists of input strings
+    :param language: The output language
+    :param workers: Number of worker processes, see ``hash_names``
+    :param dataset: The name of a registered data set, see ``hash_names``
+    """
+    check_language(language)
+    workers = _resolve_workers(workers)
+    chunks = iter(chunks)
+
+    buffered: list[list[str]] = []
+    buffered_count = 0
+    if workers > 1:
+        while buffered_count < PARALLEL_THRESHOLD:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            buffered.append(chunk)
+            buffered_count += len(chunk)
+
+    if buffered_count < PARALLEL_THRESHOLD:
+        # The whole stream is rendered from one table, even if the data is
+        # reloaded while it is consumed.
+        table = _render_table(language, dataset)
+        for chunk in chain(buffered, chunks):
+            yield chunk, _render_names(chunk, table)
+        return
+
+    # Imported here because loading multiprocessing noticeably slows down the
+    # start of short-lived processes that never use it.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    # Load the tables before the pool starts, so forked workers inherit them.
+    _render_table(language, dataset)
+    # Spawned workers do not inherit the registered data sets.
+    dataset_path = None if dataset is None else DEFAULT_DATASETS.path(dataset)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(language, dataset, dataset_path),
+    ) as executor:
+        pending: deque[tuple[list[str], Future[list[Name]]]] = deque()
+        for chunk in chain(buffered, chunks):
+            pending.append(
+                (
+                    chunk,
+                    executor.submit(_hash_names_serial, chunk, language, dataset),
+                )
+            )
+            if len(pending) >= 2 * workers:
+                done_chunk, future = pending.popleft()
+                yield done_chunk, future.result()
+        while pending:
+            done_chunk, future = pending.popleft()
+            yield done_chunk, future.result()
+
+
+def _resolve_workers(workers: int | None) -> int:
+    if workers is None:
+        return 1
+    if workers < 0:
+        raise ValueError(f"Number of workers must not be negative, got {workers}.")
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _init_worker(
+    language: str, dataset: str | None = None, dataset_path: Path | None = None
+) -> None:
+    if dataset is not None and dataset_path is not None:
+        DEFAULT_DATASETS.register(dataset, dataset_path)
+    _render_table(language, dataset)
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Splits an iterable into lists of ``size`` items, the last one possibly
+    shorter, without materializing the iterable.
+
+    :param iterable: The items to split
+    :param size: The number of items per chunk
+    :return: An iterator over the chunks
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _hash_names_serial(
+    input_strings: Iterable[str], language: str, dataset: str | None = None
+) -> list[Name]:
+    return _render_names(input_strings, _render_table(language, dataset))
+
+
+def _render_names(input_strings: Iterable[str], table: RenderTable) -> list[Name]:
+    if instrumentation.enabled:
+        started = perf_counter_ns()
+        results = _render_names_uninstrumented(input_strings, table)
+        # Hashing and word resolution share one loop here, so the batch is
+        # recorded as a whole.
+        instrumentation.record("hash.batch", started, len(results))
+        return results
+    return _render_names_uninstrumented(input_strings, table)
+
+
+def _render_names_uninstrumented(
+    input_strings: Iterable[str], table: RenderTable
+) -> list[Name]:
+    sha256 = hashlib.sha256
+    read_name = name_reader(table, sha256().digest_size // len(table.list_sizes))
+    return [read_name(sha256(s.encode()).digest()) for s in input_strings]
@@ -0,0 +1,100 @@
+import logging
+import threading
+
+from . import instrumentation
+from .character_data_loader import CharacterDataLoader
+
+# Seconds between two checks of the word lists. A check of unchanged files costs
+# three ``stat`` calls.
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+
+class DataWatcher:
+    """
+    Background thread that checks the word lists of the shared
+    ``CharacterDataLoader`` at a fixed interval and reloads them when they change,
+    see ``CharacterDataLoader.reload``. Loading and building happen in the watcher
+    thread, so hashing threads never wait for a reload. Failed reloads, e.g. of
+    invalid word lists, are logged and counted as "loader.reload_errors", and the
+    previous data stays in use until the files are fixed.
+    """
+
+    def __init__(self, interval: float = DEFAULT_RELOAD_INTERVAL) -> None:
+        """
+        Constructor for the DataWatcher class.
+
+        :param interval: Seconds between two checks
+        :raises ValueError: If the interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError(f"Reload interval must be positive, got {interval}.")
+        self.interval = interval
+        self.reloads = 0
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "DataWatcher":
+        """
+        Starts the watcher thread. The thread does not keep the process alive.
+
+        :raises RuntimeError: If the watcher was already started
+        """
+        if self._thread is not None:
+            raise RuntimeError("The data watcher was already started.")
+        # Loaded here, so the first check has a baseline to compare with.
+        CharacterDataLoader()
+        self._thread = threading.Thread(
+            target=self._run, name="myth-hash-data-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the watcher thread and waits for a running reload to finish.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def check(self) -> bool:
+        """
+        Checks the word lists once and reloads them if they changed.
+
+        :return: True if the data was reloaded
+        """
+        try:
+            reloaded = CharacterDataLoader.reload()
+        except Exception as e:
+            # Any error is caught, so the watcher keeps checking until the word
+            # lists are fixed.
+            logging.warning(f"Character data not reloaded, keeping the old data: {e!r}")
+            if instrumentation.enabled:
+                instrumentation.increment("loader.reload_errors")
+            return False
+        if reloaded:
+            self.reloads += 1
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def __enter__(self) -> "DataWatcher":
+        # Watchers from ``watch_data`` are already running.
+        return self if self._thread is not None else self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def watch_data(interval: float = DEFAULT_RELOAD_INTERVAL) -> DataWatcher:
+    """
+    Starts reloading the word data of this process whenever the word lists
+    change. Meant for long-running processes like servers and workers.
+
+    :param interval: Seconds between two checks
+    :return: The started watcher; call ``stop`` to stop it
+    :raises ValueError: If the interval is not positive
+    """
+    return DataWatcher(interval).start()
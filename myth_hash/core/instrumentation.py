@@ -0,0 +1,186 @@
+import math
+import threading
+from collections.abc import Callable
+from time import perf_counter_ns
+from typing import Any
+
+# Durations are bucketed by powers of two of their nanoseconds, so histograms have
+# a fixed size and cover everything from 1 ns to centuries.
+HISTOGRAM_BUCKETS = 64
+
+# Called with the name of the operation, its duration in nanoseconds (None for
+# counters) and the number of processed items.
+Callback = Callable[[str, int | None, int], None]
+
+# Checked inline by every instrumented call site, so instrumentation that is off
+# costs a single attribute lookup.
+enabled = False
+
+_lock = threading.Lock()
+_timings: dict[str, "Timing"] = {}
+_counters: dict[str, int] = {}
+_callbacks: list[Callback] = []
+
+
+class Timing:
+    """
+    Histogram of the durations of one instrumented operation. Bucket ``i`` counts
+    the calls that took at least ``2**(i - 1)`` and less than ``2**i`` nanoseconds.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.items = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, elapsed_ns: int, items: int = 1) -> None:
+        self.calls += 1
+        self.items += items
+        self.total_ns += elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+        self.buckets[min(elapsed_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Returns an upper bound of the duration in nanoseconds that the given
+        fraction of the calls did not exceed. The bound is the upper edge of the
+        bucket of the nearest rank, at most the longest call.
+        """
+        rank = max(1, math.ceil(fraction * self.calls))
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.calls if self.calls else 0.0,
+            "p50_ns": self.percentile(0.5),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self.max_ns,
+            "buckets": self.buckets,
+        }
+
+
+def enable() -> None:
+    """
+    Starts recording timings and counters. Only the calling process is recorded,
+    names hashed in worker processes are not included.
+    """
+    global enabled  # pylint: disable=global-statement
+    enabled = True
+
+
+def disable() -> None:
+    """
+    Stops recording. Recorded timings and counters are kept until ``reset``.
+    """
+    global enabled  # pylint: disable=global-statement
+    enabled = False
+
+
+def reset() -> None:
+    """
+    Discards all recorded timings and counters.
+    """
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def record(name: str, started_ns: int, items: int = 1) -> None:
+    """
+    Records one call of an operation in its histogram. Call sites check
+    ``enabled`` before they take the start time.
+
+    :param name: The name of the operation, e.g. "hash.generate_indices"
+    :param started_ns: The start of the call from ``time.perf_counter_ns``
+    :param items: The number of items the call processed
+    """
+    elapsed_ns = perf_counter_ns() - started_ns
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = Timing(name)
+        timing.add(elapsed_ns, items)
+        callbacks = tuple(_callbacks)
+    for callback in callbacks:
+        callback(name, elapsed_ns, items)
+
+
+def increment(name: str, value: int = 1) -> None:
+    """
+    Adds to a counter.
+
+    :param name: The name of the counter, e.g. "file.bytes"
+    :param value: The amount to add
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        callbacks = tuple(_callbacks)
+    for callback in callbacks:
+        callback(name, None, value)
+
+
+def add_callback(callback: Callback) -> None:
+    """
+    Registers a callback that receives every recorded timing and counter update,
+    e.g. to export them to a metrics system. Callbacks run in the thread of the
+    instrumented call, so they should be fast.
+
+    :param callback: Called with the operation name, the duration in nanoseconds
+                     (None for counters) and the number of items
+    """
+    with _lock:
+        _callbacks.append(callback)
+
+
+def remove_callback(callback: Callback) -> None:
+    """
+    Unregisters a callback of ``add_callback``.
+
+    :raises ValueError: If the callback is not registered
+    """
+    with _lock:
+        _callbacks.remove(callback)
+
+
+def snapshot() -> dict[str, Any]:
+    """
+    Returns the recorded timings and counters as JSON serializable data.
+    """
+    with _lock:
+        return {
+            "timings": {name: timing.as_json() for name, timing in _timings.items()},
+            "counters": dict(_counters),
+        }
+
+
+def format_stats() -> str:
+    """
+    Formats the recorded timings and counters as a table. Percentiles are upper
+    bounds from the histograms.
+    """
+    stats = snapshot()
+    lines = [
+        f"{'operation':24} {'calls':>9} {'items':>10} {'total ms':>10} "
+        f"{'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'max µs':>9}"
+    ]
+    for name, timing in sorted(stats["timings"].items()):
+        lines.append(
+            f"{name:24} {timing['calls']:9d} {timing['items']:10d} "
+            f"{timing['total_ns'] / 1e6:10.2f} {timing['mean_ns'] / 1e3:9.2f} "
+            f"{timing['p50_ns'] / 1e3:9.2f} {timing['p99_ns'] / 1e3:9.2f} "
+            f"{timing['max_ns'] / 1e3:9.2f}"
+        )
+    for name, value in sorted(stats["counters"].items()):
+        lines.append(f"{name:24} {value:9d}")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+import threading
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+from .character_data_loader import CharacterDataLoader
+from .hash_util import Name, check_language, generate_indices
+
+
+class NameCache:
+    """
+    Bounded LRU cache around ``hash_name``, keyed by input string and language.
+    Useful when the same inputs are hashed over and over again. The cache is
+    thread-safe and evicts the least recently used names once it is full. It is
+    cleared when ``CharacterDataLoader.reload`` replaces the word data; its hit
+    and miss statistics are kept.
+    """
+
+    def __init__(self, maxsize: int | None = 4096) -> None:
+        """
+        Constructor for the NameCache class.
+
+        :param maxsize: Maximum number of cached names. None means unbounded.
+        :raises ValueError: If maxsize is negative
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Cache size must not be negative, got {maxsize}.")
+        self.maxsize = maxsize
+        # Always called with positional arguments, so equal calls share one entry.
+        # The loader is part of the key, so names cached while the data is
+        # reloaded are never returned for the new data.
+        self._hash_name = lru_cache(maxsize=maxsize)(_hash_name)
+        self._data_loader: CharacterDataLoader | None = None
+        self._lock = threading.Lock()
+        # Hits and misses of the entries dropped after a reload.
+        self._cleared_hits = 0
+        self._cleared_misses = 0
+
+    def hash_name(self, input_string: str, language: str = "en") -> Name:
+        """
+        Returns the cached name of the input string, generating it on a miss.
+
+        :param input_string: The input string to hash
+        :param language: The output language
+        :return: The physical attribute, personality attribute and character noun
+        """
+        return self._hash_name(input_string, language, self._current_loader())
+
+    def hash_names(
+        self, input_strings: Iterable[str], language: str = "en"
+    ) -> list[Name]:
+        """
+        Returns the cached names of many input strings, in input order.
+
+        :param input_strings: The input strings to hash
+        :param language: The output language
+        :return: One name triple per input string
+        """
+        check_language(language)
+        cached_hash_name = self._hash_name
+        data_loader = self._current_loader()
+        return [
+            cached_hash_name(input_string, language, data_loader)
+            for input_string in input_strings
+        ]
+
+    def _current_loader(self) -> CharacterDataLoader:
+        data_loader = CharacterDataLoader()
+        if data_loader is not self._data_loader:
+            with self._lock:
+                if data_loader is not self._data_loader:
+                    # Drops the names of the previous data, which can never be
+                    # hit again.
+                    info = self._hash_name.cache_info()
+                    self._cleared_hits += info.hits
+                    self._cleared_misses += info.misses
+                    self._hash_name.cache_clear()
+                    self._data_loader = data_loader
+        return data_loader
+
+    def cache_info(self) -> Any:
+        """
+        Returns the hits, misses, maximum size and current size of the cache, like
+        ``functools.lru_cache``. The statistics include the names dropped after a
+        reload.
+        """
+        with self._lock:
+            info = self._hash_name.cache_info()
+            return info._replace(
+                hits=info.hits + self._cleared_hits,
+                misses=info.misses + self._cleared_misses,
+            )
+
+    def cache_clear(self) -> None:
+        """
+        Removes all names and resets the statistics.
+        """
+        with self._lock:
+            self._hash_name.cache_clear()
+            self._cleared_hits = self._cleared_misses = 0
+
+
+def _hash_name(
+    input_string: str, language: str, data_loader: CharacterDataLoader
+) -> Name:
+    # The name is rendered from the loader it is cached under, even if the data
+    # is reloaded in the meantime.
+    check_language(language)
+    table = data_loader.render_table(language)
+    return table.render(generate_indices(input_string, list(table.list_sizes)))
@@ -0,0 +1,211 @@
+import hashlib
+from collections.abc import Iterable
+from functools import total_ordering
+
+from .character_data_loader import CharacterDataLoader
+from .hash_util import Indices, Name, check_language, generate_indices, index_reader
+
+
+def code_space() -> int:
+    """
+    Returns the number of distinct names, i.e. the exclusive upper bound of all
+    name codes.
+    """
+    physical_sizes, personality_sizes, nouns_size = CharacterDataLoader().list_sizes
+    return physical_sizes * personality_sizes * nouns_size
+
+
+def pack_indices(
+    indices: Indices, list_sizes: tuple[int, int, int] | None = None
+) -> int:
+    """
+    Packs an index triple into a single integer in ``range(code_space())``.
+
+    :param indices: The physical attribute, personality attribute and noun index
+    :param list_sizes: The word list sizes, e.g. of a render table the indices
+                       belong to. None uses the sizes of the loaded data.
+    :return: The name code
+    :raises ValueError: If an index is out of range
+    """
+    physical_sizes, personality_sizes, nouns_size = (
+        list_sizes or CharacterDataLoader().list_sizes
+    )
+    physical_attr_index, personality_attr_index, character_nouns_index = indices
+    if not (
+        0 <= physical_attr_index < physical_sizes
+        and 0 <= personality_attr_index < personality_sizes
+        and 0 <= character_nouns_index < nouns_size
+    ):
+        raise ValueError(f"Indices {indices} are out of range.")
+    return (
+        physical_attr_index * personality_sizes + personality_attr_index
+    ) * nouns_size + character_nouns_index
+
+
+def unpack_code(code: int, list_sizes: tuple[int, int, int] | None = None) -> Indices:
+    """
+    Unpacks a name code into its index triple.
+
+    :param code: The name code
+    :param list_sizes: The word list sizes, see ``pack_indices``
+    :return: The physical attribute, personality attribute and noun index
+    :raises ValueError: If the code is out of range
+    """
+    physical_sizes, personality_sizes, nouns_size = (
+        list_sizes or CharacterDataLoader().list_sizes
+    )
+    if not 0 <= code < physical_sizes * personality_sizes * nouns_size:
+        raise ValueError(f"Name code {code} is out of range.")
+    rest, character_nouns_index = divmod(code, nouns_size)
+    physical_attr_index, personality_attr_index = divmod(rest, personality_sizes)
+    return physical_attr_index, personality_attr_index, character_nouns_index
+
+
+def hash_code(input_string: str) -> int:
+    """
+    Returns the language independent name code of an input string.
+
+    :param input_string: The input string to hash
+    :return: The name code
+    """
+    list_sizes = CharacterDataLoader().list_sizes
+    physical_attr_index, personality_attr_index, character_nouns_index = (
+        generate_indices(input_string, list(list_sizes))
+    )
+    return pack_indices(
+        (physical_attr_index, personality_attr_index, character_nouns_index),
+        list_sizes,
+    )
+
+
+def hash_codes(input_strings: Iterable[str]) -> list[int]:
+    """
+    Batch variant of ``hash_code``.
+
+    :param input_strings: The input strings to hash
+    :return: One name code per input string, in input order
+    """
+    list_sizes = CharacterDataLoader().list_sizes
+    _, personality_sizes, nouns_size = list_sizes
+    sha256 = hashlib.sha256
+    read_indices = index_reader(list_sizes, sha256().digest_size // len(list_sizes))
+    codes: list[int] = []
+    append = codes.append
+
+    for input_string in input_strings:
+        physical_attr_index, personality_attr_index, character_nouns_index = (
+            read_indices(sha256(input_string.encode()).digest())
+        )
+        append(
+            (physical_attr_index * personality_sizes + personality_attr_index)
+            * nouns_size
+            + character_nouns_index
+        )
+
+    return codes
+
+
+def render_code(code: int, language: str = "en") -> Name:
+    """
+    Renders a name code in the given language.
+
+    :param code: The name code
+    :param language: The output language
+    :return: The physical attribute, personality attribute and character noun
+    """
+    check_language(language)
+    table = CharacterDataLoader().render_table(language)
+    return table.render(list(unpack_code(code, table.list_sizes)))
+
+
+def render_codes(codes: Iterable[int], language: str = "en") -> list[Name]:
+    """
+    Batch variant of ``render_code``.
+
+    :param codes: The name codes
+    :param language: The output language
+    :return: One name triple per code, in input order
+    :raises ValueError: If a code is out of range
+    """
+    check_language(language)
+    table = CharacterDataLoader().render_table(language)
+    physical_sizes, personality_sizes, nouns_size = table.list_sizes
+    space = physical_sizes * personality_sizes * nouns_size
+    physical_attributes = table.physical_attributes
+    personality_attributes = table.personality_attributes
+    character_nouns = table.character_nouns
+    character_genders = table.character_genders
+
+    names: list[Name] = []
+    for code in codes:
+        if not 0 <= code < space:
+            raise ValueError(f"Name code {code} is out of range.")
+        rest, noun = divmod(code, nouns_size)
+        physical, personality = divmod(rest, personality_sizes)
+        gender = character_genders[noun]
+        names.append(
+            (
+                physical_attributes[gender][physical],
+                personality_attributes[gender][personality],
+                character_nouns[noun],
+            )
+        )
+    return names
+
+
+@total_ordering
+class MythName:
+    """
+    A generated name stored as its packed name code. The words are only rendered
+    on demand, so instances are small and compare and hash like integers.
+    """
+
+    __slots__ = ("code",)
+
+    def __init__(self, code: int) -> None:
+        """
+        Constructor for the MythName class.
+
+        :param code: The name code
+        :raises ValueError: If the code is out of range
+        """
+        unpack_code(code)
+        self.code = code
+
+    @classmethod
+    def from_input(cls, input_string: str) -> "MythName":
+        return cls(hash_code(input_string))
+
+    @property
+    def indices(self) -> Indices:
+        return unpack_code(self.code)
+
+    def render(self, language: str = "en") -> Name:
+        """
+        Returns the physical attribute, personality attribute and character noun in
+        the given language.
+        """
+        return render_code(self.code, language)
+
+    def __int__(self) -> int:
+        return self.code
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MythName):
+            return self.code == other.code
+        return NotImplemented
+
+    def __lt__(self, other: object) -> bool:
+        if isinstance(other, MythName):
+            return self.code < other.code
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return f"MythName({self.code})"
+
+    def __str__(self) -> str:
+        physical_attr, personality_attr, character = self.render()
+        return f"{physical_attr}-{personality_attr}-{character.replace(' ', '')}"
@@ -0,0 +1,165 @@
+from collections.abc import Iterable, Iterator, Sequence
+
+from .character_data_loader import CharacterDataLoader
+from .hash_util import Indices, check_language
+from .name_code import code_space, pack_indices
+from .render_table import NameIndex, RenderTable
+
+# Canonical positions of the physical and personality attributes per noun index,
+# and of the nouns themselves.
+CanonicalTables = tuple[list[list[int]], list[list[int]], list[int]]
+
+
+def _candidates(text: str, index: NameIndex) -> Iterator[Indices]:
+    # Words may contain hyphens themselves, so try every pair of hyphens as the
+    # separators. Names contain only a few hyphens, so this stays linear in the
+    # length of the text.
+    hyphens = [position for position, char in enumerate(text) if char == "-"]
+    physical_attributes = index.physical_attributes
+    personality_attributes = index.personality_attributes
+    character_nouns = index.character_nouns
+
+    for i, first in enumerate(hyphens):
+        physical = physical_attributes.get(text[:first])
+        if physical is None:
+            continue
+        for second in hyphens[i + 1 :]:
+            personality = personality_attributes.get(text[first + 1 : second])
+            if personality is None:
+                continue
+            nouns = character_nouns.get(text[second + 1 :])
+            if nouns is None:
+                continue
+            for noun_index, gender in nouns:
+                for physical_index, physical_gender in physical:
+                    if physical_gender != gender:
+                        continue
+                    for personality_index, personality_gender in personality:
+                        if personality_gender == gender:
+                            yield physical_index, personality_index, noun_index
+
+
+def parse_name_candidates(text: str, language: str = "en") -> list[Indices]:
+    """
+    Returns every index triple that renders to the given name. A name has several
+    candidates when one of its words occurs at several positions of a word list.
+
+    :param text: A name in the text format, e.g. "exotic-thoughtful-Griffin"
+    :param language: The language of the name
+    :return: The sorted index triples, empty if the text is not a valid name
+    """
+    check_language(language)
+    return sorted(_candidates(text, CharacterDataLoader().name_index(language)))
+
+
+def parse_name(text: str, language: str = "en") -> Indices:
+    """
+    Parses a name in the text format back to its index triple. Names with several
+    candidates parse to the smallest one, so every distinct name has exactly one
+    canonical triple.
+
+    :param text: A name in the text format, e.g. "exotic-thoughtful-Griffin"
+    :param language: The language of the name
+    :return: The physical attribute, personality attribute and noun index
+    :raises ValueError: If the text is not a valid name of the language
+    """
+    check_language(language)
+    return _parse_name(text, language, CharacterDataLoader().name_index(language))
+
+
+def _parse_name(text: str, language: str, index: NameIndex) -> Indices:
+    indices = min(_candidates(text, index), default=None)
+    if indices is None:
+        raise ValueError(f"'{text}' is not a valid name for the language '{language}'.")
+    return indices
+
+
+def _canonical_positions(words: Sequence[str]) -> list[int]:
+    # Maps every position to the first position of the same word.
+    first: dict[str, int] = {}
+    return [first.setdefault(word, position) for position, word in enumerate(words)]
+
+
+def canonical_tables(table: RenderTable) -> CanonicalTables:
+    """
+    Builds the tables that map every index of a language to the first index that
+    renders to the same word. The adjective tables are resolved per noun index,
+    like in ``hash_names``, because the adjective forms depend on the gender of
+    the noun.
+
+    :param table: The render table of the language
+    :return: The physical attribute, personality attribute and noun tables
+    """
+    physical = [_canonical_positions(words) for words in table.physical_attributes]
+    personality = [
+        _canonical_positions(words) for words in table.personality_attributes
+    ]
+    return (
+        [physical[gender] for gender in table.character_genders],
+        [personality[gender] for gender in table.character_genders],
+        _canonical_positions(table.character_nouns),
+    )
+
+
+def canonical_codes(codes: Iterable[int], language: str = "en") -> list[int]:
+    """
+    Maps name codes to the canonical codes of their names, i.e. to the codes that
+    ``parse_code`` returns for the rendered names. Two codes render to the same
+    name exactly if their canonical codes are equal.
+
+    :param codes: The name codes
+    :param language: The language of the names
+    :return: One canonical code per name code, in input order
+    :raises ValueError: If a code is out of range
+    """
+    check_language(language)
+    table = CharacterDataLoader().render_table(language)
+    _, personality_sizes, nouns_size = table.list_sizes
+    canonical_physical, canonical_personality, canonical_nouns = canonical_tables(table)
+
+    space = code_space()
+    results: list[int] = []
+    for code in codes:
+        if not 0 <= code < space:
+            raise ValueError(f"Name code {code} is out of range.")
+        rest, noun = divmod(code, nouns_size)
+        physical, personality = divmod(rest, personality_sizes)
+        results.append(
+            (
+                canonical_physical[noun][physical] * personality_sizes
+                + canonical_personality[noun][personality]
+            )
+            * nouns_size
+            + canonical_nouns[noun]
+        )
+    return results
+
+
+def parse_code(text: str, language: str = "en") -> int:
+    """
+    Parses a name in the text format to its canonical name code.
+
+    :raises ValueError: If the text is not a valid name of the language
+    """
+    check_language(language)
+    # Parsed and packed with the data of one loader, even if it is reloaded.
+    data_loader = CharacterDataLoader()
+    return pack_indices(
+        _parse_name(text, language, data_loader.name_index(language)),
+        data_loader.list_sizes,
+    )
+
+
+def parse_names(texts: Iterable[str], language: str = "en") -> Iterator[Indices | None]:
+    """
+    Parses a stream of names, e.g. tokens from log files. Invalid names yield None
+    instead of raising, so the stream can be validated in one pass.
+
+    :param texts: Names in the text format
+    :param language: The language of the names
+    :return: The canonical index triple or None per name, in input order
+    """
+    check_language(language)
+    index = CharacterDataLoader().name_index(language)
+    for text in texts:
+        yield min(_candidates(text, index), default=None)
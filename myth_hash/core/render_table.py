@@ -0,0 +1,144 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from time import perf_counter_ns
+
+from . import instrumentation
+from .words import GENDERS, CharacterNoun, NominativAdjective
+
+
+@dataclass(frozen=True)
+class RenderTable:
+    """
+    Flat, gender-resolved word tables for a single language.
+
+    The adjective tables are indexed first by gender code (the position of the
+    gender in ``GENDERS``) and then by word index, so rendering a name is a
+    handful of tuple lookups instead of nested dictionary accesses. Any sequence
+    can back the tables, e.g. the memory-mapped string tables of a shared word
+    store.
+    """
+
+    language: str
+    physical_attributes: Sequence[Sequence[str]]
+    personality_attributes: Sequence[Sequence[str]]
+    character_nouns: Sequence[str]
+    character_genders: Sequence[int]
+    list_sizes: tuple[int, int, int]
+
+    def render(self, indices: list[int]) -> tuple[str, str, str]:
+        """
+        Renders an index triple as produced by ``generate_indices``.
+
+        :param indices: Physical attribute, personality attribute and noun index
+        :return: The physical attribute, personality attribute and character noun
+        """
+        if instrumentation.enabled:
+            return self._render_timed(indices)
+        physical_attr_index, personality_attr_index, character_nouns_index = indices
+        gender = self.character_genders[character_nouns_index]
+        return (
+            self.physical_attributes[gender][physical_attr_index],
+            self.personality_attributes[gender][personality_attr_index],
+            self.character_nouns[character_nouns_index],
+        )
+
+    def _render_timed(self, indices: list[int]) -> tuple[str, str, str]:
+        # A timed copy of ``render``, so rendering without instrumentation does
+        # not pay for an extra call.
+        started = perf_counter_ns()
+        physical_attr_index, personality_attr_index, character_nouns_index = indices
+        gender = self.character_genders[character_nouns_index]
+        name = (
+            self.physical_attributes[gender][physical_attr_index],
+            self.personality_attributes[gender][personality_attr_index],
+            self.character_nouns[character_nouns_index],
+        )
+        instrumentation.record("words.resolve", started)
+        return name
+
+
+def _resolve_adjectives(
+    adjectives: list[NominativAdjective], language: str, genders: set[int]
+) -> tuple[tuple[str, ...], ...]:
+    return tuple(
+        (
+            tuple(adjective.word(language, gender) for adjective in adjectives)
+            if code in genders
+            else ()
+        )
+        for code, gender in enumerate(GENDERS)
+    )
+
+
+def build_render_table(
+    character_nouns: list[CharacterNoun],
+    physical_attributes: list[NominativAdjective],
+    personality_attributes: list[NominativAdjective],
+    language: str,
+) -> RenderTable:
+    """
+    Builds the render table for one language. Adjective forms are only resolved
+    for genders that are actually used by a noun of that language.
+
+    :raises ValueError: If a noun or a required adjective form is missing
+    """
+    character_genders = tuple(noun.gender_code(language) for noun in character_nouns)
+    used_genders = set(character_genders)
+
+    return RenderTable(
+        language=language,
+        physical_attributes=_resolve_adjectives(
+            physical_attributes, language, used_genders
+        ),
+        personality_attributes=_resolve_adjectives(
+            personality_attributes, language, used_genders
+        ),
+        character_nouns=tuple(
+            noun.get_attribute(language, "word") for noun in character_nouns
+        ),
+        character_genders=character_genders,
+        list_sizes=(
+            len(physical_attributes),
+            len(personality_attributes),
+            len(character_nouns),
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class NameIndex:
+    """
+    Reverse lookup tables for a single language. Every rendered word, with spaces
+    removed as in the text format, maps to the positions and genders it is
+    rendered for. Words can occur at several positions of a list.
+    """
+
+    language: str
+    physical_attributes: dict[str, tuple[tuple[int, int], ...]]
+    personality_attributes: dict[str, tuple[tuple[int, int], ...]]
+    character_nouns: dict[str, tuple[tuple[int, int], ...]]
+
+
+def _index_words(
+    words_by_gender: Sequence[Sequence[str]],
+) -> dict[str, tuple[tuple[int, int], ...]]:
+    index: dict[str, list[tuple[int, int]]] = {}
+    for gender, words in enumerate(words_by_gender):
+        for position, word in enumerate(words):
+            index.setdefault(word.replace(" ", ""), []).append((position, gender))
+    return {word: tuple(sorted(entries)) for word, entries in index.items()}
+
+
+def build_name_index(table: RenderTable) -> NameIndex:
+    nouns: dict[str, list[tuple[int, int]]] = {}
+    for position, (noun, gender) in enumerate(
+        zip(table.character_nouns, table.character_genders)
+    ):
+        nouns.setdefault(noun.replace(" ", ""), []).append((position, gender))
+
+    return NameIndex(
+        language=table.language,
+        physical_attributes=_index_words(table.physical_attributes),
+        personality_attributes=_index_words(table.personality_attributes),
+        character_nouns={noun: tuple(entries) for noun, entries in nouns.items()},
+    )
@@ -0,0 +1,202 @@
+import hashlib
+import hmac
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .character_data_loader import CharacterDataLoader
+from .hash_util import (
+    Buffer,
+    Indices,
+    Name,
+    check_language,
+    indices_from_digest,
+    name_reader,
+)
+
+SCHEME_VERSION = 1
+# Segments shorter than this cannot address the larger word lists evenly.
+MIN_SEGMENT_SIZE = 4
+_BLAKE2 = {"blake2b": hashlib.blake2b, "blake2s": hashlib.blake2s}
+
+
+@dataclass(frozen=True)
+class HashScheme:
+    """
+    Selects how input strings are turned into indices: the digest algorithm, an
+    optional salt and key, and the segment layout of the digest. The default
+    scheme is SHA-256 without salt and key, split into three 10-byte segments,
+    which is exactly ``hash_name``.
+
+    The salted and keyed hasher state is built once and copied for every input,
+    so the salt and key are not hashed again per input. Salts give every tenant
+    its own names for the same inputs. Keys additionally keep the names
+    unpredictable for anyone who does not know the key. BLAKE2 uses its native
+    keyed mode, other algorithms use HMAC. The salt is prefixed with its length,
+    so no pair of salt and input shares its hashed bytes with another pair.
+    """
+
+    algorithm: str = "sha256"
+    salt: bytes = b""
+    key: bytes = field(default=b"", repr=False)
+    digest_size: int | None = None
+    segment_size: int | None = None
+    version: int = SCHEME_VERSION
+    _prototype: Any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.version != SCHEME_VERSION:
+            raise ValueError(f"Unsupported scheme version {self.version}.")
+
+        if self.algorithm in _BLAKE2:
+            options: dict[str, Any] = {"key": self.key}
+            if self.digest_size is not None:
+                options["digest_size"] = self.digest_size
+            prototype: Any = _BLAKE2[self.algorithm](**options)
+        else:
+            if self.digest_size is not None:
+                raise ValueError("A digest size can only be chosen for BLAKE2.")
+            try:
+                prototype = (
+                    hmac.new(self.key, digestmod=self.algorithm)
+                    if self.key
+                    else hashlib.new(self.algorithm)
+                )
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f"Unsupported digest algorithm '{self.algorithm}'."
+                ) from e
+        if not prototype.digest_size:
+            raise ValueError(f"'{self.algorithm}' has no fixed digest size.")
+        prototype.update(self._salt_prefix())
+        object.__setattr__(self, "_prototype", prototype)
+
+        segment_size = self.segment_length(3)
+        if segment_size < MIN_SEGMENT_SIZE or 3 * segment_size > prototype.digest_size:
+            raise ValueError(
+                f"Segments of {segment_size} bytes do not fit the word lists into a "
+                f"{prototype.digest_size} byte digest."
+            )
+
+    def _salt_prefix(self) -> bytes:
+        # Without the length, the salt b"ab" with the input "c" would hash the
+        # same bytes as the salt b"a" with the input "bc". Unsalted schemes hash
+        # nothing up front, so the default scheme stays ``hash_name``.
+        if not self.salt:
+            return b""
+        return len(self.salt).to_bytes(8, "big") + self.salt
+
+    def segment_length(self, segments: int) -> int:
+        """
+        Returns the number of digest bytes per segment.
+        """
+        if self.segment_size is not None:
+            return self.segment_size
+        return int(self._prototype.digest_size) // segments
+
+    def digest(self, data: Buffer) -> bytes:
+        """
+        Returns the digest of binary data under this scheme.
+        """
+        hasher = self._prototype.copy()
+        hasher.update(data)
+        return bytes(hasher.digest())
+
+    def generate_indices(self, data: Buffer, list_sizes: list[int]) -> list[int]:
+        """
+        Like ``generate_indices``, but with the digest of this scheme.
+        """
+        d = self.digest(data)
+        if self.segment_size is not None:
+            d = d[: self.segment_size * len(list_sizes)]
+        return indices_from_digest(d, list_sizes)
+
+    def hash_indices(self, input_string: str) -> Indices:
+        """
+        Like ``hash_indices``, but with the digest of this scheme.
+        """
+        physical_attr_index, personality_attr_index, character_nouns_index = (
+            self.generate_indices(
+                input_string.encode(), list(CharacterDataLoader().list_sizes)
+            )
+        )
+        return physical_attr_index, personality_attr_index, character_nouns_index
+
+    def hash_name(self, input_string: str, language: str = "en") -> Name:
+        """
+        Generates the name of an input string under this scheme.
+
+        :param input_string: The input string to hash
+        :param language: The output language
+        :return: The physical attribute, personality attribute and character noun
+        """
+        return self.hash_bytes(input_string.encode(), language)
+
+    def hash_bytes(self, buffer: Buffer, language: str = "en") -> Name:
+        """
+        Like ``hash_bytes``, but with the digest of this scheme.
+        """
+        check_language(language)
+        table = CharacterDataLoader().render_table(language)
+        return table.render(self.generate_indices(buffer, list(table.list_sizes)))
+
+    def hash_names(
+        self, input_strings: Iterable[str], language: str = "en"
+    ) -> list[Name]:
+        """
+        Batch variant of ``hash_name``.
+
+        :param input_strings: The input strings to hash
+        :param language: The output language
+        :return: One name triple per input string, in input order
+        """
+        check_language(language)
+        table = CharacterDataLoader().render_table(language)
+        read_name = name_reader(table, self.segment_length(len(table.list_sizes)))
+        new_hasher = self._prototype.copy
+        results: list[Name] = []
+        append = results.append
+
+        for input_string in input_strings:
+            hasher = new_hasher()
+            hasher.update(input_string.encode())
+            append(read_name(hasher.digest()))
+
+        return results
+
+    def as_json(self) -> dict[str, Any]:
+        """
+        Returns the settings of the scheme without the key, e.g. to store them next
+        to generated names. The key has to be kept separately.
+        """
+        return {
+            "version": self.version,
+            "algorithm": self.algorithm,
+            "salt": self.salt.hex(),
+            "keyed": bool(self.key),
+            "digest_size": self.digest_size,
+            "segment_size": self.segment_size,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], key: bytes = b"") -> "HashScheme":
+        """
+        Restores a scheme from ``as_json``.
+
+        :param data: The stored settings
+        :param key: The key, required if the scheme was keyed
+        :raises ValueError: If the settings are invalid or the key is missing
+        """
+        if data.get("keyed") and not key:
+            raise ValueError("The scheme is keyed, but no key was given.")
+        return cls(
+            algorithm=data["algorithm"],
+            salt=bytes.fromhex(data["salt"]),
+            key=key,
+            digest_size=data.get("digest_size"),
+            segment_size=data.get("segment_size"),
+            version=data.get("version", SCHEME_VERSION),
+        )
+
+
+DEFAULT_SCHEME = HashScheme()
@@ -0,0 +1,261 @@
+import logging
+import marshal
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, overload
+
+from .character_data_loader import CharacterDataLoader
+from .render_table import RenderTable
+
+MAGIC = b"MYTHSTR1"
+# Bump whenever the layout of the store changes.
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sI")
+
+
+class StringTable(Sequence[str]):
+    """
+    A read-only sequence of strings stored in a buffer as a count, ``count + 1``
+    native ``uint32`` offsets and the concatenated UTF-8 data. Strings are only
+    decoded when they are looked up, so the buffer pages are never written to and
+    stay shared between processes that map the same file.
+    """
+
+    __slots__ = ("_offsets", "_data")
+
+    def __init__(self, buffer: memoryview, offset: int) -> None:
+        (count,) = struct.unpack_from("=I", buffer, offset)
+        offsets_start = offset + 4
+        data_start = offsets_start + 4 * (count + 1)
+        self._offsets = buffer[offsets_start:data_start].cast("I")
+        self._data = buffer[data_start : data_start + self._offsets[count]]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        return str(self._data[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    @staticmethod
+    def encode(strings: Sequence[str]) -> bytes:
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = array("I", [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        return (
+            array("I", [len(encoded)]).tobytes() + offsets.tobytes() + b"".join(encoded)
+        )
+
+
+class _StoreWriter:
+    def __init__(self) -> None:
+        self.sections: list[bytes] = []
+        self.size = 0
+
+    def add(self, section: bytes) -> int:
+        # Offsets are relative to the start of the sections and 4-byte aligned, so
+        # the uint32 offset arrays can be cast in place.
+        offset = self.size
+        padding = -len(section) % 4
+        self.sections.append(section + b"\0" * padding)
+        self.size += len(section) + padding
+        return offset
+
+
+def export_shared_store(
+    path: str | Path, data_loader: CharacterDataLoader | None = None
+) -> None:
+    """
+    Writes the render tables of all languages to a store file that can be mapped
+    by ``SharedWordStore``. The tables are built from the words of the loader,
+    not from a store attached to it, and the store records the digests of the
+    word lists. The file is replaced atomically.
+
+    :param path: Path of the store file
+    :param data_loader: The loader to export, defaults to the shared loader
+    """
+    data_loader = data_loader or CharacterDataLoader()
+    writer = _StoreWriter()
+    languages: dict[str, dict[str, Any]] = {}
+
+    for language in data_loader.languages:
+        table = data_loader.build_render_table(language)
+        languages[language] = {
+            "list_sizes": table.list_sizes,
+            "character_nouns": writer.add(StringTable.encode(table.character_nouns)),
+            "character_genders": (
+                writer.add(bytes(table.character_genders)),
+                len(table.character_genders),
+            ),
+            "physical_attributes": [
+                writer.add(StringTable.encode(words))
+                for words in table.physical_attributes
+            ],
+            "personality_attributes": [
+                writer.add(StringTable.encode(words))
+                for words in table.personality_attributes
+            ],
+        }
+
+    directory = marshal.dumps(
+        {
+            "format_version": FORMAT_VERSION,
+            "sources": data_loader.source_digests,
+            "size": writer.size,
+            "languages": languages,
+        }
+    )
+    header = _HEADER.pack(MAGIC, len(directory)) + directory
+    header += b"\0" * (-len(header) % 4)
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.writelines(writer.sections)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class SharedWordStore:
+    """
+    Read-only, memory-mapped word store. Every process that opens the same store
+    file shares one physical copy of the words through the page cache, and forked
+    processes inherit the mapping. Render tables built from the store look up
+    strings lazily and produce the same names as the in-memory tables.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Constructor for the SharedWordStore class.
+
+        :param path: Path of a store file written by ``export_shared_store``
+        :raises ValueError: If the file is not a complete store of the current
+                            format
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        try:
+            magic, directory_length = _HEADER.unpack_from(buffer)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a word store.")
+            # Store files are exported by the deployment itself, like the word
+            # lists; marshal only builds plain data and cannot execute code.
+            directory = marshal.loads(  # nosec B302
+                buffer[_HEADER.size : _HEADER.size + directory_length]
+            )
+        except (struct.error, EOFError, TypeError) as e:
+            raise ValueError(f"{self.path} is truncated.") from e
+        if (
+            not isinstance(directory, dict)
+            or directory.get("format_version") != FORMAT_VERSION
+        ):
+            raise ValueError(f"{self.path} has an unsupported format.")
+
+        sections_start = _HEADER.size + directory_length
+        sections_start += -sections_start % 4
+        self._sections = buffer[sections_start:]
+        if len(self._sections) < directory["size"]:
+            raise ValueError(f"{self.path} is truncated.")
+        self._languages: dict[str, dict[str, Any]] = directory["languages"]
+        # The digests of the word lists the store was exported from.
+        self.source_digests: dict[str, str] = directory["sources"]
+
+    def close(self) -> None:
+        """
+        Unmaps the store file. Render tables of the store cannot be used anymore.
+
+        :raises BufferError: If render tables of the store are still referenced
+        """
+        self._sections.release()
+        self._mmap.close()
+
+    @property
+    def languages(self) -> list[str]:
+        return sorted(self._languages)
+
+    def render_table(self, language: str) -> RenderTable:
+        """
+        Returns a render table whose words are read from the mapped store.
+
+        :param language: The language of the table
+        :raises ValueError: If the store has no data for the language
+        """
+        try:
+            entry = self._languages[language]
+        except KeyError as exc:
+            raise ValueError(
+                f"No character data available for language '{language}'."
+            ) from exc
+
+        genders_offset, genders_count = entry["character_genders"]
+        return RenderTable(
+            language=language,
+            physical_attributes=tuple(
+                StringTable(self._sections, offset)
+                for offset in entry["physical_attributes"]
+            ),
+            personality_attributes=tuple(
+                StringTable(self._sections, offset)
+                for offset in entry["personality_attributes"]
+            ),
+            character_nouns=StringTable(self._sections, entry["character_nouns"]),
+            character_genders=self._sections[
+                genders_offset : genders_offset + genders_count
+            ],
+            list_sizes=tuple(entry["list_sizes"]),
+        )
+
+
+def attach_shared_store(path: str | Path) -> SharedWordStore:
+    """
+    Makes the shared loader serve all render tables from the store file at
+    ``path``. The store is exported first if it does not exist yet, and exported
+    again if it is invalid or was exported from other word lists, so the names
+    stay identical to those of the loaded word lists. Call this in the parent
+    process before forking workers, so all of them share the mapping.
+
+    :param path: Path of the store file
+    :return: The attached store
+    """
+    data_loader = CharacterDataLoader()
+    path = Path(path)
+    store = None
+    if path.exists():
+        try:
+            store = SharedWordStore(path)
+        except ValueError as e:
+            logging.info(f"Exporting the word store again: {e}")
+        else:
+            if store.source_digests != data_loader.source_digests:
+                logging.info(
+                    f"Exporting the word store again: {path} has other word lists."
+                )
+                store.close()
+                store = None
+    if store is None:
+        export_shared_store(path, data_loader)
+        store = SharedWordStore(path)
+    data_loader.attach_shared_store(store)
+    return store
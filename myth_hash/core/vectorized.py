@@ -0,0 +1,93 @@
+import hashlib
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .character_data_loader import CharacterDataLoader
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installed extras
+    np = None  # type: ignore[assignment]
+
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def _require_numpy() -> Any:
+    if np is None:
+        raise ImportError(
+            "The vectorized backend requires NumPy. Install it with 'pip install myth-hash[numpy]'."
+        )
+    return np
+
+
+def digest_array(input_strings: Iterable[str]) -> Any:
+    """
+    Hashes a batch of input strings into one contiguous ``uint8`` array with one
+    SHA-256 digest per row.
+
+    :param input_strings: The input strings to hash
+    :return: An array of shape (N, 32)
+    """
+    numpy = _require_numpy()
+    sha256 = hashlib.sha256
+    buffer = b"".join(
+        sha256(input_string.encode()).digest() for input_string in input_strings
+    )
+    return numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(-1, DIGEST_SIZE)
+
+
+def generate_indices_array(digests: Any, list_sizes: Sequence[int]) -> Any:
+    """
+    Vectorized ``generate_indices`` over precomputed digests. Each digest is split
+    into ``len(list_sizes)`` big-endian segments that are reduced modulo their list
+    size. Segments are wider than 64 bits, so the reduction runs in blocks of bytes
+    (Horner's method), which keeps every intermediate value below ``2**63`` and the
+    result bit-exact with the scalar path.
+
+    :param digests: A ``uint8`` array of shape (N, 32)
+    :param list_sizes: The sizes of the lists to index into
+    :return: An ``int64`` array of shape (N, len(list_sizes))
+    :raises ValueError: If the digests have the wrong shape or a size is too large
+    """
+    numpy = _require_numpy()
+    digests = numpy.asarray(digests, dtype=numpy.uint8)
+    if digests.ndim != 2 or digests.shape[1] != DIGEST_SIZE:
+        raise ValueError(
+            f"Expected digests of shape (N, {DIGEST_SIZE}), got {digests.shape}."
+        )
+    if not list_sizes or any(not 0 < size < 2**55 for size in list_sizes):
+        raise ValueError(f"List sizes must be between 1 and 2**55, got {list_sizes}.")
+
+    segment_length = DIGEST_SIZE // len(list_sizes)
+    indices = numpy.empty((digests.shape[0], len(list_sizes)), dtype=numpy.int64)
+    # One contiguous row per byte position, so the column reads below are cheap.
+    wide_digests = numpy.ascontiguousarray(digests.T, dtype=numpy.int64)
+
+    for column, size in enumerate(list_sizes):
+        start = column * segment_length
+        end = start + segment_length
+        # Consume as many bytes per step as fit next to the remainder in 63 bits,
+        # because the modulo is by far the most expensive operation.
+        step = max(1, (63 - size.bit_length()) // 8)
+        remainder = numpy.zeros(digests.shape[0], dtype=numpy.int64)
+        for block in range(start, end, step):
+            width = min(step, end - block)
+            value = wide_digests[block]
+            for byte in range(block + 1, block + width):
+                value = (value << 8) | wide_digests[byte]
+            remainder = ((remainder << (8 * width)) | value) % size
+        indices[:, column] = remainder
+
+    return indices
+
+
+def hash_indices_array(input_strings: Iterable[str]) -> Any:
+    """
+    Returns the index triples of a batch of input strings, like ``hash_indices``.
+
+    :param input_strings: The input strings to hash
+    :return: An ``int64`` array of shape (N, 3)
+    """
+    return generate_indices_array(
+        digest_array(input_strings), CharacterDataLoader().list_sizes
+    )
@@ -1,23 +1,84 @@
+import sys
+import threading
+
+GENDERS = ("masculine", "feminine", "neutral")
+GENDER_CODES = {gender: code for code, gender in enumerate(GENDERS)}
+_GENDER_COUNT = len(GENDERS)
+
+# Integer codes of all languages seen so far. Words store their forms in flat
+# tuples indexed by these codes instead of in per-language dictionaries.
+_LANGUAGE_CODES: dict[str, int] = {}
+_LANGUAGES: list[str] = []
+_LANGUAGE_LOCK = threading.Lock()
+
+
+def _language_code(language: str) -> int:
+    code = _LANGUAGE_CODES.get(language)
+    if code is None:
+        with _LANGUAGE_LOCK:
+            code = _LANGUAGE_CODES.get(language)
+            if code is None:
+                code = len(_LANGUAGES)
+                _LANGUAGES.append(sys.intern(language))
+                _LANGUAGE_CODES[language] = code
+    return code
+
+
+def _intern(word: str | None) -> str | None:
+    return None if word is None else sys.intern(str(word))
+
+
 class NominativAdjective:
-    def __init__(self, word_id: int, words: dict) -> None:
+    __slots__ = ("word_id", "_forms")
+
+    def __init__(self, word_id: int, words: dict, validate: bool = True) -> None:
         """
         Constructor for the NominativAdjective class.
 
         :param word_id: ID of the adjective
         :param words: A dictionary that contains the words in different languages and genders
+        :param validate: Whether to validate the structure of the words dictionary
         """
         self.word_id = word_id
-        self.validate_words(words)
-        self.words = words
+        if validate:
+            self.validate_words(words)
+        self._forms = self._pack_forms(words)
 
     def __str__(self) -> str:
-        return str(
-            self.words.get("en", {}).get("neutral", "No neutral English word available")
-        )
+        try:
+            return self.word("en", "neutral")
+        except ValueError:
+            return "No neutral English word available"
 
     def __repr__(self) -> str:
         return f"Adjective: {self.word_id} - {self.words}"
 
+    @property
+    def words(self) -> dict:
+        """
+        A dictionary with the words in different languages and genders, in the
+        structure accepted by the constructor. The dictionary is a copy; changing
+        it does not change the adjective, use ``set_word`` to change a word.
+        """
+        words: dict[str, dict[str, str]] = {}
+        for index, word in enumerate(self._forms):
+            if word is not None:
+                language, gender_code = divmod(index, _GENDER_COUNT)
+                words.setdefault(_LANGUAGES[language], {})[GENDERS[gender_code]] = word
+        return words
+
+    @staticmethod
+    def _pack_forms(words: dict) -> tuple[str | None, ...]:
+        # One slot per language code and gender code, None for missing forms.
+        forms: list[str | None] = []
+        for language, genders in words.items():
+            start = _language_code(language) * _GENDER_COUNT
+            if len(forms) < start + _GENDER_COUNT:
+                forms.extend([None] * (start + _GENDER_COUNT - len(forms)))
+            for gender, word in genders.items():
+                forms[start + GENDER_CODES[gender]] = _intern(word)
+        return tuple(forms)
+
     @staticmethod
     def validate_words(words: dict):
         """
@@ -33,7 +94,7 @@ class NominativAdjective:
                     f"The value for language '{language}' must be a dictionary."
                 )
             for gender in genders:
-                if gender not in ["masculine", "feminine", "neutral"]:
+                if gender not in GENDERS:
                     raise ValueError(
                         f"Invalid gender '{gender}' for language '{language}'."
                     )
@@ -48,14 +109,22 @@ class NominativAdjective:
         :return: The word in the specified language and gender
         """
         try:
-            return str(self.words[language][gender])
-        except KeyError as exc:
+            word = self._forms[
+                _LANGUAGE_CODES[language] * _GENDER_COUNT + GENDER_CODES[gender]
+            ]
+        except (KeyError, IndexError):
+            word = None
+        if word is None:
             raise ValueError(
                 f"No word found for the language '{language}' and gender '{gender}'."
-            ) from exc
+            )
+        return word
 
     def set_word(self, language: str, gender: str, word: str) -> None:
-        self.words[language][gender] = word
+        words = self.words
+        words.setdefault(language, {})[gender] = word
+        self.validate_words(words)
+        self._forms = self._pack_forms(words)
 
     def as_json(self) -> dict:
         """
@@ -67,15 +136,35 @@ class NominativAdjective:
 
 
 class CharacterNoun:
+    __slots__ = ("character_id", "_words", "_genders")
+
     def __init__(self, character_id: int, data: dict) -> None:
         """
         Constructor for the CharacterNoun class.
 
         :param character_id: ID of the noun
         :param data: A dictionary containing the word and gender information in different languages
+        :raises ValueError: If a gender is not one of ``GENDERS``
         """
         self.character_id = character_id
-        self.data = data
+
+        # Words and gender codes per language code, None for missing languages.
+        words: list[str | None] = []
+        genders: list[int | None] = []
+        for language, attributes in data.items():
+            code = _language_code(language)
+            if len(words) <= code:
+                words.extend([None] * (code + 1 - len(words)))
+                genders.extend([None] * (code + 1 - len(genders)))
+            words[code] = _intern(attributes.get("word"))
+            gender = attributes.get("gender")
+            if gender is not None and gender not in GENDER_CODES:
+                raise ValueError(
+                    f"Invalid gender '{gender}' for language '{language}'."
+                )
+            genders[code] = None if gender is None else GENDER_CODES[gender]
+        self._words: tuple[str | None, ...] = tuple(words)
+        self._genders: tuple[int | None, ...] = tuple(genders)
 
     def __str__(self) -> str:
         return self.get_attribute("en", "word")
@@ -83,6 +172,24 @@ class CharacterNoun:
     def __repr__(self) -> str:
         return f"CharacterNoun: {self.character_id} - {self.data}"
 
+    @property
+    def data(self) -> dict:
+        """
+        A dictionary with the word and gender information in different languages,
+        in the structure accepted by the constructor. The dictionary is a copy;
+        changing it does not change the noun.
+        """
+        data: dict[str, dict[str, str]] = {}
+        for code, (word, gender) in enumerate(zip(self._words, self._genders)):
+            attributes = {}
+            if word is not None:
+                attributes["word"] = word
+            if gender is not None:
+                attributes["gender"] = GENDERS[gender]
+            if attributes:
+                data[_LANGUAGES[code]] = attributes
+        return data
+
     def get_attribute(self, language: str, attribute: str) -> str:
         """
         Returns the specified attribute in the specified language.
@@ -91,12 +198,36 @@ class CharacterNoun:
         :param attribute: The attribute to get. Options are 'word' and 'gender'.
         :return: The attribute in the specified language
         """
+        value: str | None = None
         try:
-            return str(self.data[language][attribute])
-        except KeyError as exc:
-            raise ValueError(
-                f"No {attribute} found for the language '{language}'."
-            ) from exc
+            code = _LANGUAGE_CODES[language]
+            if attribute == "word":
+                value = self._words[code]
+            elif attribute == "gender":
+                gender = self._genders[code]
+                if gender is not None:
+                    value = GENDERS[gender]
+        except (KeyError, IndexError):
+            pass
+        if value is None:
+            raise ValueError(f"No {attribute} found for the language '{language}'.")
+        return value
+
+    def gender_code(self, language: str) -> int:
+        """
+        Returns the gender of the noun in the specified language as the index of the
+        gender in ``GENDERS``.
+
+        :param language: The language of the gender
+        :return: The gender code
+        """
+        try:
+            gender = self._genders[_LANGUAGE_CODES[language]]
+        except (KeyError, IndexError):
+            gender = None
+        if gender is None:
+            raise ValueError(f"No gender found for the language '{language}'.")
+        return gender
 
     def as_json(self) -> dict:
         """
@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+from typing import Any
+
+from myth_hash.bulk import format_output
+from myth_hash.core import CharacterDataLoader
+from myth_hash.options import OUTPUT_FORMATS, SUPPORTED_LANGUAGES
+
+
+def handle_request(line: bytes) -> dict[str, Any]:
+    """
+    Answers one request of the daemon protocol. Requests and responses are JSON
+    objects on a single line. A request has the keys "input", "languages" and
+    "format", a response either the formatted "output" or an "error" message.
+
+    :param line: The encoded request
+    :return: The response
+    """
+    try:
+        request = json.loads(line)
+        input_string = request["input"]
+        languages = tuple(request.get("languages", ("en",)))
+        output_format = request.get("format", "text")
+        if not isinstance(input_string, str) or not input_string.strip():
+            raise ValueError("Input string cannot be empty.")
+        if not languages:
+            raise ValueError("At least one language is required.")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{output_format}'.")
+        return {"output": format_output(input_string, languages, output_format)}
+    except (ValueError, KeyError, TypeError) as e:
+        return {"error": str(e)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        # A connection may carry any number of requests, one per line.
+        for line in self.rfile:
+            response = handle_request(line)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+
+
+class NameServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Unix domain socket server that answers name requests from warm render tables.
+    """
+
+    daemon_threads = True
+
+
+def serve(socket_path: str) -> None:
+    """
+    Runs the daemon until it receives SIGINT or SIGTERM. All languages are loaded
+    before the socket is opened, so no request pays for loading data.
+
+    :param socket_path: The path of the Unix domain socket
+    :raises OSError: If another daemon is already listening on the socket
+    """
+    data_loader = CharacterDataLoader()
+    for language in SUPPORTED_LANGUAGES:
+        data_loader.render_table(language)
+
+    _remove_stale_socket(socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with NameServer(socket_path, _RequestHandler) as server:
+        logging.info(f"Serving fantasy names on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            # Left behind by a daemon that did not shut down cleanly.
+            os.unlink(socket_path)
+            return
+    raise OSError(f"A daemon is already listening on {socket_path}.")
@@ -0,0 +1,6 @@
+# The choices of the command line and the daemon protocol. They are kept apart from
+# the hashing modules, so that 'myth-hash --socket PATH' can parse its arguments
+# without loading them.
+SUPPORTED_LANGUAGES = {"en", "de"}
+INPUT_FORMATS = ("lines", "csv", "tsv")
+OUTPUT_FORMATS = ("text", "json", "csv", "tsv")
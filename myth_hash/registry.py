@@ -0,0 +1,290 @@
+import json
+import sqlite3
+from collections.abc import Iterable
+from types import TracebackType
+
+from myth_hash.core import (
+    CharacterDataLoader,
+    canonical_codes,
+    check_language,
+    chunked,
+    hash_codes,
+    parse_code,
+    render_code,
+    render_codes,
+)
+
+Name = tuple[str, str, str]
+
+# SQLite limits the number of parameters per statement, so IN queries are split.
+QUERY_CHUNK_SIZE = 900
+# Rounds of probing before a key is given up, far more than a registry that is not
+# nearly full ever needs.
+MAX_PROBES = 1000
+
+
+def probe_key(key: str, probe: int) -> str:
+    """
+    Returns the input string that is hashed in the given round of the probe
+    sequence of a key. Round 0 is the key itself, so keys whose name is still
+    free get exactly their ``hash_name`` result.
+
+    :param key: The registered key
+    :param probe: The round of the probe sequence
+    """
+    return key if probe == 0 else f"{key}\x00{probe}"
+
+
+class RegistryFullError(RuntimeError):
+    """
+    Raised if no free name was found within ``MAX_PROBES`` rounds of probing.
+    """
+
+
+class NameRegistry:
+    """
+    Persistent registry that assigns every key a name that no other key has. A key
+    gets its ``hash_name`` result if that name is free, otherwise the first free
+    name of a deterministic probe sequence (see ``probe_key``). The registry is a
+    single SQLite file with indexes on keys and names, so both directions are
+    single index lookups.
+
+    Several processes can use the same file. Assignments run in ``BEGIN
+    IMMEDIATE`` transactions, so two processes never hand out the same name. A
+    registry instance must only be used by the thread that created it.
+
+    The stored names index the word lists, so a registry is bound to the word
+    lists it was created with, identified by their digests. It cannot be used
+    with other word lists, e.g. after the word lists were edited or reloaded.
+    """
+
+    def __init__(self, path: str, language: str = "en", timeout: float = 30.0) -> None:
+        """
+        Constructor for the NameRegistry class. Creates the registry file if it does
+        not exist yet.
+
+        :param path: The path of the SQLite file, or ":memory:"
+        :param language: The language of the names. Names are only unique within
+                         one language, so a file is bound to the language it was
+                         created with.
+        :param timeout: Seconds to wait for a lock held by another process
+        :raises ValueError: If the language is not supported or differs from the
+                            language of an existing registry, or if the registry
+                            was created with other word lists
+        """
+        check_language(language)
+        self.path = path
+        self.language = language
+        self.source_digests = CharacterDataLoader().source_digests
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # Bulk assignments update two random access indexes, which thrash the
+        # default page cache of 2 MB.
+        self._connection.execute("PRAGMA cache_size=-65536")
+
+        with self._transaction():
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            # The names are stored as canonical name codes, so names that render
+            # to the same string share one code and the unique index on the code
+            # is a unique index on the names.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS names ("
+                "key TEXT PRIMARY KEY, code INTEGER NOT NULL UNIQUE, probe INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('language', ?)", (language,)
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('sources', ?)",
+                (json.dumps(self.source_digests, sort_keys=True),),
+            )
+            stored = dict(self._connection.execute("SELECT key, value FROM meta"))
+
+        if stored["language"] != language:
+            self.close()
+            raise ValueError(
+                f"The registry '{path}' holds names for the language '{stored['language']}', not '{language}'."
+            )
+        if json.loads(stored["sources"]) != self.source_digests:
+            self.close()
+            raise ValueError(
+                f"The registry '{path}' was created with other word lists, so its "
+                "names cannot be rendered with the loaded ones."
+            )
+
+    def register(self, key: str) -> Name:
+        """
+        Returns the name of a key, assigning a free one if the key is new.
+
+        :param key: The key to register
+        :return: The physical attribute, personality attribute and character noun
+        :raises RegistryFullError: If no free name was found
+        """
+        return self.register_many([key])[0]
+
+    def register_many(self, keys: Iterable[str]) -> list[Name]:
+        """
+        Registers many keys in a single transaction. Keys that are already
+        registered keep their names.
+
+        :param keys: The keys to register
+        :return: One name per key, in input order
+        :raises RegistryFullError: If no free name was found for a key. Nothing is
+                                   registered in that case.
+        :raises ValueError: If the word lists changed since the registry was opened
+        """
+        self._check_sources()
+        keys = list(keys)
+        with self._transaction():
+            codes = self._lookup_codes(keys)
+            new_keys = list(dict.fromkeys(key for key in keys if key not in codes))
+            codes.update(self._assign(new_keys))
+        return render_codes([codes[key] for key in keys], self.language)
+
+    def lookup(self, key: str) -> Name | None:
+        """
+        Returns the name of a registered key.
+
+        :param key: The key
+        :return: The name triple, or None if the key is not registered
+        """
+        self._check_sources()
+        row = self._connection.execute(
+            "SELECT code FROM names WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else render_code(row[0], self.language)
+
+    def lookup_name(self, name: str) -> str | None:
+        """
+        Returns the key that a name is assigned to.
+
+        :param name: A name in the text format, e.g. "exotic-thoughtful-Griffin"
+        :return: The key, or None if the name is not valid or not assigned
+        """
+        self._check_sources()
+        try:
+            code = parse_code(name, self.language)
+        except ValueError:
+            return None
+        row = self._connection.execute(
+            "SELECT key FROM names WHERE code = ?", (code,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM names").fetchone()
+        return int(count)
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM names WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "NameRegistry":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _check_sources(self) -> None:
+        # The word lists can be reloaded while the registry is open.
+        if CharacterDataLoader().source_digests != self.source_digests:
+            raise ValueError(
+                f"The word lists changed since the registry '{self.path}' was "
+                "opened, so its names cannot be rendered with the loaded ones."
+            )
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection)
+
+    def _lookup_codes(self, keys: list[str]) -> dict[str, int]:
+        codes: dict[str, int] = {}
+        for chunk in chunked(dict.fromkeys(keys), QUERY_CHUNK_SIZE):
+            placeholders = _placeholders(chunk)
+            # Only "?" placeholders are interpolated, the keys are bound.
+            sql = f"SELECT key, code FROM names WHERE key IN ({placeholders})"  # nosec B608
+            codes.update(self._connection.execute(sql, chunk))
+        return codes
+
+    def _taken_codes(self, codes: Iterable[int]) -> set[int]:
+        taken: set[int] = set()
+        for chunk in chunked(set(codes), QUERY_CHUNK_SIZE):
+            placeholders = _placeholders(chunk)
+            # Only "?" placeholders are interpolated, the codes are bound.
+            sql = f"SELECT code FROM names WHERE code IN ({placeholders})"  # nosec B608
+            taken.update(code for (code,) in self._connection.execute(sql, chunk))
+        return taken
+
+    def _assign(self, keys: list[str]) -> dict[str, int]:
+        # Every round hashes the pending keys in one batch and checks the resulting
+        # names against the registry with a few IN queries. Keys whose name is
+        # taken, by the registry or by an earlier key of the batch, move on to the
+        # next round of their probe sequence.
+        assigned: dict[str, int] = {}
+        rows: list[tuple[str, int, int]] = []
+        used: set[int] = set()
+        pending = keys
+        probe = 0
+        while pending:
+            if probe >= MAX_PROBES:
+                raise RegistryFullError(
+                    f"No free name found for {len(pending)} keys after {MAX_PROBES} probes."
+                )
+            codes = canonical_codes(
+                hash_codes(probe_key(key, probe) for key in pending), self.language
+            )
+            taken = self._taken_codes(codes)
+            retry: list[str] = []
+            for key, code in zip(pending, codes):
+                if code in taken or code in used:
+                    retry.append(key)
+                else:
+                    used.add(code)
+                    assigned[key] = code
+                    rows.append((key, code, probe))
+            pending = retry
+            probe += 1
+
+        # Inserting in key order appends to the primary key index instead of
+        # splitting pages all over it.
+        rows.sort()
+        self._connection.executemany("INSERT INTO names VALUES (?, ?, ?)", rows)
+        return assigned
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so the free names that a
+    # transaction reads cannot be taken by another process before it commits.
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> None:
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _placeholders(chunk: list) -> str:
+    return ",".join("?" * len(chunk))
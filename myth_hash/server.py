@@ -0,0 +1,360 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from myth_hash.bulk import OUTPUT_FIELDS
+from myth_hash.core import CharacterDataLoader, check_language, hash_names
+from myth_hash.core.async_hash import DEFAULT_STALL_BUDGET, ahash_name_chunks
+from myth_hash.core.hash_util import Name
+from myth_hash.options import SUPPORTED_LANGUAGES
+
+# Single-name requests are hashed together once this many are waiting, even if
+# more arrive in the same event loop iteration.
+MAX_BATCH_SIZE = 1024
+MAX_BATCH_INPUTS = 100_000
+MAX_BODY_SIZE = 16 * 1024 * 1024
+MAX_HEADER_LINES = 100
+# Number of recent requests the latency percentiles are computed from.
+LATENCY_WINDOW = 10_000
+# Batches are hashed and encoded in chunks between which other requests are
+# served. Encoding the records of a chunk takes about twice as long as hashing
+# it, so chunks are sized to hash within a third of the stall budget.
+BATCH_STALL_BUDGET = DEFAULT_STALL_BUDGET / 3
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Coalesces single-name requests of one language. Requests that arrive in the
+    same iteration of the event loop are hashed with one ``hash_names`` call when
+    the loop gets to the scheduled flush, so batching adds no waiting time.
+    """
+
+    def __init__(self, language: str, max_batch_size: int = MAX_BATCH_SIZE) -> None:
+        self.language = language
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.batched_names = 0
+        self._pending: list[tuple[str, asyncio.Future[Name]]] = []
+        self._scheduled = False
+
+    def submit(self, input_string: str) -> "asyncio.Future[Name]":
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Name] = loop.create_future()
+        self._pending.append((input_string, future))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self.flush)
+        return future
+
+    def flush(self) -> None:
+        self._scheduled = False
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            names = hash_names(
+                [input_string for input_string, _ in pending], self.language
+            )
+        except Exception as e:
+            # Fails every request of the batch instead of leaving them waiting.
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), name in zip(pending, names):
+            if not future.done():
+                future.set_result(name)
+        self.batches += 1
+        self.batched_names += len(pending)
+
+
+class ServerStats:
+    """
+    Request counters and latency percentiles over the most recent requests.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.names = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, names: int) -> None:
+        self.requests += 1
+        self.names += names
+        self._latencies.append(latency)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the latency in seconds that the given fraction of the recent
+        requests did not exceed (nearest rank).
+        """
+        if not self._latencies:
+            return 0.0
+        latencies = sorted(self._latencies)
+        return latencies[max(0, math.ceil(fraction * len(latencies)) - 1)]
+
+    def as_json(self) -> dict[str, Any]:
+        uptime = time.monotonic() - self.started
+        return {
+            "uptime_seconds": uptime,
+            "requests": self.requests,
+            "names": self.names,
+            "requests_per_second": self.requests / uptime if uptime else 0.0,
+            "names_per_second": self.names / uptime if uptime else 0.0,
+            "latency_ms": {
+                "p50": 1000 * self.percentile(0.5),
+                "p99": 1000 * self.percentile(0.99),
+            },
+        }
+
+
+class NameService:
+    """
+    HTTP/1.1 name service with keep-alive connections. Endpoints:
+
+    - ``GET /name?input=...&language=en``: the name of one input string
+    - ``POST /names`` with ``{"inputs": [...], "language": "en"}``: many names
+    - ``GET /stats``: request counts, throughput and p50/p99 latency
+
+    Names are JSON objects with the fields of the ``myth-hash -f json`` output.
+    Large batches are hashed in chunks, so they do not hold up concurrent
+    single-name requests. HTTP/1.0 connections are only kept alive on request.
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE) -> None:
+        self.stats = ServerStats()
+        self._batchers = {
+            language: MicroBatcher(language, max_batch_size)
+            for language in sorted(SUPPORTED_LANGUAGES)
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.Server:
+        """
+        Loads all languages and starts listening. Port 0 picks a free port, which
+        can be read from the sockets of the returned server.
+        """
+        data_loader = CharacterDataLoader()
+        for language in self._batchers:
+            data_loader.render_table(language)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                started = time.perf_counter()
+                # Stays False if the request cannot be read, because the rest of
+                # it cannot be skipped reliably.
+                keep_alive = False
+                try:
+                    method, target, version, headers, body = await _read_request(
+                        request_line, reader
+                    )
+                    connection = headers.get("connection", "").lower()
+                    if version == "HTTP/1.0":
+                        keep_alive = connection == "keep-alive"
+                    else:
+                        keep_alive = connection != "close"
+                    status, payload, names = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload, names = e.status, {"error": str(e)}, 0
+                except Exception:
+                    logging.exception(f"Request failed: {request_line!r}")
+                    status, payload, names = 500, {"error": "Internal server error."}, 0
+
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                self.stats.record(time.perf_counter() - started, names)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, Any, int]:
+        """
+        Answers one request.
+
+        :return: The status code, the JSON payload and the number of names
+        :raises HTTPError: If the request is invalid
+        """
+        url = urlsplit(target)
+        if url.path == "/name":
+            _require_method(method, "GET")
+            query = parse_qs(url.query)
+            input_string = _check_encodable(_single(query, "input"))
+            language = _language(_single(query, "language", "en"))
+            name = await self._batchers[language].submit(input_string)
+            return 200, _name_record(input_string, name), 1
+        if url.path == "/names":
+            _require_method(method, "POST")
+            inputs, language = _parse_batch(body)
+            # Each chunk is encoded right after it is hashed, so neither step
+            # blocks the loop for the whole batch.
+            records: list[str] = []
+            async for chunk, names in ahash_name_chunks(
+                inputs, language, stall_budget=BATCH_STALL_BUDGET
+            ):
+                records.append(
+                    json.dumps(
+                        [_name_record(key, name) for key, name in zip(chunk, names)],
+                        ensure_ascii=False,
+                    )[1:-1]
+                )
+            return 200, f'{{"names": [{", ".join(records)}]}}'.encode(), len(inputs)
+        if url.path == "/stats":
+            _require_method(method, "GET")
+            stats = self.stats.as_json()
+            stats["batches"] = {
+                language: {
+                    "batches": batcher.batches,
+                    "names": batcher.batched_names,
+                }
+                for language, batcher in self._batchers.items()
+            }
+            return 200, stats, 0
+        raise HTTPError(404, f"Unknown path '{url.path}'.")
+
+
+async def _read_request(
+    request_line: bytes, reader: asyncio.StreamReader
+) -> tuple[str, str, str, dict[str, str], bytes]:
+    try:
+        method, target, version = request_line.decode("latin-1").split(" ", 2)
+    except ValueError as e:
+        raise HTTPError(400, "Malformed request line.") from e
+
+    headers: dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        field, _, value = line.decode("latin-1").partition(":")
+        headers[field.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(400, "Too many header lines.")
+    if "transfer-encoding" in headers:
+        # Chunked bodies are not supported. The connection is closed, so the
+        # chunks are not read as the next request.
+        raise HTTPError(411, "Send the request body with a Content-Length.")
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError as e:
+        raise HTTPError(400, "Invalid Content-Length.") from e
+    if not 0 <= length <= MAX_BODY_SIZE:
+        raise HTTPError(413, f"Request bodies are limited to {MAX_BODY_SIZE} bytes.")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version.strip(), headers, body
+
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    # Bytes are already encoded JSON.
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+    return (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode() + body
+
+
+def _require_method(method: str, expected: str) -> None:
+    if method != expected:
+        raise HTTPError(405, f"Use {expected} for this path.")
+
+
+def _single(query: dict[str, list[str]], field: str, default: str | None = None) -> str:
+    values = query.get(field)
+    if not values:
+        if default is None:
+            raise HTTPError(400, f"The query parameter '{field}' is required.")
+        return default
+    return values[0]
+
+
+def _language(language: object) -> str:
+    if not isinstance(language, str):
+        raise HTTPError(400, "'language' must be a string.")
+    try:
+        check_language(language)
+    except ValueError as e:
+        raise HTTPError(400, str(e)) from e
+    return language
+
+
+def _parse_batch(body: bytes) -> tuple[list[str], str]:
+    try:
+        request = json.loads(body)
+    except ValueError as e:
+        raise HTTPError(400, "The request body is not valid JSON.") from e
+    if not isinstance(request, dict):
+        raise HTTPError(400, "The request body must be a JSON object.")
+    inputs = request.get("inputs")
+    if not isinstance(inputs, list) or not all(isinstance(i, str) for i in inputs):
+        raise HTTPError(400, "'inputs' must be a list of strings.")
+    if len(inputs) > MAX_BATCH_INPUTS:
+        raise HTTPError(413, f"Batches are limited to {MAX_BATCH_INPUTS} inputs.")
+    _check_encodable("".join(inputs))
+    return inputs, _language(request.get("language", "en"))
+
+
+def _check_encodable(text: str) -> str:
+    # JSON can carry lone surrogates, which cannot be hashed as UTF-8.
+    try:
+        text.encode()
+    except UnicodeEncodeError as e:
+        raise HTTPError(400, "Inputs must be valid Unicode text.") from e
+    return text
+
+
+def _name_record(input_string: str, name: Name) -> dict[str, str]:
+    return dict(zip(OUTPUT_FIELDS, (input_string, *name)))
+
+
+async def serve_http(host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    Runs the name service until it is cancelled.
+    """
+    server = await NameService().start(host, port)
+    for sock in server.sockets:
+        logging.info(
+            f"Serving fantasy names on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}"
+        )
+    async with server:
+        await server.serve_forever()
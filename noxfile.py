@@ -81,6 +81,22 @@ def pylint(session):
     session.run("poetry", "run", "pylint", *PYTHON_FILES, external=True)
 
 
+@nox.session(python="python3.11")
+def compile_data(session):
+    session.install("poetry")
+    session.run("poetry", "install")
+    session.log("Compiling character data from the JSON sources")
+    session.run(
+        "poetry",
+        "run",
+        "python",
+        "-c",
+        "from myth_hash.core.character_data_loader import compile_default_data; "
+        "compile_default_data()",
+        external=True,
+    )
+
+
 @nox.session(python="python3.11")
 def upgrade_syntax(session):
     session.log("Upgrading syntax with pyupgrade")
@@ -99,6 +115,21 @@ def test(session):
     session.run("poetry", "run", "pytest", "-W", "error", str(tests_dir), external=True)
 
 
+@nox.session(python="python3.11")
+def benchmark(session):
+    session.install("poetry")
+    session.run("poetry", "install")
+    session.log("Running the benchmark suite")
+    session.run(
+        "poetry",
+        "run",
+        "python",
+        str(PYTHON_SOURCE / "benchmarks" / "benchmark_suite.py"),
+        *session.posargs,
+        external=True,
+    )
+
+
 @nox.session(python="python3.11")
 def check(session):
     session.notify("check_format")
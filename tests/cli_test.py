@@ -1,5 +1,7 @@
 import json
 import subprocess
+import time
+import urllib.request
 from pathlib import Path
 
 import pytest
@@ -7,9 +9,10 @@ import pytest
 CLI_PATH = Path(__file__).parent.parent / "myth_hash" / "cli.py"
 
 
-def run_cli(args: list[str]) -> tuple[str, str, int]:
+def run_cli(args: list[str], stdin: str | None = None) -> tuple[str, str, int]:
     result = subprocess.run(
         ["python3", CLI_PATH.as_posix()] + args,
+        input=stdin,
         capture_output=True,
         text=True,
         check=False,
@@ -51,6 +54,31 @@ def test_german_language_json_output():
     assert "character" in output
 
 
+def test_multiple_languages_text_output():
+    stdout, stderr, returncode = run_cli(["example_name", "-l", "en,de"])
+    assert returncode == 0
+    assert not stderr
+    expected = [
+        run_cli(["example_name", "-l", lang])[0].strip() for lang in ("en", "de")
+    ]
+    assert stdout.strip().split("\t") == expected
+
+
+def test_multiple_languages_json_output():
+    stdout, stderr, returncode = run_cli(["example_name", "-l", "en,de", "-f", "json"])
+    assert returncode == 0
+    assert not stderr
+    output = json.loads(stdout)
+    assert list(output) == ["en", "de"]
+    assert "character" in output["de"]
+
+
+def test_invalid_language():
+    _, stderr, returncode = run_cli(["example_name", "-l", "en,fr"])
+    assert returncode != 0
+    assert "invalid choice" in stderr
+
+
 def test_empty_input_string():
     _, stderr, returncode = run_cli([""])
     assert returncode != 0
@@ -99,3 +127,288 @@ def test_log_levels(log_level):
         assert "ERROR" in stderr or not stderr  # No errors might be logged
     elif log_level == "CRITICAL":
         assert not stderr  # Only critical errors should appear, but we're assuming none
+
+
+def test_stdin_text_output_matches_single_mode():
+    stdout, stderr, returncode = run_cli(["--stdin"], stdin="alpha\nbeta\n")
+    assert returncode == 0
+    assert not stderr
+    expected = [run_cli([key])[0].strip() for key in ("alpha", "beta")]
+    assert stdout.splitlines() == expected
+
+
+def test_stdin_jobs_output_matches_serial():
+    stdin = "".join(f"key{i}\n" for i in range(100))
+    serial_stdout, _, _ = run_cli(["--stdin"], stdin=stdin)
+    stdout, stderr, returncode = run_cli(["--stdin", "--jobs", "2"], stdin=stdin)
+    assert returncode == 0
+    assert not stderr
+    assert stdout == serial_stdout
+
+
+def test_stdin_cache_output_matches_uncached():
+    stdin = "alpha\nbeta\nalpha\nalpha\n"
+    uncached_stdout, _, _ = run_cli(["--stdin"], stdin=stdin)
+    stdout, stderr, returncode = run_cli(["--stdin", "--cache-size", "8"], stdin=stdin)
+    assert returncode == 0
+    assert not stderr
+    assert stdout == uncached_stdout
+
+
+def test_cache_cannot_be_combined_with_jobs():
+    _, stderr, returncode = run_cli(
+        ["--stdin", "--cache-size", "8", "--jobs", "2"], stdin=""
+    )
+    assert returncode != 0
+    assert "--cache-size cannot be combined with --jobs" in stderr
+
+
+def test_stdin_json_lines_output():
+    stdout, stderr, returncode = run_cli(
+        ["--stdin", "-l", "de", "-f", "json"], stdin="alpha\nbeta\n"
+    )
+    assert returncode == 0
+    assert not stderr
+    records = [json.loads(line) for line in stdout.splitlines()]
+    assert [record["input"] for record in records] == ["alpha", "beta"]
+    assert all("character" in record for record in records)
+
+
+def test_input_file_csv_key_column(tmp_path):
+    input_file = tmp_path / "keys.csv"
+    input_file.write_text("id,user\n1,alpha\n2,beta\n", encoding="utf8")
+    stdout, stderr, returncode = run_cli(
+        ["-i", str(input_file), "--input-format", "csv", "--key-column", "user"]
+        + ["-f", "tsv"]
+    )
+    assert returncode == 0
+    assert not stderr
+    rows = [line.split("\t") for line in stdout.splitlines()]
+    assert rows[0] == [
+        "input",
+        "physical_attribute",
+        "personality_attribute",
+        "character",
+    ]
+    assert [row[0] for row in rows[1:]] == ["alpha", "beta"]
+
+
+def test_stdin_text_output_keeps_empty_lines():
+    stdout, stderr, returncode = run_cli(["--stdin"], stdin="alpha\n\nbeta\n")
+    assert returncode == 0
+    assert not stderr
+    lines = stdout.splitlines()
+    assert len(lines) == 3
+    assert lines[0] == run_cli(["alpha"])[0].strip()
+    assert lines[1] == ""
+    assert lines[2] == run_cli(["beta"])[0].strip()
+
+    stdout, _, returncode = run_cli(["--stdin", "-l", "en,de"], stdin=" \nalpha\n")
+    assert returncode == 0
+    assert stdout.splitlines()[0] == ""
+
+
+def test_stdin_skips_empty_lines():
+    stdout, stderr, returncode = run_cli(
+        ["--stdin", "-f", "json"], stdin="alpha\n\nbeta\n"
+    )
+    assert returncode == 0
+    assert len(stdout.splitlines()) == 2
+    assert "Skipped 1 empty keys" in stderr
+
+
+def test_stdin_multiple_languages_csv_output():
+    stdout, stderr, returncode = run_cli(
+        ["--stdin", "-l", "de,en", "-f", "csv"], stdin="alpha\nbeta\n"
+    )
+    assert returncode == 0
+    assert not stderr
+    rows = stdout.splitlines()
+    assert rows[0].split(",")[:2] == ["input", "physical_attribute_de"]
+    assert len(rows) == 3
+    assert all(len(row.split(",")) == 7 for row in rows)
+
+
+def test_input_string_and_stdin_are_exclusive():
+    _, stderr, returncode = run_cli(["example_name", "--stdin"], stdin="")
+    assert returncode != 0
+    assert "exactly one of" in stderr
+
+
+def test_key_column_requires_delimited_input():
+    _, stderr, returncode = run_cli(["--stdin", "--key-column", "1"], stdin="")
+    assert returncode != 0
+    assert "--key-column requires" in stderr
+
+
+def test_stats_sample():
+    stdout, stderr, returncode = run_cli(["stats", "--sample", "1000", "-f", "json"])
+    assert returncode == 0
+    assert not stderr
+    report = json.loads(stdout)
+    assert report["total"] == 1000
+    assert report["duplicates"] == 1000 - report["distinct_names"]
+    assert set(report["slots"]) == {
+        "physical_attribute",
+        "personality_attribute",
+        "character",
+    }
+
+
+def test_stats_stdin_text_output():
+    stdout, _, returncode = run_cli(["stats", "-l", "de"], stdin="a\nb\na\n")
+    assert returncode == 0
+    assert "Total inputs:        3" in stdout
+    assert "Duplicates:          1" in stdout
+
+
+def test_literal_stats_input():
+    stdout, _, returncode = run_cli(["--", "stats"])
+    assert returncode == 0
+    assert stdout == run_cli(["-i", "/dev/stdin"], stdin="stats\n")[0]
+
+
+@pytest.fixture(name="daemon_socket")
+def fixture_daemon_socket(tmp_path):
+    socket_path = tmp_path / "myth-hash.sock"
+    with subprocess.Popen(
+        ["python3", CLI_PATH.as_posix(), "serve", "--socket", socket_path.as_posix()],
+        stderr=subprocess.DEVNULL,
+    ) as process:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield socket_path.as_posix()
+        process.terminate()
+        process.wait(timeout=10)
+    assert not socket_path.exists()
+
+
+@pytest.mark.parametrize(
+    "args",
+    [[], ["-f", "json"], ["-l", "de", "-f", "tsv"], ["-l", "en,de", "-f", "csv"]],
+)
+def test_socket_output_matches_in_process(daemon_socket, args):
+    stdout, stderr, returncode = run_cli(
+        ["example_name", "--socket", daemon_socket] + args
+    )
+    assert returncode == 0
+    assert not stderr
+    assert stdout == run_cli(["example_name"] + args)[0]
+
+
+def test_socket_validation_error(daemon_socket):
+    _, stderr, returncode = run_cli(
+        ["example_name", "-l", "xx", "--socket", daemon_socket]
+    )
+    assert returncode != 0
+    assert "invalid choice: 'xx'" in stderr
+
+
+def test_socket_falls_back_without_daemon(tmp_path):
+    socket_path = (tmp_path / "missing.sock").as_posix()
+    stdout, stderr, returncode = run_cli(["example_name", "--socket", socket_path])
+    assert returncode == 0
+    assert not stderr
+    assert stdout == run_cli(["example_name"])[0]
+
+
+def test_socket_requires_input_string():
+    _, stderr, returncode = run_cli(["--stdin", "--socket", "x.sock"], stdin="a\n")
+    assert returncode != 0
+    assert "--socket requires an input_string" in stderr
+
+
+def test_socket_rejects_stats():
+    _, stderr, returncode = run_cli(["example_name", "--stats", "--socket", "x.sock"])
+    assert returncode != 0
+    assert "--stats cannot be combined with --socket" in stderr
+
+
+def test_socket_does_not_load_the_hashing_modules(daemon_socket):
+    script = (
+        "import sys\n"
+        "from myth_hash.cli import main\n"
+        f"sys.argv = ['myth-hash', 'example_name', '--socket', {daemon_socket!r}]\n"
+        "main()\n"
+        "print(sorted(m for m in sys.modules if m.startswith('myth_hash')))\n"
+    )
+    result = subprocess.run(
+        ["python3", "-c", script],
+        cwd=CLI_PATH.parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    name, modules = result.stdout.splitlines()
+    assert name == run_cli(["example_name"])[0].strip()
+    assert modules == str(
+        ["myth_hash", "myth_hash.cli", "myth_hash.client", "myth_hash.options"]
+    )
+
+
+def test_serve_http():
+    with subprocess.Popen(
+        [
+            "python3",
+            CLI_PATH.as_posix(),
+            "serve",
+            "--port",
+            "0",
+            "--reload-interval",
+            "60",
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+    ) as process:
+        try:
+            # INFO:root:Serving fantasy names on http://127.0.0.1:<port>
+            url = process.stderr.readline().strip().rsplit(" ", 1)[1]
+            with urllib.request.urlopen(f"{url}/name?input=example_name") as response:
+                record = json.loads(response.read())
+        finally:
+            process.terminate()
+    expected = json.loads(run_cli(["example_name", "-f", "json"])[0])
+    assert record == {"input": "example_name", **expected}
+
+
+def test_serve_invalid_reload_interval():
+    _, stderr, returncode = run_cli(["serve", "--port", "0", "--reload-interval", "0"])
+    assert returncode != 0
+    assert "--reload-interval must be positive" in stderr
+
+
+def test_file_input(tmp_path):
+    first = tmp_path / "first.txt"
+    first.write_text("example_name", encoding="utf8")
+    second = tmp_path / "second.bin"
+    second.write_bytes(b"\x00\xff" * 100_000)
+    stdout, stderr, returncode = run_cli(
+        ["--file", first.as_posix(), second.as_posix(), "-f", "csv", "-j", "2"]
+    )
+    assert returncode == 0
+    assert not stderr
+    rows = stdout.splitlines()
+    assert rows[0] == "input,physical_attribute,personality_attribute,character"
+    expected = run_cli(["example_name", "-f", "csv"])[0].splitlines()[1]
+    assert rows[1] == f"{first.as_posix()},{expected.split(',', 1)[1]}"
+    assert rows[2].startswith(f"{second.as_posix()},")
+
+
+def test_missing_file_input(tmp_path):
+    _, stderr, returncode = run_cli(["--file", (tmp_path / "missing").as_posix()])
+    assert returncode == 1
+    assert "Failed to read input" in stderr
+
+
+def test_stats_summary():
+    stdout, stderr, returncode = run_cli(
+        ["--stdin", "--stats"], stdin="first\nsecond\nthird\n"
+    )
+    assert returncode == 0
+    assert stdout == run_cli(["--stdin"], stdin="first\nsecond\nthird\n")[0]
+    rows = {line.split()[0]: line.split()[1:] for line in stderr.splitlines()}
+    assert "operation" in rows
+    assert rows["hash.batch"][:2] == ["1", "3"]
+    assert rows["output.format"][:2] == ["1", "3"]
+    assert "loader.load" in rows
@@ -1,8 +1,85 @@
+import asyncio
+import importlib.util
+import json
 import logging
+import marshal
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
 
-from myth_hash import hash_name
-from myth_hash.core import CharacterDataLoader
+from myth_hash import (
+    HashScheme,
+    MythName,
+    NameCache,
+    hash_bytes,
+    hash_code,
+    hash_codes,
+    hash_file,
+    hash_files,
+    hash_indices,
+    hash_name,
+    hash_name_multi,
+    hash_names,
+    hash_names_multi,
+    hash_names_threaded,
+    parse_code,
+    parse_name,
+    register_dataset,
+    render_code,
+    render_codes,
+    render_indices,
+)
+from myth_hash import server as server_module
+from myth_hash.analysis import analyze, expected_distinct
+from myth_hash.bulk import NAME_FIELDS, format_text_name
+from myth_hash.core import (
+    CharacterDataLoader,
+    CharacterNoun,
+    DatasetRegistry,
+    DataWatcher,
+    NominativAdjective,
+    canonical_codes,
+    code_space,
+    hash_name_chunks,
+    instrumentation,
+    pack_indices,
+    parse_name_candidates,
+    parse_names,
+    unpack_code,
+    watch_data,
+)
+from myth_hash.core.async_hash import (
+    INITIAL_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    ahash_name_chunks,
+    ahash_names,
+    hash_name_async,
+)
+from myth_hash.core.character_data_loader import COMPILED_DATA_FILE, SOURCE_FILES
+from myth_hash.core.columnar import hash_arrow, hash_series, pa, word_vocabulary
+from myth_hash.core.compiled_data import compile_data, load_compiled_data
+from myth_hash.core.datasets import DEFAULT_DATASETS
+from myth_hash.core.hash_util import PARALLEL_THRESHOLD
+from myth_hash.core.shared_store import (
+    SharedWordStore,
+    attach_shared_store,
+    export_shared_store,
+)
+from myth_hash.core.vectorized import (
+    digest_array,
+    generate_indices_array,
+    hash_indices_array,
+    np,
+)
+from myth_hash.daemon import handle_request
+from myth_hash.registry import NameRegistry
+from myth_hash.server import MicroBatcher, NameService
 
 logging.basicConfig(level=logging.INFO)
 
@@ -14,12 +91,1519 @@ class TestMythHashGenerator(unittest.TestCase):
         self.assertIsInstance(result, tuple)
         self.assertEqual(len(result), 3)
 
+    def test_hash_names_matches_hash_name(self):
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        for language in ("en", "de"):
+            self.assertEqual(
+                hash_names(inputs, language),
+                [hash_name(input_string, language) for input_string in inputs],
+            )
+
+    def test_hash_names_accepts_iterators(self):
+        result = hash_names((f"teststring{i}" for i in range(10)), "de")
+        self.assertEqual(len(result), 10)
+
+    def test_hash_names_parallel_preserves_order(self):
+        inputs = [f"teststring{i}" for i in range(PARALLEL_THRESHOLD + 1_000)]
+        self.assertEqual(hash_names(inputs, "de", workers=2), hash_names(inputs, "de"))
+
+    def test_hash_name_chunks_small_stream_is_serial(self):
+        chunks = [["a", "b"], ["c"]]
+        results = list(hash_name_chunks(chunks, "en", workers=4))
+        self.assertEqual([chunk for chunk, _ in results], chunks)
+        self.assertEqual(results[1][1], hash_names(["c"], "en"))
+
+    def test_hash_names_negative_workers(self):
+        with self.assertRaises(ValueError):
+            hash_names(["teststring"], "en", workers=-1)
+
+    def test_hash_names_invalid_language(self):
+        with self.assertRaises(ValueError):
+            hash_names(["teststring"], "fr")
+
+
+class TestFileHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, name, data):
+        path = Path(self.temp_dir) / name
+        path.write_bytes(data)
+        return path
+
+    def test_bytes_match_strings(self):
+        for input_string in ("teststring", "", "Grüße 🐉"):
+            data = input_string.encode()
+            self.assertEqual(hash_bytes(data, "de"), hash_name(input_string, "de"))
+            self.assertEqual(
+                hash_bytes(memoryview(bytearray(data))), hash_name(input_string)
+            )
+
+    def test_files(self):
+        data = b"myth-hash" * 500_000  # several memory-mapped slices
+        paths = [
+            self.write_file("large.bin", data),
+            self.write_file("empty.bin", b""),
+            self.write_file("small.txt", b"teststring"),
+        ]
+        expected = [hash_bytes(data), hash_name(""), hash_name("teststring")]
+        self.assertEqual([hash_file(path) for path in paths], expected)
+        self.assertEqual(hash_files(paths), expected)
+        self.assertEqual(hash_files(map(str, paths), workers=1), expected)
+
+    def test_missing_file(self):
+        with self.assertRaises(OSError):
+            hash_file(Path(self.temp_dir) / "missing")
+        with self.assertRaises(ValueError):
+            hash_files([], workers=0)
+
+
+class TestHashScheme(unittest.TestCase):
+
+    def test_default_scheme_is_hash_name(self):
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        scheme = HashScheme()
+        for language in ("en", "de"):
+            self.assertEqual(
+                scheme.hash_names(inputs, language), hash_names(inputs, language)
+            )
+            self.assertEqual(
+                scheme.hash_name(inputs[0], language), hash_name(inputs[0], language)
+            )
+        self.assertEqual(scheme.hash_indices(inputs[0]), hash_indices(inputs[0]))
+        self.assertEqual(scheme.hash_bytes(b"teststring"), hash_bytes(b"teststring"))
+
+    def test_custom_schemes(self):
+        inputs = [f"teststring{i}" for i in range(200)]
+        schemes = [
+            HashScheme(salt=b"tenant-a"),
+            HashScheme(salt=b"tenant-b"),
+            HashScheme(key=b"secret"),
+            HashScheme("blake2b", digest_size=16),
+            HashScheme("blake2b", salt=b"tenant-a", key=b"secret", digest_size=16),
+            HashScheme("blake2s", segment_size=8),
+        ]
+        results = [scheme.hash_names(inputs, "de") for scheme in schemes]
+        for scheme, names in zip(schemes, results):
+            # The precomputed state is copied, so repeated calls agree.
+            self.assertEqual(
+                [scheme.hash_name(input_string, "de") for input_string in inputs], names
+            )
+            self.assertNotEqual(names, hash_names(inputs, "de"))
+        self.assertEqual(len({tuple(names) for names in results}), len(schemes))
+
+    def test_invalid_schemes(self):
+        for options in (
+            {"algorithm": "unknown"},
+            {"algorithm": "shake_128"},
+            {"digest_size": 16},
+            {"algorithm": "blake2b", "digest_size": 8},
+            {"segment_size": 2},
+            {"segment_size": 11},
+            {"version": 2},
+        ):
+            with self.assertRaises(ValueError):
+                HashScheme(**options)
+
+    def test_salt_is_separated_from_the_input(self):
+        self.assertNotEqual(
+            HashScheme(salt=b"ab").hash_name("c"), HashScheme(salt=b"a").hash_name("bc")
+        )
+        self.assertNotEqual(
+            HashScheme("blake2b", salt=b"ab").hash_name("c"),
+            HashScheme("blake2b", salt=b"a").hash_name("bc"),
+        )
+
+    def test_json_round_trip(self):
+        scheme = HashScheme("blake2b", salt=b"tenant-a", key=b"secret", digest_size=24)
+        self.assertNotIn("secret", json.dumps(scheme.as_json()))
+        self.assertEqual(HashScheme.from_json(scheme.as_json(), key=b"secret"), scheme)
+        with self.assertRaises(ValueError):
+            HashScheme.from_json(scheme.as_json())
+
+
+class TestMultiLanguage(unittest.TestCase):
+
+    def test_hash_name_multi_matches_hash_name(self):
+        names = hash_name_multi("teststring", ("en", "de"))
+        self.assertEqual(list(names), ["en", "de"])
+        for language, name in names.items():
+            self.assertEqual(name, hash_name("teststring", language))
+
+    def test_hash_names_multi_matches_hash_names(self):
+        inputs = [f"teststring{i}" for i in range(100)]
+        records = hash_names_multi(inputs, ("de", "en"))
+        for language in ("de", "en"):
+            self.assertEqual(
+                [record[language] for record in records], hash_names(inputs, language)
+            )
+
+    def test_indices_can_be_rendered_later(self):
+        indices = hash_indices("teststring")
+        self.assertEqual(len(indices), 3)
+        self.assertEqual(render_indices(indices, "de"), hash_name("teststring", "de"))
+
+    def test_invalid_languages(self):
+        with self.assertRaises(ValueError):
+            hash_name_multi("teststring", ("en", "fr"))
+        with self.assertRaises(ValueError):
+            hash_name_multi("teststring", ())
+
+
+class TestNameCodes(unittest.TestCase):
+
+    def test_codes_render_like_hash_name(self):
+        inputs = [f"teststring{i}" for i in range(100)]
+        codes = hash_codes(inputs)
+        self.assertEqual(codes, [hash_code(input_string) for input_string in inputs])
+        for language in ("en", "de"):
+            self.assertEqual(
+                [render_code(code, language) for code in codes],
+                hash_names(inputs, language),
+            )
+            self.assertEqual(
+                render_codes(codes, language), hash_names(inputs, language)
+            )
+
+    def test_pack_and_unpack(self):
+        indices = hash_indices("teststring")
+        code = pack_indices(indices)
+        self.assertEqual(unpack_code(code), indices)
+        self.assertEqual(unpack_code(code_space() - 1)[2], len(self.nouns()) - 1)
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            unpack_code(code_space())
+        with self.assertRaises(ValueError):
+            unpack_code(-1)
+        with self.assertRaises(ValueError):
+            render_codes([code_space()])
+        with self.assertRaises(ValueError):
+            pack_indices((0, 0, len(self.nouns())))
+
+    def test_myth_name(self):
+        name = MythName.from_input("teststring")
+        self.assertEqual(name, MythName(hash_code("teststring")))
+        self.assertEqual(len({name, MythName(int(name)), MythName(0)}), 2)
+        self.assertEqual(name.render("de"), hash_name("teststring", "de"))
+        self.assertEqual(name.indices, hash_indices("teststring"))
+        self.assertLess(MythName(0), MythName(1))
+        self.assertGreaterEqual(MythName(1), MythName(1))
+        with self.assertRaises(TypeError):
+            _ = MythName(0) < 1
+
+    @staticmethod
+    def nouns():
+        return CharacterDataLoader().language_data("en").character_nouns
+
+
+class TestNameParser(unittest.TestCase):
+
+    def test_parsed_names_render_to_the_same_text(self):
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        for language in ("en", "de"):
+            texts = [format_text_name(name) for name in hash_names(inputs, language)]
+            for text, code, indices in zip(
+                texts, hash_codes(inputs), parse_names(texts, language)
+            ):
+                self.assertIn(unpack_code(code), parse_name_candidates(text, language))
+                self.assertEqual(
+                    format_text_name(render_indices(indices, language)), text
+                )
+
+    def test_parse_name_is_canonical(self):
+        text = format_text_name(hash_name("teststring", "de"))
+        self.assertEqual(parse_name(text, "de"), parse_name_candidates(text, "de")[0])
+        self.assertEqual(parse_code(text, "de"), pack_indices(parse_name(text, "de")))
+
+    def test_hyphenated_words_and_nouns_with_spaces(self):
+        table = CharacterDataLoader().render_table("en")
+        noun_index = next(
+            i for i, noun in enumerate(table.character_nouns) if " " in noun
+        )
+        physical_index = next(
+            i for i, word in enumerate(table.physical_attributes[2]) if "-" in word
+        )
+        indices = (physical_index, 0, noun_index)
+        text = format_text_name(render_indices(indices, "en"))
+        self.assertIn(indices, parse_name_candidates(text, "en"))
+
+    def test_gender_mismatch_is_invalid(self):
+        table = CharacterDataLoader().render_table("de")
+        noun_index = table.character_genders.index(0)
+        physical = table.physical_attributes[1][0]
+        personality = table.personality_attributes[1][0]
+        noun = table.character_nouns[noun_index].replace(" ", "")
+        text = f"{physical}-{personality}-{noun}"
+        self.assertEqual(parse_name_candidates(text, "de"), [])
+
+    def test_invalid_names(self):
+        with self.assertRaises(ValueError):
+            parse_name("not-a-name", "en")
+        self.assertEqual(list(parse_names(["", "Griffin", "a-b-c"], "en")), [None] * 3)
+
+    def test_canonical_codes(self):
+        codes = hash_codes(f"teststring{i}" for i in range(2_000))
+        for language in ("en", "de"):
+            self.assertEqual(
+                canonical_codes(codes, language),
+                [
+                    parse_code(format_text_name(render_code(code, language)), language)
+                    for code in codes
+                ],
+            )
+
+
+@unittest.skipIf(pa is None, "PyArrow is not installed")
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.inputs = [f"teststring{i}" for i in range(5_000)] + ["", "Äpfel"]
+
+    def assert_names(self, table, expected):
+        self.assertEqual(
+            list(zip(*(table.column(name).to_pylist() for name in table.column_names))),
+            expected,
+        )
+
+    def test_names_match_hash_name(self):
+        for language in ("en", "de"):
+            expected = [hash_name(i, language) for i in self.inputs]
+            table = hash_arrow(pa.array(self.inputs), language)
+            self.assert_names(table, expected)
+            self.assertEqual(
+                table.column(0).type, pa.dictionary(pa.int16(), pa.string())
+            )
+            self.assert_names(
+                hash_arrow(
+                    pa.array(self.inputs, type=pa.large_string()).slice(10, 100),
+                    language,
+                ),
+                expected[10:110],
+            )
+
+    def test_input_types(self):
+        self.assertEqual(
+            hash_arrow(pa.array([b"\x00\xff"])).to_pylist()[0],
+            dict(
+                zip(hash_arrow(pa.array([b""])).column_names, hash_bytes(b"\x00\xff"))
+            ),
+        )
+        chunked = hash_arrow(pa.chunked_array([["a", None], ["b"]]))
+        self.assertEqual(chunked.column(0).num_chunks, 2)
+        self.assertEqual(
+            chunked.column(2).to_pylist(), [hash_name("a")[2], None, hash_name("b")[2]]
+        )
+        encoded = pa.DictionaryArray.from_arrays(
+            pa.array([0, 1, None, 0]), pa.array(["a", None])
+        )
+        self.assertEqual(
+            hash_arrow(encoded).column(2).to_pylist(),
+            [hash_name("a")[2], None, None, hash_name("a")[2]],
+        )
+        self.assertEqual(hash_arrow(pa.array([], type=pa.string())).num_rows, 0)
+        with self.assertRaises(ValueError):
+            hash_arrow(pa.array([1, 2]))
+        with self.assertRaises(ValueError):
+            hash_arrow(pa.array(["a"]), "fr")
+
+    def test_vocabularies_are_distinct_words(self):
+        vocabulary = word_vocabulary("de")
+        for words in (
+            vocabulary.physical_attributes,
+            vocabulary.personality_attributes,
+            vocabulary.character_nouns,
+        ):
+            self.assertEqual(len(words), len(set(words)))
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pandas") is None, "pandas is not installed"
+    )
+    def test_series(self):
+        import pandas  # pylint: disable=import-outside-toplevel
+
+        series = pandas.Series(["a", None, "b"], index=[10, 20, 30], dtype=object)
+        frame = hash_series(series, "de")
+        self.assertEqual(list(frame.index), [10, 20, 30])
+        self.assertEqual(frame["character"].dtype, "category")
+        self.assertEqual(frame.loc[10].tolist(), list(hash_name("a", "de")))
+        self.assertTrue(frame.loc[20].isna().all())
+        self.assertEqual(
+            hash_series(series.astype("category"), "de").loc[30].tolist(),
+            list(hash_name("b", "de")),
+        )
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorized(unittest.TestCase):
+
+    def test_indices_match_scalar_path(self):
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        self.assertEqual(
+            hash_indices_array(inputs).tolist(),
+            [list(hash_indices(input_string)) for input_string in inputs],
+        )
+
+    def test_wide_segments_are_reduced_exactly(self):
+        digests = np.random.default_rng(0).integers(0, 256, (500, 32), dtype=np.uint8)
+        for list_sizes in ([2**32 - 5, 7, 2**31 + 11], [2**40 + 3], [3, 5, 7, 11, 13]):
+            expected = []
+            for digest in digests:
+                expected.append(generate_indices_from_digest(bytes(digest), list_sizes))
+            self.assertEqual(
+                generate_indices_array(digests, list_sizes).tolist(), expected
+            )
+
+    def test_digest_array(self):
+        digests = digest_array(["a", "b"])
+        self.assertEqual(digests.shape, (2, 32))
+        self.assertEqual(digests.dtype, np.uint8)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            generate_indices_array(np.zeros((2, 16), dtype=np.uint8), [3])
+        with self.assertRaises(ValueError):
+            generate_indices_array(np.zeros((2, 32), dtype=np.uint8), [0])
+
+
+def generate_indices_from_digest(digest: bytes, list_sizes: list[int]) -> list[int]:
+    segment_length = len(digest) // len(list_sizes)
+    return [
+        int.from_bytes(digest[i * segment_length : (i + 1) * segment_length], "big")
+        % size
+        for i, size in enumerate(list_sizes)
+    ]
+
+
+class TestNameCache(unittest.TestCase):
+
+    def test_cached_names_match_hash_name(self):
+        cache = NameCache(maxsize=16)
+        self.assertEqual(
+            cache.hash_name("teststring", "de"), hash_name("teststring", "de")
+        )
+        self.assertEqual(
+            cache.hash_names(["a", "b", "a"], "en"),
+            [hash_name("a"), hash_name("b"), hash_name("a")],
+        )
+
+    def test_cache_info_and_clear(self):
+        cache = NameCache(maxsize=16)
+        cache.hash_names(["a", "b", "a", "a"], "en")
+        cache.hash_name("a", "de")
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 3))
+
+        cache.cache_clear()
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_least_recently_used_name_is_evicted(self):
+        cache = NameCache(maxsize=2)
+        cache.hash_names(["a", "b", "a", "c", "a"], "en")
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 2))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            NameCache(maxsize=-1)
+        with self.assertRaises(ValueError):
+            NameCache().hash_names(["a"], "fr")
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        self.addCleanup(instrumentation.reset)
+        self.addCleanup(instrumentation.disable)
+
+    def test_nothing_is_recorded_when_disabled(self):
+        hash_name("teststring")
+        hash_names(["a", "b"])
+        self.assertEqual(instrumentation.snapshot(), {"timings": {}, "counters": {}})
+
+    def test_hot_paths_are_recorded(self):
+        instrumentation.enable()
+        name = hash_name("teststring", "de")
+        hash_names(["a", "b", "c"])
+        instrumentation.disable()
+        hash_name("teststring")
+
+        self.assertEqual(name, hash_name("teststring", "de"))
+        timings = instrumentation.snapshot()["timings"]
+        self.assertEqual(timings["hash.generate_indices"]["calls"], 1)
+        self.assertEqual(timings["words.resolve"]["calls"], 1)
+        self.assertEqual(
+            (timings["hash.batch"]["calls"], timings["hash.batch"]["items"]), (1, 3)
+        )
+        self.assertEqual(sum(timings["words.resolve"]["buckets"]), 1)
+        self.assertIn("hash.batch", instrumentation.format_stats())
+
+    def test_callbacks_receive_timings_and_counters(self):
+        events = []
+
+        def callback(name, elapsed_ns, items):
+            events.append((name, elapsed_ns, items))
+
+        instrumentation.add_callback(callback)
+        self.addCleanup(instrumentation.remove_callback, callback)
+        instrumentation.enable()
+        hash_bytes(b"data")
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b"0123456789")
+            file.flush()
+            hash_file(file.name)
+
+        self.assertIn(("words.resolve", mock.ANY, 1), events)
+        self.assertIn(("hash.file_bytes", None, 10), events)
+        self.assertEqual(
+            instrumentation.snapshot()["counters"], {"hash.file_bytes": 10}
+        )
+        self.assertTrue(
+            all(elapsed is None or elapsed >= 0 for _, elapsed, _ in events)
+        )
+
+    def test_histogram_percentiles(self):
+        timing = instrumentation.Timing("test")
+        for elapsed_ns in (100, 100, 100, 5000):
+            timing.add(elapsed_ns)
+        self.assertEqual(timing.percentile(0.5), 128)
+        self.assertEqual(timing.percentile(0.99), 5000)
+        self.assertEqual(timing.as_json()["mean_ns"], 1325)
+
+
+class TestWords(unittest.TestCase):
+
+    def setUp(self):
+        self.words = {
+            "de": {"masculine": "großer", "feminine": "große", "neutral": "großes"},
+            "en": {"neutral": "big"},
+        }
+        self.data = {
+            "de": {"word": "Elfe", "gender": "feminine"},
+            "en": {"word": "Elf", "gender": "neutral"},
+        }
+
+    def test_adjective_views(self):
+        adjective = NominativAdjective("1", self.words)
+        self.assertEqual(adjective.word("de", "feminine"), "große")
+        self.assertEqual(adjective.word("en"), "big")
+        self.assertEqual(adjective.as_json(), {"id": "1", "words": self.words})
+        self.assertEqual(str(adjective), "big")
+
+    def test_adjective_missing_word(self):
+        adjective = NominativAdjective("1", {"en": {"neutral": "big"}})
+        with self.assertRaises(ValueError):
+            adjective.word("en", "feminine")
+        with self.assertRaises(ValueError):
+            adjective.word("xx", "neutral")
+
+    def test_adjective_set_word(self):
+        adjective = NominativAdjective("1", {"en": {"neutral": "big"}})
+        adjective.set_word("en", "neutral", "large")
+        adjective.set_word("de", "neutral", "großes")
+        self.assertEqual(adjective.word("en"), "large")
+        self.assertEqual(adjective.words["de"], {"neutral": "großes"})
+        # The words are a copy.
+        adjective.words["en"]["neutral"] = "huge"
+        self.assertEqual(adjective.word("en"), "large")
+
+    def test_adjective_invalid_gender(self):
+        with self.assertRaises(ValueError):
+            NominativAdjective("1", {"en": {"plural": "big"}})
+
+    def test_noun_views(self):
+        noun = CharacterNoun("2", self.data)
+        self.assertEqual(noun.get_attribute("de", "word"), "Elfe")
+        self.assertEqual(noun.get_attribute("de", "gender"), "feminine")
+        self.assertEqual(noun.gender_code("de"), 1)
+        self.assertEqual(CharacterNoun.from_json(noun.as_json()).data, self.data)
+        noun.data["de"]["word"] = "Zwerg"
+        self.assertEqual(noun.get_attribute("de", "word"), "Elfe")
+        with self.assertRaises(ValueError):
+            noun.get_attribute("xx", "word")
+        with self.assertRaises(ValueError):
+            noun.get_attribute("en", "plural")
+
+    def test_noun_invalid_gender(self):
+        with self.assertRaises(ValueError):
+            CharacterNoun("2", {"en": {"word": "Elf", "gender": "plural"}})
+
+
+class TestDatasets(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.wyverns = self.make_dataset("wyverns", {"word": "Wyvern"})
+        self.plain = self.make_dataset("plain", {})
+        # The first input whose noun is the dragon, the first noun.
+        self.dragon_input = next(
+            f"teststring{i}"
+            for i in range(10_000)
+            if hash_name(f"teststring{i}")[2] == "Dragon"
+        )
+
+    def make_dataset(self, name, first_noun):
+        data_dir = self.tmp_dir / name
+        data_dir.mkdir()
+        for path in SOURCE_FILES.values():
+            shutil.copy(path, data_dir / path.name)
+        nouns_file = data_dir / SOURCE_FILES["character_nouns"].name
+        nouns = json.loads(nouns_file.read_text(encoding="utf8"))
+        nouns["0"]["data"]["en"].update(first_noun)
+        nouns_file.write_text(json.dumps(nouns), encoding="utf8")
+        return data_dir
+
+    def test_names_use_the_words_of_the_dataset(self):
+        register_dataset("wyverns", self.wyverns)
+        self.addCleanup(DEFAULT_DATASETS.unregister, "wyverns")
+
+        name = hash_name(self.dragon_input, "en", dataset="wyverns")
+        self.assertEqual(name, (*hash_name(self.dragon_input)[:2], "Wyvern"))
+        self.assertEqual(hash_name(self.dragon_input)[2], "Dragon")
+        self.assertEqual(
+            hash_name(self.dragon_input, "de", dataset="wyverns"),
+            hash_name(self.dragon_input, "de"),
+        )
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        self.assertEqual(
+            hash_names(inputs, dataset="wyverns"),
+            [hash_name(i, dataset="wyverns") for i in inputs],
+        )
+        self.assertEqual(
+            hash_names_threaded(inputs * 3, workers=2, dataset="wyverns"),
+            hash_names(inputs * 3, dataset="wyverns"),
+        )
+        self.assertEqual(
+            hash_bytes(self.dragon_input.encode(), dataset="wyverns"), name
+        )
+        self.assertEqual(
+            render_indices(hash_indices(self.dragon_input), dataset="wyverns"), name
+        )
+        self.assertEqual(
+            hash_name_multi(self.dragon_input, ("en",), dataset="wyverns"),
+            {"en": name},
+        )
+        self.assertEqual(
+            hash_names_multi(inputs, ("en", "de"), dataset="wyverns"),
+            [
+                {"en": hash_name(i, "en", "wyverns"), "de": hash_name(i, "de")}
+                for i in inputs
+            ],
+        )
+        input_file = self.tmp_dir / "input.bin"
+        input_file.write_bytes(self.dragon_input.encode())
+        self.assertEqual(hash_file(input_file, dataset="wyverns"), name)
+        self.assertEqual(hash_files([input_file], dataset="wyverns"), [name])
+        # The data set was validated and compiled on first use.
+        self.assertTrue((self.wyverns / COMPILED_DATA_FILE.name).exists())
+
+    def test_worker_processes_load_the_dataset(self):
+        register_dataset("wyverns", self.wyverns)
+        self.addCleanup(DEFAULT_DATASETS.unregister, "wyverns")
+        inputs = [f"teststring{i}" for i in range(PARALLEL_THRESHOLD + 1_000)]
+        self.assertEqual(
+            hash_names(inputs, workers=2, dataset="wyverns"),
+            hash_names(inputs, dataset="wyverns"),
+        )
+
+    def test_shared_process_executors_load_the_dataset(self):
+        async def hash_in(executor, inputs):
+            names = [
+                name
+                async for name in ahash_names(
+                    inputs, executor=executor, chunk_size=100, dataset="wyverns"
+                )
+            ]
+            name = await hash_name_async(self.dragon_input, "en", executor, "wyverns")
+            return names, name
+
+        inputs = [f"teststring{i}" for i in range(300)]
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            # The worker starts before the data set is registered.
+            executor.submit(int).result()
+            register_dataset("wyverns", self.wyverns)
+            self.addCleanup(DEFAULT_DATASETS.unregister, "wyverns")
+            names, name = asyncio.run(hash_in(executor, inputs))
+        self.assertEqual(names, hash_names(inputs, dataset="wyverns"))
+        self.assertEqual(name, hash_name(self.dragon_input, dataset="wyverns"))
+
+    def test_least_recently_used_datasets_are_evicted(self):
+        registry = DatasetRegistry(memory_budget=1)
+        registry.register("wyverns", self.wyverns)
+        registry.register("plain", self.plain)
+
+        wyverns_table = registry.render_table("wyverns", "en")
+        registry.render_table("plain", "en")
+        self.assertEqual(registry.loaded, ["plain"])
+        reloaded_table = registry.render_table("wyverns", "en")
+        self.assertEqual(registry.loaded, ["wyverns"])
+        self.assertIsNot(reloaded_table, wyverns_table)
+        self.assertEqual(reloaded_table, wyverns_table)
+
+        registry.memory_budget = None
+        registry.render_table("plain", "de")
+        self.assertEqual(registry.loaded, ["wyverns", "plain"])
+        self.assertGreater(registry.memory_usage, 0)
+
+        registry.unregister("plain")
+        self.assertEqual((registry.names, registry.loaded), (["wyverns"], ["wyverns"]))
+
+    def test_invalid_datasets(self):
+        registry = DatasetRegistry()
+        with self.assertRaises(ValueError):
+            registry.register("missing", self.tmp_dir / "missing")
+        with self.assertRaises(ValueError):
+            registry.render_table("unknown", "en")
+        with self.assertRaises(ValueError):
+            hash_name("teststring", dataset="unknown")
+        with self.assertRaises(ValueError):
+            DatasetRegistry(memory_budget=-1)
+
+        registry.register(
+            "invalid", self.make_dataset("invalid", {"gender": "unknown"})
+        )
+        with self.assertRaises(ValueError):
+            registry.render_table("invalid", "en")
+        self.assertEqual(registry.loaded, [])
+
+
+class TestHotReload(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        for path in SOURCE_FILES.values():
+            shutil.copy(path, self.data_dir / path.name)
+        self.nouns_file = self.data_dir / SOURCE_FILES["character_nouns"].name
+        self.nouns = json.loads(self.nouns_file.read_text(encoding="utf8"))
+
+        patcher = mock.patch.object(
+            CharacterDataLoader,
+            "_instance",
+            CharacterDataLoader.from_directory(self.data_dir),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.dragon_input = next(
+            f"teststring{i}"
+            for i in range(10_000)
+            if hash_name(f"teststring{i}")[2] == "Dragon"
+        )
+
+    def rename_dragon(self, word="Wyvern", **changes):
+        self.nouns["0"]["data"]["en"].update(word=word, **changes)
+        self.replace_nouns(self.nouns)
+
+    def replace_nouns(self, nouns):
+        # Replaced like a deployment would, so readers never see a partial file.
+        temporary_file = self.nouns_file.with_suffix(".tmp")
+        temporary_file.write_text(json.dumps(nouns), encoding="utf8")
+        temporary_file.replace(self.nouns_file)
+
+    def test_unchanged_data_is_not_reloaded(self):
+        data_loader = CharacterDataLoader()
+        self.assertFalse(CharacterDataLoader.reload())
+        self.nouns_file.touch()
+        self.assertFalse(CharacterDataLoader.reload())
+        self.assertIs(CharacterDataLoader(), data_loader)
+
+        self.assertTrue(CharacterDataLoader.reload(force=True))
+        self.assertIsNot(CharacterDataLoader(), data_loader)
+
+    def test_changed_data_is_swapped_in(self):
+        old_table = CharacterDataLoader().render_table("en")
+        self.rename_dragon()
+
+        self.assertTrue(CharacterDataLoader.reload())
+        # The warm language was built before the swap, the others stay lazy.
+        self.assertEqual(CharacterDataLoader().loaded_languages, ["en"])
+        self.assertEqual(hash_name(self.dragon_input)[2], "Wyvern")
+        self.assertEqual(hash_name(self.dragon_input, "de")[2], "Drache")
+        # Tables taken before the reload keep rendering the old words.
+        self.assertEqual(old_table.render(hash_indices(self.dragon_input))[2], "Dragon")
+        self.assertFalse(CharacterDataLoader.reload())
+
+    def test_invalid_data_keeps_the_old_data(self):
+        data_loader = CharacterDataLoader()
+        self.rename_dragon(gender="unknown")
+
+        watcher = DataWatcher()
+        with self.assertLogs(level=logging.WARNING):
+            self.assertFalse(watcher.check())
+        self.assertIs(CharacterDataLoader(), data_loader)
+        self.assertEqual(hash_name(self.dragon_input)[2], "Dragon")
+
+        self.rename_dragon(gender="neutral")
+        self.assertTrue(watcher.check())
+        self.assertEqual(
+            (hash_name(self.dragon_input)[2], watcher.reloads), ("Wyvern", 1)
+        )
+
+    def test_malformed_data_keeps_the_watcher_running(self):
+        watcher = DataWatcher()
+        for nouns in ({"1": "oops"}, [1, 2], {"0": {"data": "oops"}}):
+            with self.subTest(nouns=nouns):
+                self.replace_nouns(nouns)
+                with self.assertRaises(ValueError):
+                    CharacterDataLoader.reload()
+                with self.assertLogs(level=logging.WARNING):
+                    self.assertFalse(watcher.check())
+                self.assertEqual(hash_name(self.dragon_input)[2], "Dragon")
+
+        self.rename_dragon()
+        self.assertTrue(watcher.check())
+        self.assertEqual(hash_name(self.dragon_input)[2], "Wyvern")
+
+    def test_shared_store_is_exported_again(self):
+        store_file = self.data_dir / "words.store"
+        old_store = attach_shared_store(store_file)
+        self.rename_dragon()
+
+        self.assertTrue(CharacterDataLoader.reload())
+        self.assertEqual(hash_name(self.dragon_input)[2], "Wyvern")
+        new_store = SharedWordStore(store_file)
+        self.addCleanup(new_store.close)
+        self.assertEqual(new_store.source_digests, CharacterDataLoader().source_digests)
+        self.assertNotEqual(old_store.source_digests, new_store.source_digests)
+
+    def test_name_cache_is_cleared(self):
+        cache = NameCache()
+        self.assertEqual(cache.hash_name(self.dragon_input)[2], "Dragon")
+        self.assertEqual(cache.hash_name(self.dragon_input)[2], "Dragon")
+        old_loader = CharacterDataLoader()
+        self.rename_dragon()
+        CharacterDataLoader.reload()
+        self.assertEqual(cache.hash_name(self.dragon_input)[2], "Wyvern")
+        self.assertEqual(cache.hash_names([self.dragon_input])[0][2], "Wyvern")
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 1))
+        # Names are rendered from the loader they are cached under.
+        self.assertEqual(
+            # pylint: disable-next=protected-access
+            cache._hash_name(self.dragon_input, "en", old_loader)[2],
+            "Dragon",
+        )
+        cache.cache_clear()
+        self.assertEqual(cache.cache_info().hits, 0)
+
+    def test_watcher_reloads_in_the_background(self):
+        with self.assertRaises(ValueError):
+            DataWatcher(interval=0)
+
+        with watch_data(interval=0.01) as watcher:
+            self.rename_dragon()
+            deadline = time.monotonic() + 10
+            while hash_name(self.dragon_input)[2] != "Wyvern":
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            with self.assertRaises(RuntimeError):
+                watcher.start()
+        self.assertEqual(watcher.reloads, 1)
+
+    def test_readers_see_old_or_new_names_during_reloads(self):
+        inputs = [f"teststring{i}" for i in range(2_000)]
+        old_names = hash_names(inputs)
+        self.rename_dragon()
+        new_names = [
+            (*name[:2], "Wyvern") if name[2] == "Dragon" else name for name in old_names
+        ]
+        stop = threading.Event()
+        batches = []
+
+        def read():
+            while not stop.is_set():
+                batches.append(hash_names_threaded(inputs, workers=2))
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        for _ in range(10):
+            CharacterDataLoader.reload(force=True)
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertTrue(batches)
+        for names in batches:
+            self.assertIn(names, (old_names, new_names))
+        self.assertEqual(hash_names(inputs), new_names)
+
+
+class TestCompiledData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.source_files = {}
+        for name, path in SOURCE_FILES.items():
+            self.source_files[name] = self.tmp_dir / path.name
+            shutil.copy(path, self.source_files[name])
+        self.compiled_file = self.tmp_dir / "character_data.marshal"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_shipped_artifact_is_current(self):
+        self.assertIsNotNone(load_compiled_data(COMPILED_DATA_FILE, SOURCE_FILES))
+
+    def test_missing_artifact(self):
+        self.assertIsNone(load_compiled_data(self.compiled_file, self.source_files))
+
+    def test_stale_artifact(self):
+        compile_data(self.source_files, self.compiled_file)
+        self.assertIsNotNone(load_compiled_data(self.compiled_file, self.source_files))
+
+        with open(self.source_files["character_nouns"], "a", encoding="utf8") as f:
+            f.write("\n")
+        self.assertIsNone(load_compiled_data(self.compiled_file, self.source_files))
+
+    def test_unchanged_sources_are_not_hashed(self):
+        compile_data(self.source_files, self.compiled_file)
+        with mock.patch(
+            "myth_hash.core.compiled_data.source_digests", side_effect=AssertionError
+        ):
+            self.assertIsNotNone(
+                load_compiled_data(self.compiled_file, self.source_files)
+            )
+
+        # Touched sources are hashed once, and their new stats are recorded.
+        for path in self.source_files.values():
+            os.utime(path, ns=(0, 0))
+        self.assertIsNotNone(load_compiled_data(self.compiled_file, self.source_files))
+        CharacterDataLoader.from_directory(self.tmp_dir)
+        with mock.patch(
+            "myth_hash.core.compiled_data.source_digests", side_effect=AssertionError
+        ):
+            CharacterDataLoader.from_directory(self.tmp_dir)
+
+    def test_corrupt_artifact(self):
+        self.compiled_file.write_bytes(b"not marshal data")
+        self.assertIsNone(load_compiled_data(self.compiled_file, self.source_files))
+
+    def test_compiled_data_matches_json(self):
+        compiled = load_compiled_data(COMPILED_DATA_FILE, SOURCE_FILES)
+        attributes = json.loads(
+            SOURCE_FILES["physical_attributes"].read_text(encoding="utf8")
+        )
+        for language, blob in compiled["languages"].items():
+            self.assertEqual(
+                marshal.loads(blob)["physical_attributes"],
+                [
+                    (word_id, {language: data["words"][language]})
+                    for word_id, data in attributes.items()
+                ],
+            )
+
+
+class TestThreadSafety(unittest.TestCase):
+
+    def test_concurrent_first_calls_load_once(self):
+        inputs = [f"teststring{i}" for i in range(200)]
+        expected = {language: hash_names(inputs, language) for language in ("en", "de")}
+        # The real loading step, wrapped by the patched one below.
+        load_data = CharacterDataLoader._load_data  # pylint: disable=protected-access
+
+        def slow_load_data(data_loader):
+            # Widens the window in which other threads could see a loader that
+            # is not loaded yet.
+            time.sleep(0.05)
+            load_data(data_loader)
+
+        threads = 16
+        barrier = threading.Barrier(threads)
+
+        def hammer(worker):
+            language = ("en", "de")[worker % 2]
+            barrier.wait()
+            return language, [hash_name(i, language) for i in inputs]
+
+        with (
+            mock.patch.object(CharacterDataLoader, "_instance", None),
+            mock.patch.object(
+                CharacterDataLoader,
+                "_load_data",
+                side_effect=slow_load_data,
+                autospec=True,
+            ) as patched_load_data,
+        ):
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = list(executor.map(hammer, range(threads)))
+            self.assertEqual(patched_load_data.call_count, 1)
+
+        for language, names in results:
+            self.assertEqual(names, expected[language])
+
+    def test_hash_names_threaded_matches_hash_names(self):
+        inputs = [f"teststring{i}" for i in range(10_000)]
+        # Long inputs are hashed with the GIL released.
+        long_inputs = [f"{i}" * 4096 for i in range(16)]
+        for workers in (None, 1, 4):
+            self.assertEqual(
+                hash_names_threaded(inputs, "de", workers), hash_names(inputs, "de")
+            )
+        self.assertEqual(hash_names_threaded(iter(inputs)), hash_names(inputs))
+        self.assertEqual(hash_names_threaded(long_inputs), hash_names(long_inputs))
+        self.assertEqual(hash_names_threaded([]), [])
+
+    def test_hash_names_threaded_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            hash_names_threaded(["a"], workers=0)
+        with self.assertRaises(ValueError):
+            hash_names_threaded(["a"], "fr")
+
+
+class TestLanguageLoading(unittest.TestCase):
+
+    def setUp(self):
+        # A private loader instance, so the state of the shared singleton does not
+        # influence which languages are loaded.
+        self.data_loader = CharacterDataLoader.from_directory(COMPILED_DATA_FILE.parent)
+
+    def test_only_requested_language_is_loaded(self):
+        self.assertEqual(self.data_loader.loaded_languages, [])
+        character_data = self.data_loader.language_data("en")
+        self.assertEqual(self.data_loader.loaded_languages, ["en"])
+        self.assertEqual(list(character_data.character_nouns[0].data), ["en"])
+        self.assertEqual(list(character_data.physical_attributes[0].words), ["en"])
+
+    def test_character_data_contains_all_languages(self):
+        character_data = self.data_loader.character_data
+        self.assertEqual(self.data_loader.loaded_languages, ["de", "en"])
+        self.assertEqual(
+            sorted(character_data.personality_attributes[0].words), ["de", "en"]
+        )
+
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            self.data_loader.language_data("fr")
+
+
+class TestSharedWordStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.store_file = self.tmp_dir / "words.store"
+        export_shared_store(self.store_file)
+        self.store = SharedWordStore(self.store_file)
+
+    def tearDown(self):
+        CharacterDataLoader().attach_shared_store(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_tables_match_in_memory_tables(self):
+        data_loader = CharacterDataLoader()
+        self.assertEqual(self.store.languages, data_loader.languages)
+        for language in self.store.languages:
+            mapped = self.store.render_table(language)
+            in_memory = data_loader.render_table(language)
+            self.assertEqual(mapped.list_sizes, in_memory.list_sizes)
+            self.assertEqual(
+                list(mapped.character_nouns), list(in_memory.character_nouns)
+            )
+            self.assertEqual(
+                list(mapped.character_genders), list(in_memory.character_genders)
+            )
+            for mapped_words, words in zip(
+                mapped.physical_attributes, in_memory.physical_attributes
+            ):
+                self.assertEqual(list(mapped_words), list(words))
+
+    def test_attached_store_output_is_identical(self):
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        expected = {language: hash_names(inputs, language) for language in ("en", "de")}
+
+        CharacterDataLoader().attach_shared_store(self.store)
+        for language, names in expected.items():
+            self.assertEqual(hash_names(inputs, language), names)
+            self.assertEqual(hash_name(inputs[0], language), names[0])
+
+    def test_invalid_store_file(self):
+        invalid_file = self.tmp_dir / "invalid.store"
+        invalid_file.write_bytes(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            SharedWordStore(invalid_file)
+
+        content = self.store_file.read_bytes()
+        for length in (4, 100, len(content) - 100):
+            with self.subTest(length=length):
+                invalid_file.write_bytes(content[:length])
+                with self.assertRaises(ValueError):
+                    SharedWordStore(invalid_file)
+
+    def test_failed_export_leaves_no_temporary_file(self):
+        content = self.store_file.read_bytes()
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                export_shared_store(self.store_file)
+        self.assertEqual(list(self.tmp_dir.iterdir()), [self.store_file])
+        self.assertEqual(self.store_file.read_bytes(), content)
+
+    def test_stale_store_is_exported_again(self):
+        data_dir = self.tmp_dir / "data"
+        data_dir.mkdir()
+        for path in SOURCE_FILES.values():
+            shutil.copy(path, data_dir / path.name)
+        nouns_file = data_dir / SOURCE_FILES["character_nouns"].name
+        nouns = json.loads(nouns_file.read_text(encoding="utf8"))
+        nouns["0"]["data"]["en"]["word"] = "Wyvern"
+        nouns_file.write_text(json.dumps(nouns), encoding="utf8")
+        other_loader = CharacterDataLoader.from_directory(data_dir)
+        export_shared_store(self.store_file, other_loader)
+        self.assertNotEqual(
+            SharedWordStore(self.store_file).source_digests,
+            CharacterDataLoader().source_digests,
+        )
+
+        inputs = [f"teststring{i}" for i in range(1_000)]
+        expected = hash_names(inputs)
+        store = attach_shared_store(self.store_file)
+        self.assertEqual(store.source_digests, CharacterDataLoader().source_digests)
+        self.assertEqual(hash_names(inputs), expected)
+
+    def test_close(self):
+        table = self.store.render_table("en")
+        with self.assertRaises(BufferError):
+            self.store.close()
+        del table
+        self.store.close()
+
 
 def estimate_expected_collisions(n1: int, n2: int, n3: int, total_tests: int) -> float:
     total_combinations = n1 * n2 * n3
     return round((total_tests**2) / (2 * total_combinations))
 
 
+class TestCollisionAnalysis(unittest.TestCase):
+
+    def assert_matches_names(self, inputs, language):
+        report = analyze(inputs, language)
+        self.assertEqual(report.total, len(inputs))
+        self.assertEqual(
+            report.distinct_names,
+            len({hash_name(input_string, language) for input_string in inputs}),
+        )
+        self.assertEqual(
+            report.distinct_codes,
+            len({hash_code(input_string) for input_string in inputs}),
+        )
+        for slot in report.slots:
+            self.assertEqual(sum(slot.counts), len(inputs))
+
+    def test_counts_match_rendered_names(self):
+        inputs = [f"teststring{i}" for i in range(20_000)] * 2
+        for language in ("en", "de"):
+            self.assert_matches_names(inputs, language)
+
+    def test_serial_path(self):
+        inputs = [f"teststring{i}" for i in range(20_000)]
+        with mock.patch("myth_hash.analysis.np", None):
+            self.assert_matches_names(inputs, "de")
+
+    def test_expectation(self):
+        report = analyze(f"teststring{i}" for i in range(100_000))
+        self.assertAlmostEqual(expected_distinct(1, report.code_space), 1.0)
+        self.assertLess(report.name_space, report.code_space)
+        self.assertLess(
+            abs(report.duplicates - report.expected_duplicates),
+            5 * report.expected_duplicates**0.5,
+        )
+        for slot in report.slots:
+            self.assertLess(slot.modulo_bias, 1e-20)
+
+
+class TestDaemonProtocol(unittest.TestCase):
+
+    def test_request(self):
+        response = handle_request(
+            json.dumps(
+                {"input": "teststring", "languages": ["de"], "format": "json"}
+            ).encode()
+        )
+        self.assertEqual(
+            json.loads(response["output"]),
+            dict(zip(NAME_FIELDS, hash_name("teststring", "de"))),
+        )
+
+    def test_invalid_requests(self):
+        for line in (
+            b"not json",
+            b'{"languages": ["en"]}',
+            b'{"input": " "}',
+            b'{"input": "a", "languages": ["xx"]}',
+            b'{"input": "a", "format": "yaml"}',
+        ):
+            self.assertIn("error", handle_request(line))
+
+
+async def http_request(reader, writer, method, target, body=None):
+    payload = b"" if body is None else json.dumps(body).encode()
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+        + payload
+    )
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        field, _, value = line.decode().partition(":")
+        headers[field.lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+
+class TestAsyncHashing(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.inputs = [f"teststring{i}" for i in range(5_000)]
+        self.consumed = 0
+
+    async def source(self):
+        for input_string in self.inputs:
+            self.consumed += 1
+            yield input_string
+
+    async def test_names_match_hash_names(self):
+        expected = hash_names(self.inputs, "de")
+        self.assertEqual(
+            [name async for name in ahash_names(self.inputs, "de")], expected
+        )
+        self.assertEqual(
+            [name async for name in ahash_names(self.source(), "de")], expected
+        )
+        self.assertEqual(
+            await hash_name_async("teststring", "de"), hash_name("teststring", "de")
+        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                [
+                    name
+                    async for name in ahash_names(
+                        self.source(), "de", chunk_size=300, executor=executor
+                    )
+                ],
+                expected,
+            )
+            self.assertEqual(
+                await hash_name_async("teststring", "de", executor),
+                hash_name("teststring", "de"),
+            )
+
+    async def test_chunks_are_sized_by_the_stall_budget(self):
+        chunks = [
+            chunk async for chunk, _ in ahash_name_chunks(self.inputs, chunk_size=1_000)
+        ]
+        self.assertEqual([len(chunk) for chunk in chunks], [1_000] * 5)
+
+        sizes = [
+            len(chunk)
+            async for chunk, _ in ahash_name_chunks(self.inputs, stall_budget=1e-9)
+        ]
+        self.assertEqual(sizes[0], INITIAL_CHUNK_SIZE)
+        self.assertEqual(set(sizes[1:-1]), {MIN_CHUNK_SIZE})
+
+    async def test_other_tasks_run_between_chunks(self):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        chunks = 0
+        async for _ in ahash_name_chunks(self.inputs, chunk_size=500):
+            chunks += 1
+        ticker.cancel()
+        self.assertGreaterEqual(ticks, chunks)
+
+    async def test_executor_work_is_bounded(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chunks = ahash_name_chunks(
+                self.source(), chunk_size=100, executor=executor, max_in_flight=3
+            )
+            chunk, names = await anext(chunks)
+            self.assertEqual(names, hash_names(chunk))
+            # The first chunk is yielded once the third one is submitted.
+            self.assertEqual(self.consumed, 300)
+            await chunks.aclose()
+        self.assertEqual(self.consumed, 300)
+
+    async def test_invalid_arguments(self):
+        for options in (
+            {"language": "fr"},
+            {"chunk_size": 0},
+            {"stall_budget": 0},
+            {"max_in_flight": 0},
+        ):
+            with self.subTest(options=options), self.assertRaises(ValueError):
+                await anext(ahash_names(self.inputs, **options))
+
+
+class TestNameService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = NameService()
+        self.server = await self.service.start("127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def request(self, method, target, body=None):
+        return await http_request(self.reader, self.writer, method, target, body)
+
+    async def test_endpoints_on_one_connection(self):
+        status, record = await self.request("GET", "/name?input=teststring&language=de")
+        self.assertEqual(status, 200)
+        self.assertEqual(record["input"], "teststring")
+        self.assertEqual(
+            tuple(record[field] for field in NAME_FIELDS), hash_name("teststring", "de")
+        )
+
+        inputs = [f"teststring{i}" for i in range(100)]
+        status, response = await self.request("POST", "/names", {"inputs": inputs})
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [
+                tuple(record[field] for field in NAME_FIELDS)
+                for record in response["names"]
+            ],
+            hash_names(inputs),
+        )
+
+        status, stats = await self.request("GET", "/stats")
+        self.assertEqual(status, 200)
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["names"], 101)
+        self.assertGreater(stats["latency_ms"]["p99"], 0)
+
+    async def test_errors(self):
+        for method, target, body, expected in (
+            ("GET", "/name", None, 400),
+            ("GET", "/name?input=a&language=xx", None, 400),
+            ("POST", "/name?input=a", None, 405),
+            ("POST", "/names", {"inputs": "a"}, 400),
+            ("POST", "/names", {"inputs": ["a"], "language": ["en"]}, 400),
+            ("POST", "/names", {"inputs": ["\ud800"]}, 400),
+            ("GET", "/unknown", None, 404),
+        ):
+            status, response = await self.request(method, target, body)
+            self.assertEqual(status, expected)
+            self.assertIn("error", response)
+
+    async def test_unexpected_errors_are_answered(self):
+        with (
+            mock.patch(
+                "myth_hash.server._name_record", side_effect=RuntimeError("broken")
+            ),
+            self.assertLogs(level=logging.ERROR),
+        ):
+            for method, target, body in (
+                ("POST", "/names", {"inputs": ["a"]}),
+                ("GET", "/name?input=a", None),
+            ):
+                status, response = await self.request(method, target, body)
+                self.assertEqual(status, 500)
+                self.assertIn("error", response)
+        # The connection stays usable.
+        status, _ = await self.request("GET", "/name?input=a")
+        self.assertEqual(status, 200)
+
+    async def test_large_batches_do_not_block_single_names(self):
+        port = self.server.sockets[0].getsockname()[1]
+        batch_reader, batch_writer = await asyncio.open_connection("127.0.0.1", port)
+        inputs = [f"teststring{i}" for i in range(50_000)]
+        parsed = asyncio.Event()
+        finished = []
+        # pylint: disable-next=protected-access
+        original_parse_batch = server_module._parse_batch
+
+        def parse_batch(body):
+            parsed.set()
+            return original_parse_batch(body)
+
+        async def batch():
+            payload = json.dumps({"inputs": inputs}).encode()
+            batch_writer.write(
+                b"POST /names HTTP/1.1\r\n"
+                + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            status_line = await batch_reader.readline()
+            finished.append("batch")
+            headers = {}
+            while (line := await batch_reader.readline()) != b"\r\n":
+                field, _, value = line.decode().partition(":")
+                headers[field.lower()] = value.strip()
+            body = await batch_reader.readexactly(int(headers["content-length"]))
+            return int(status_line.split()[1]), json.loads(body)
+
+        async def single():
+            # Sent once the batch is being hashed.
+            await parsed.wait()
+            response = await self.request("GET", "/name?input=teststring")
+            finished.append("single")
+            return response
+
+        with mock.patch("myth_hash.server._parse_batch", parse_batch):
+            (status, response), (single_status, _) = await asyncio.gather(
+                batch(), single()
+            )
+        batch_writer.close()
+        await batch_writer.wait_closed()
+        self.assertEqual((status, single_status), (200, 200))
+        self.assertEqual(finished, ["single", "batch"])
+        self.assertEqual(
+            [
+                tuple(record[field] for field in NAME_FIELDS)
+                for record in response["names"]
+            ],
+            hash_names(inputs),
+        )
+
+    async def test_chunked_requests_are_rejected(self):
+        self.writer.write(
+            b"POST /names HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"2\r\n{}\r\n0\r\n\r\n"
+        )
+        self.assertIn(b" 411 ", await self.reader.readline())
+        await self.reader.read()
+        self.assertTrue(self.reader.at_eof())
+
+    async def test_http_1_0_connections_close_unless_kept_alive(self):
+        port = self.server.sockets[0].getsockname()[1]
+        for connection, keep_alive in (
+            ("", False),
+            ("Connection: keep-alive\r\n", True),
+        ):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET /stats HTTP/1.0\r\n{connection}\r\n".encode())
+            response = await reader.readuntil(b"\r\n\r\n")
+            self.assertEqual(b"Connection: keep-alive" in response, keep_alive)
+            if not keep_alive:
+                await reader.read()
+                self.assertTrue(reader.at_eof())
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_concurrent_requests_are_batched(self):
+        batcher = MicroBatcher("en")
+        inputs = [f"teststring{i}" for i in range(50)]
+        names = await asyncio.gather(*(batcher.submit(i) for i in inputs))
+        self.assertEqual(list(names), hash_names(inputs))
+        self.assertEqual(batcher.batches, 1)
+
+    async def test_failed_batches_fail_their_requests(self):
+        batcher = MicroBatcher("en")
+        with mock.patch(
+            "myth_hash.server.hash_names", side_effect=RuntimeError("broken")
+        ):
+            results = await asyncio.gather(
+                *(batcher.submit(f"teststring{i}") for i in range(5)),
+                return_exceptions=True,
+            )
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(batcher.batches, 0)
+
+
+def register_keys(path: str, keys: list[str]) -> list[tuple[str, str, str]]:
+    with NameRegistry(path) as registry:
+        return [registry.register(key) for key in keys]
+
+
+class TestNameRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = str(Path(self.temp_dir) / "names.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_names_are_unique_and_stable(self):
+        keys = [f"user{i}" for i in range(20_000)]
+        with NameRegistry(self.path) as registry:
+            names = registry.register_many(keys)
+            self.assertEqual(len(set(names)), len(keys))
+            self.assertEqual(len(registry), len(keys))
+            # The first key of every name keeps its hash_name result.
+            self.assertEqual(names[0], hash_name(keys[0]))
+            self.assertGreater(
+                sum(name == hash_name(key) for key, name in zip(keys, names)),
+                0.99 * len(keys),
+            )
+
+        with NameRegistry(self.path) as registry:
+            self.assertEqual(
+                registry.register_many(keys[:100] + ["new"])[:100], names[:100]
+            )
+            self.assertEqual(registry.lookup(keys[7]), names[7])
+            self.assertEqual(registry.lookup_name(format_text_name(names[7])), keys[7])
+            self.assertIsNone(registry.lookup("unknown"))
+            self.assertIsNone(registry.lookup_name("not-a-name"))
+            self.assertIn("new", registry)
+
+    def test_colliding_keys_are_probed(self):
+        keys = [f"teststring{i}" for i in range(20_000)]
+        seen = {}
+        for key in keys:
+            seen.setdefault(hash_name(key), []).append(key)
+        first, second = next(keys for keys in seen.values() if len(keys) > 1)[:2]
+
+        with NameRegistry(self.path) as registry:
+            self.assertEqual(registry.register(first), hash_name(first))
+            probed = registry.register(second)
+            self.assertNotEqual(probed, hash_name(second))
+            self.assertEqual(registry.register(second), probed)
+
+    def test_language_mismatch(self):
+        NameRegistry(self.path, "de").close()
+        with self.assertRaises(ValueError):
+            NameRegistry(self.path, "en")
+
+    def test_word_list_mismatch(self):
+        other_lists = mock.patch.object(
+            CharacterDataLoader,
+            "source_digests",
+            new_callable=mock.PropertyMock,
+            return_value={"character_nouns": "other"},
+        )
+        with NameRegistry(self.path) as registry:
+            registry.register("user1")
+            # Reloaded while the registry is open.
+            with other_lists, self.assertRaises(ValueError):
+                registry.register("user2")
+            self.assertEqual(len(registry), 1)
+        with other_lists, self.assertRaises(ValueError):
+            NameRegistry(self.path)
+
+    def test_concurrent_processes(self):
+        batches = [
+            [f"user{i}" for i in range(start, start + 300)]
+            for start in range(0, 1200, 200)
+        ]
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            results = list(
+                executor.map(register_keys, [self.path] * len(batches), batches)
+            )
+
+        assigned = {}
+        for batch, names in zip(batches, results):
+            for key, name in zip(batch, names):
+                self.assertEqual(assigned.setdefault(key, name), name)
+        self.assertEqual(len(set(assigned.values())), len(assigned))
+
+
 class TestNameUniqueness(unittest.TestCase):
 
     def setUp(self):